@@ -0,0 +1,208 @@
+''' This module keeps a "feature store" of BGCs for task 2, i.e. a table (pandas DataFrame, saved as a pickle file in directory "feature_store_of_BGCs") with one row per Genbank file that contains all data of its BGC needed for the BGC-selection
+    (length, position of first and last core gene, number of core and additional genes, ambiguous nucleotides/amino acids and products). Each row is identified by the path of the file together with its size and time of last modification,
+    so that a file is only read again if it has changed. Since the selection parameters are not part of the table, a new BGC-selection with other parameters is only a filter over the table (see function "assess_BGCs" below) instead of reading all files again. '''
+
+
+import os
+import pandas as pd
+from   concurrent.futures import ProcessPoolExecutor
+
+import create
+import names_and_paths
+import analyze_and_assess
+import archive_input
+
+
+columns_of_feature_store = [ "Size of file (in bytes)", "Time of last modification (in ns)", "File of one BGC", "Name of BGC", "Length of BGC (in bp)", "Product(s) of BGC", "Number of products",
+                             "Length of DNA sequence", "Ambiguous nucleotide", "Ambiguous amino acid", "Number of core genes", "Number of additional genes", "Start of first core gene", "End of last core gene" ] # Index of table = path of file.
+
+
+# # -----------Make features of BGC in one file-----------------------
+def make_features_of_file(path_of_inputfile):
+    """
+    Read a Genbank (.gbk) file and make the row of its BGC for the feature store.
+
+    Parameters
+    ----------
+    path_of_inputfile : str
+        Path of a Genbank (.gbk) file.
+
+    Returns
+    -------
+    features : dict
+        Row of BGC in feature store (keys = columns of feature store).
+    """
+    size_of_file, time_of_last_modification = archive_input.stat_of_file(path_of_inputfile) # Note: file can also be in an archive (see module "archive_input.py").
+    features_of_BGC     = analyze_and_assess.parse_genbank_file_of_BGC(path_of_inputfile)
+    core_genes          = features_of_BGC["Data record for core genes"]
+    additional_genes    = features_of_BGC["Data record for additional genes"]
+
+    return {
+    "Size of file (in bytes)"               : size_of_file,
+    "Time of last modification (in ns)"     : time_of_last_modification,
+    "File of one BGC"                       : features_of_BGC["Number of delimiters btw data of genes and DNA seq"] == 1 and features_of_BGC["Label for file of one BGC found"] == True, # Same check as in task 2 (exactly one "ORIGIN" and the label for file of one BGC).
+    "Name of BGC"                           : features_of_BGC["Name of BGC"],
+    "Length of BGC (in bp)"                 : int(features_of_BGC["Length of BGC (in bp)"]),
+    "Product(s) of BGC"                     : features_of_BGC["Product(s) of BGC"],
+    "Number of products"                    : len(features_of_BGC["Product(s) of BGC"]),
+    "Length of DNA sequence"                : features_of_BGC["Length of DNA sequence"] if features_of_BGC["Length of DNA sequence"] is not None else 0,
+    "Ambiguous nucleotide"                  : features_of_BGC["Ambiguous nucleotide in DNA sequence"],
+    "Ambiguous amino acid"                  : any( "X" in gene["translation"] for gene in (core_genes + additional_genes) ),
+    "Number of core genes"                  : len(core_genes),
+    "Number of additional genes"            : len(additional_genes),
+    "Start of first core gene"              : int(core_genes[0]["position"][0])  if len(core_genes) > 0 else -1,
+    "End of last core gene"                 : int(core_genes[-1]["position"][1]) if len(core_genes) > 0 else -1
+    }
+
+
+def make_features_of_chunk_of_files(paths_of_inputfiles):
+    return [ make_features_of_file(path_of_inputfile) for path_of_inputfile in paths_of_inputfiles ] # Executed by one worker process.
+# # -----------Make features of BGC in one file-----------------------
+
+
+# # -----------Load and save feature store-----------------------
+def load_feature_store():
+    """
+    Load the feature store of BGCs (or make a new, empty table if there is none yet or if it cannot be read).
+
+    Parameters
+    ----------
+    None.
+
+    Returns
+    -------
+    feature_store : pandas.DataFrame
+        Feature store of BGCs (index = path of file).
+    """
+    path_of_feature_store = names_and_paths.path_of_directory_of_feature_store_of_BGCs + names_and_paths.name_of_feature_store_of_BGCs
+    if os.path.isfile(path_of_feature_store):
+        try:
+            feature_store = pd.read_pickle(path_of_feature_store)
+            if list(feature_store.columns) == columns_of_feature_store:
+                return feature_store
+        except Exception:
+            pass # Start with an empty table if the saved table cannot be read.
+    return pd.DataFrame(columns = columns_of_feature_store)
+
+
+def save_feature_store(feature_store):
+    """
+    Save the feature store of BGCs (the file is replaced at once, so that it is never only partly written).
+
+    Parameters
+    ----------
+    feature_store : pandas.DataFrame
+        Feature store of BGCs.
+
+    Returns
+    -------
+    None.
+
+    Output files
+    ------------
+    A pickle file of the feature store in directory "feature_store_of_BGCs".
+    """
+    create.create_directory_if_not_exists(names_and_paths.path_of_directory_of_feature_store_of_BGCs)
+    path_of_feature_store           = names_and_paths.path_of_directory_of_feature_store_of_BGCs + names_and_paths.name_of_feature_store_of_BGCs
+    path_of_temporary_feature_store = path_of_feature_store + ".tmp"
+    feature_store.to_pickle(path_of_temporary_feature_store)
+    os.replace(path_of_temporary_feature_store, path_of_feature_store)
+# # -----------Load and save feature store-----------------------
+
+
+# # -----------Update feature store for given files-----------------------
+def update_feature_store(feature_store, paths_of_inputfiles, number_of_processes=1, number_of_files_per_chunk=500):
+    """
+    Add the rows of all given files that are not yet in the feature store or that have changed since (different size or time of last modification), reading only these files.
+
+    Parameters
+    ----------
+    feature_store               : pandas.DataFrame
+        Feature store of BGCs.
+    paths_of_inputfiles         : list of str
+        Paths of Genbank (.gbk) files.
+    number_of_processes         : int
+        Number of worker processes that read files at the same time. With 1, all files are read one after another.
+    number_of_files_per_chunk   : int
+        Number of files that a worker process reads at a time.
+
+    Returns
+    -------
+    feature_store       : pandas.DataFrame
+        Updated feature store of BGCs.
+    number_of_read_files : int
+        Number of files that were read.
+    """
+    columns_for_identification  = [ "Size of file (in bytes)", "Time of last modification (in ns)" ]
+    current_sizes_and_times     = pd.DataFrame([ list(archive_input.stat_of_file(path_of_inputfile)) for path_of_inputfile in paths_of_inputfiles ], index = paths_of_inputfiles, columns = columns_for_identification)
+    stored_sizes_and_times      = feature_store.reindex(paths_of_inputfiles)[columns_for_identification] # Note: files that are not in feature store get empty values (NaN) here, which never equal current values.
+    unchanged_files             = (stored_sizes_and_times == current_sizes_and_times).all(axis = 1)
+    paths_of_files_to_read      = list(dict.fromkeys(current_sizes_and_times.index[~unchanged_files])) # Note: "dict.fromkeys()" removes duplicate paths (keeping their order).
+
+    if len(paths_of_files_to_read) == 0:
+        return feature_store, 0
+
+    if number_of_processes <= 1:
+        rows = make_features_of_chunk_of_files(paths_of_files_to_read)
+    else:
+        chunks_of_paths = [ paths_of_files_to_read[i : i + number_of_files_per_chunk] for i in range(0, len(paths_of_files_to_read), max(number_of_files_per_chunk, 1)) ]
+        with ProcessPoolExecutor(max_workers = number_of_processes, initializer = names_and_paths.set_workspace_of_process, initargs = (names_and_paths.get_workspace(),)) as pool: # Note: worker processes resolve paths (e.g. of directory "files_from_archives") in the workspace of this run.
+            rows = [ row for rows_of_chunk in pool.map(make_features_of_chunk_of_files, chunks_of_paths) for row in rows_of_chunk ]
+
+    new_rows      = pd.DataFrame(rows, index = paths_of_files_to_read, columns = columns_of_feature_store)
+    feature_store = pd.concat([ feature_store.drop(index = paths_of_files_to_read, errors = "ignore"), new_rows ]) if len(feature_store) > 0 else new_rows
+
+    return feature_store, len(paths_of_files_to_read)
+# # -----------Update feature store for given files-----------------------
+
+
+# # -----------Assess all BGCs in feature store-----------------------
+def assess_BGCs(features, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection):
+    """
+    Assess all BGCs in (a part of) the feature store at once, with the same selection criteria as in module "analyze_and_assess.py".
+
+    Parameters
+    ----------
+    features                            : pandas.DataFrame
+        Rows of feature store of BGCs to assess.
+    param_for_preliminary_selection     : dict of {str : str}
+        Parameter for preliminary selection, i.e. minimum number of core genes.
+    param_for_main_selection            : dict of {str : str}
+        Parameters for main selection, i.e. minimum length of cluster (in bp), minimum distance of each core gene to edges of cluster (in bp) and minimum number of additional biosynthetic genes.
+    param_for_2nd_chance_selection      : dict of {str : str}
+        Parameter for second-chance selection, i.e. minimum number of additional biosynthetic genes.
+
+    Returns
+    -------
+    selection_status_for_BGCs : pandas.Series of str
+        Selection result of each BGC: either "discarded", "passed main selection" or "passed second-chance selection" (None for files that do not contain exactly one BGC).
+    """
+    min_num_of_core_genes                                   = int(param_for_preliminary_selection["Minimum number of core genes"])
+    min_length                                              = int(param_for_main_selection["Minimum length (in bp)"])
+    min_distance                                            = int(param_for_main_selection["Minimum distance (in bp)"])
+    min_num_of_additional_genes_for_main_selection          = int(param_for_main_selection["Minimum number of additional biosynthetic genes"])
+    min_num_of_additional_genes_for_2nd_chance_selection    = int(param_for_2nd_chance_selection["Minimum number of additional biosynthetic genes"])
+
+    length_of_BGC                       = features["Length of BGC (in bp)"].astype("int64")
+    number_of_core_genes                = features["Number of core genes"].astype("int64")
+    number_of_additional_genes          = features["Number of additional genes"].astype("int64")
+
+    # # --------------Preliminary selection----------------
+    passed_preliminary_selection = features["File of one BGC"].astype(bool) & (features["Length of DNA sequence"].astype("int64") > 0) & (features["Number of products"].astype("int64") > 0) & (number_of_core_genes >= min_num_of_core_genes) \
+                                   & ~features["Ambiguous nucleotide"].astype(bool) & (number_of_core_genes + number_of_additional_genes > 0) & ~features["Ambiguous amino acid"].astype(bool) # Note: a BGC without any core or additional gene cannot pass preliminary selection.
+    # # --------------Preliminary selection----------------
+
+    # # --------------Main & second-chance selection----------------
+    passed_main_selection               = passed_preliminary_selection & (number_of_core_genes > 0) & (length_of_BGC >= min_length) \
+                                          & (features["Start of first core gene"].astype("int64") >= min_distance) & (length_of_BGC - features["End of last core gene"].astype("int64") >= min_distance) \
+                                          & (number_of_additional_genes >= min_num_of_additional_genes_for_main_selection) # Note: a BGC without core genes (only possible if minimum number of core genes is 0) fails main selection, as the distance of core genes to the edges cannot be checked (as in module "analyze_and_assess.py").
+    passed_2nd_chance_selection         = passed_preliminary_selection & ~passed_main_selection & (number_of_additional_genes >= min_num_of_additional_genes_for_2nd_chance_selection)
+    # # --------------Main & second-chance selection----------------
+
+    selection_status_for_BGCs = pd.Series("discarded", index = features.index, dtype = object)
+    selection_status_for_BGCs[passed_main_selection]                    = "passed main selection"
+    selection_status_for_BGCs[passed_2nd_chance_selection]              = "passed second-chance selection"
+    selection_status_for_BGCs[~features["File of one BGC"].astype(bool)] = None # Only files that contain exactly one BGC are assessed.
+
+    return selection_status_for_BGCs
+# # -----------Assess all BGCs in feature store-----------------------
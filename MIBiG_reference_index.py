@@ -0,0 +1,239 @@
+''' This module builds a local "reference index" of the BGCs from database MIBiG (once, from a local copy of the Genbank files of MIBiG, i.e. a directory or an archive, e.g. "mibig_gbk_3.1.tar.gz"), which contains a MinHash sketch of the translations of all genes
+    of each BGC from MIBiG (see module "precluster_BGCs.py"). With this index, the nearest BGCs from MIBiG of each query BGC are found in task 3 within milliseconds by locality-sensitive hashing (LSH), without BiG-SCAPE, and each query BGC is called "known"
+    (similar to a BGC from MIBiG) or "novel". BiG-SCAPE then only needs to analyze the query BGCs together with their nearest BGCs from MIBiG, instead of all BGCs from MIBiG.
+    The index is kept in directory "MIBiG_reference_index" of the pipeline (used by all runs) and can be built with: python MIBiG_reference_index.py <path of directory or archive with Genbank files of MIBiG> '''
+
+
+import os
+import re
+import sys
+import json
+import tempfile
+
+import create
+import names_and_paths
+import archive_input
+import input_parameters
+import precluster_BGCs
+
+
+version_of_MIBiG_reference_index    = "1"
+regex_for_accession_of_MIBiG        = re.compile(r"BGC\d{7}") # Accession of a BGC in MIBiG, e.g. "BGC0000001".
+
+
+# # -----------Read translations of all genes of a BGC-----------------------
+def read_translations_of_all_genes(path_of_inputfile):
+    """
+    Read a Genbank (.gbk) file line by line and extract the name ("DEFINITION") and the translations of all genes (also genes that are not biosynthetic, as the files of MIBiG have no gene kinds).
+
+    Parameters
+    ----------
+    path_of_inputfile : str
+        Path of a Genbank (.gbk) file (also in an archive, see module "archive_input.py").
+
+    Returns
+    -------
+    name_of_BGC     : str
+        Name of BGC (empty if there is no "DEFINITION").
+    translations    : list of str
+        Translations of all genes.
+    """
+    name_of_BGC             = ""
+    translations            = []
+    translation_being_read  = None # Parts of a translation that is read until the closing quotation mark (a translation is split over many lines).
+
+    with archive_input.open_file(path_of_inputfile, "r") as file_object:
+        for line in file_object:
+            if translation_being_read is not None:
+                translation_being_read.append(line.strip().rstrip("\""))
+                if line.rstrip().endswith("\""):
+                    translations.append("".join(translation_being_read))
+                    translation_being_read = None
+            elif line.lstrip().startswith("/translation=\""):
+                translation_being_read = [ line.strip().removeprefix("/translation=\"").rstrip("\"") ]
+                if line.rstrip().endswith("\"") and len(line.strip()) > len("/translation=\""):
+                    translations.append("".join(translation_being_read))
+                    translation_being_read = None
+            elif line.startswith("DEFINITION") and name_of_BGC == "":
+                name_of_BGC = line.removeprefix("DEFINITION").strip()
+            elif line.startswith("ORIGIN"):
+                break # No genes after the DNA sequence.
+
+    return name_of_BGC, translations
+# # -----------Read translations of all genes of a BGC-----------------------
+
+
+# # -----------Build, save and load reference index of MIBiG-----------------------
+def build_MIBiG_reference_index(path_of_Genbank_files_of_MIBiG):
+    """
+    Build the reference index of MIBiG from a local copy of the Genbank files of MIBiG and save it in directory "MIBiG_reference_index".
+
+    Parameters
+    ----------
+    path_of_Genbank_files_of_MIBiG : str
+        Path of a directory or an archive (e.g. .tar.gz) that contains the Genbank (.gbk) files of MIBiG (one file per BGC, name of file starts with accession, e.g. "BGC0000001.gbk").
+
+    Returns
+    -------
+    reference_index : dict
+        Reference index: {"Version": ..., "Parameters": [length of k-mers, number of bands, number of rows per band], "Entries": {accession: {"Name": ..., "Path": ..., "Sketch": [...]}}}.
+
+    Output files
+    ------------
+    A file (.json) for the reference index in directory "MIBiG_reference_index".
+    """
+    # # -----------Find Genbank files of MIBiG-----------------------
+    if path_of_Genbank_files_of_MIBiG.endswith(tuple(archive_input.file_extensions_of_archives)):
+        paths_of_inputfiles = archive_input.list_files_in_archive(os.path.realpath(path_of_Genbank_files_of_MIBiG), names_and_paths.file_extensions_of_antismash_outputfiles)
+    else:
+        paths_of_inputfiles = [ os.path.join(os.path.realpath(dir), name_of_file) for dir, subdirs, files in os.walk(path_of_Genbank_files_of_MIBiG) for name_of_file in files if name_of_file.endswith(tuple(names_and_paths.file_extensions_of_antismash_outputfiles)) ]
+    # # -----------Find Genbank files of MIBiG-----------------------
+
+    parameters_of_sketches  = [ input_parameters.length_of_kmers_for_preclustering, input_parameters.number_of_bands_for_preclustering, input_parameters.number_of_rows_per_band_for_preclustering ]
+    reference_index         = { "Version" : version_of_MIBiG_reference_index, "Parameters" : parameters_of_sketches, "Entries" : {} }
+    for path_of_inputfile in sorted(paths_of_inputfiles):
+        match = regex_for_accession_of_MIBiG.search(archive_input.name_of_file(path_of_inputfile))
+        if match is None:
+            continue # Not a BGC from MIBiG.
+        name_of_BGC, translations = read_translations_of_all_genes(path_of_inputfile)
+        sketch = precluster_BGCs.make_MinHash_sketch(precluster_BGCs.make_hashes_of_kmers(translations, parameters_of_sketches[0]), parameters_of_sketches[1] * parameters_of_sketches[2])
+        if sketch is not None:
+            reference_index["Entries"][match.group(0)] = { "Name" : name_of_BGC, "Path" : path_of_inputfile, "Sketch" : list(sketch) }
+    archive_input.close_all_archives()
+
+    create.create_directory_if_not_exists(names_and_paths.path_of_directory_of_MIBiG_reference_index)
+    path_of_index           = names_and_paths.path_of_directory_of_MIBiG_reference_index + names_and_paths.name_of_MIBiG_reference_index
+    file_descriptor, path_of_temporary_index = tempfile.mkstemp(dir = os.path.dirname(path_of_index), suffix = ".tmp") # Note: a temporary file of its own for each run, as several runs can build the reference index at the same time (the last one replaces the index).
+    with os.fdopen(file_descriptor, "w") as file_object:
+        json.dump(reference_index, file_object)
+    os.replace(path_of_temporary_index, path_of_index)
+    return reference_index
+
+
+def load_MIBiG_reference_index():
+    """
+    Load the reference index of MIBiG (see function "build_MIBiG_reference_index" above) and sort the sketches of all BGCs from MIBiG into the buckets of LSH.
+
+    Parameters
+    ----------
+    None.
+
+    Returns
+    -------
+    reference_index : dict
+        Reference index, with the additional key "Buckets" (one dict per band: key = hash values of band, value = accessions of BGCs from MIBiG).
+    None
+        If there is no reference index (or it cannot be read or was made by another version of this module).
+    """
+    path_of_index = names_and_paths.path_of_directory_of_MIBiG_reference_index + names_and_paths.name_of_MIBiG_reference_index
+    try:
+        with open(path_of_index, "r") as file_object:
+            reference_index = json.load(file_object)
+    except (OSError, ValueError):
+        return None
+    if reference_index.get("Version") != version_of_MIBiG_reference_index:
+        return None
+
+    _, number_of_bands, number_of_rows_per_band = reference_index["Parameters"]
+    reference_index["Buckets"] = [ {} for _ in range(number_of_bands) ]
+    for accession, entry in reference_index["Entries"].items():
+        entry["Sketch"] = tuple(entry["Sketch"])
+        for number_of_band in range(number_of_bands):
+            reference_index["Buckets"][number_of_band].setdefault(entry["Sketch"][number_of_band*number_of_rows_per_band : (number_of_band + 1)*number_of_rows_per_band], []).append(accession)
+    return reference_index
+# # -----------Build, save and load reference index of MIBiG-----------------------
+
+
+# # -----------Find nearest BGCs from MIBiG of query BGCs-----------------------
+def find_nearest_MIBiG_BGCs(reference_index, inputpaths, max_number_of_hits, min_similarity):
+    """
+    Find the nearest BGCs from MIBiG of each query BGC: BGCs from MIBiG whose sketches agree with the sketch of the query BGC in all hash values of at least one band (LSH), with an estimated similarity of at least "min_similarity".
+
+    Parameters
+    ----------
+    reference_index     : dict
+        Reference index of MIBiG (see function "load_MIBiG_reference_index" above).
+    inputpaths          : list of str
+        Paths of Genbank (.gbk) files of query BGCs (paths can have the suffix "renamed", see module "deduplicate.py").
+    max_number_of_hits  : int
+        Maximum number of nearest BGCs from MIBiG per query BGC.
+    min_similarity      : float
+        Minimum estimated similarity (Jaccard index of k-mers of translations of all genes) of a query BGC and a BGC from MIBiG.
+
+    Returns
+    -------
+    hits_of_BGCs : dict of {str : list of tuple of (str, float)}
+        Key = path of query BGC, value = accessions of nearest BGCs from MIBiG and their estimated similarities (most similar first).
+    """
+    length_of_kmers, number_of_bands, number_of_rows_per_band = reference_index["Parameters"] # Note: sketches of query BGCs are made like the sketches in index.
+    hits_of_BGCs = {}
+
+    for path_of_inputfile in inputpaths:
+        _, translations = read_translations_of_all_genes(re.sub("_+renamed$", "", path_of_inputfile)) # Note: a renamed path has the suffix "renamed" behind its file extension.
+        sketch          = precluster_BGCs.make_MinHash_sketch(precluster_BGCs.make_hashes_of_kmers(translations, length_of_kmers), number_of_bands * number_of_rows_per_band)
+        hits_of_BGCs[path_of_inputfile] = []
+        if sketch is None:
+            continue
+
+        candidates = set()
+        for number_of_band in range(number_of_bands):
+            candidates.update(reference_index["Buckets"][number_of_band].get(sketch[number_of_band*number_of_rows_per_band : (number_of_band + 1)*number_of_rows_per_band], []))
+        similarities = [ (accession, precluster_BGCs.estimate_similarity(sketch, reference_index["Entries"][accession]["Sketch"])) for accession in candidates ]
+        hits_of_BGCs[path_of_inputfile] = sorted( [ hit for hit in similarities if hit[1] >= min_similarity ], key = lambda hit: (-hit[1], hit[0]) )[:max_number_of_hits]
+
+    return hits_of_BGCs
+
+
+def paths_of_nearest_MIBiG_BGCs(reference_index, hits_of_BGCs, inputpaths):
+    return sorted(set( reference_index["Entries"][accession]["Path"] for path_of_inputfile in inputpaths for accession, _ in hits_of_BGCs.get(path_of_inputfile, []) )) # Paths of Genbank files of nearest BGCs from MIBiG of given query BGCs (e.g. as input files for BiG-SCAPE).
+# # -----------Find nearest BGCs from MIBiG of query BGCs-----------------------
+
+
+# # -----------Write table of nearest BGCs from MIBiG-----------------------
+def write_table_of_nearest_MIBiG_BGCs(reference_index, hits_of_BGCs, min_similarity_for_known_BGC, path_of_table, path_of_input_dir):
+    """
+    Write a table (tab-separated) with one row per query BGC, its nearest BGCs from MIBiG and whether it is a known BGC.
+
+    Parameters
+    ----------
+    reference_index                 : dict
+        Reference index of MIBiG.
+    hits_of_BGCs                    : dict of {str : list of tuple of (str, float)}
+        Nearest BGCs from MIBiG of each query BGC (see function "find_nearest_MIBiG_BGCs" above).
+    min_similarity_for_known_BGC    : float
+        Minimum estimated similarity to the nearest BGC from MIBiG for a "known" query BGC (otherwise "novel").
+    path_of_table                   : str
+        Path of table.
+    path_of_input_dir               : str
+        Path of input directory of task 3 (paths in table are relative to this directory).
+
+    Returns
+    -------
+    int
+        Number of known query BGCs.
+
+    Output files
+    ------------
+    A table (.tsv) with the columns "BGC", "Known or novel", "Nearest BGC from MIBiG", "Name of nearest BGC from MIBiG", "Similarity" and "Other near BGCs from MIBiG".
+    """
+    create.create_directory_if_not_exists(os.path.dirname(path_of_table))
+    number_of_known_BGCs = 0
+
+    with open(path_of_table, "w") as file_object:
+        file_object.write("\t".join([ "BGC", "Known or novel", "Nearest BGC from MIBiG", "Name of nearest BGC from MIBiG", "Similarity", "Other near BGCs from MIBiG" ]) + "\n")
+        for path_of_inputfile, hits in hits_of_BGCs.items():
+            known_BGC             = len(hits) > 0 and hits[0][1] >= min_similarity_for_known_BGC
+            number_of_known_BGCs += known_BGC
+            nearest_hit           = [ hits[0][0], reference_index["Entries"][hits[0][0]]["Name"], str(round(hits[0][1], 2)) ] if len(hits) > 0 else [ "", "", "" ]
+            file_object.write("\t".join([ os.path.relpath(path_of_inputfile, path_of_input_dir), "known" if known_BGC else "novel" ] + nearest_hit + [ ", ".join( accession + " (" + str(round(similarity, 2)) + ")" for accession, similarity in hits[1:] ) ]) + "\n")
+
+    return number_of_known_BGCs
+# # -----------Write table of nearest BGCs from MIBiG-----------------------
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or not os.path.exists(sys.argv[1]):
+        print("Usage: python MIBiG_reference_index.py <path of directory or archive with Genbank files of MIBiG>")
+        sys.exit(2)
+    reference_index = build_MIBiG_reference_index(sys.argv[1])
+    print(">>> Built reference index of " + str(len(reference_index["Entries"])) + " BGCs from MIBiG in directory \"" + names_and_paths.name_of_directory_of_MIBiG_reference_index + "\".")
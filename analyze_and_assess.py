@@ -1,10 +1,13 @@
-''' This module has a function that takes in the read content of a Genbank antiSMASH-output file for a single BGC, finds and collects relevant data from the content,
+''' This module has a function that reads a Genbank antiSMASH-output file for a single BGC line by line (in one pass, without keeping the DNA sequence in memory), finds and collects relevant data from the content,
     uses these data to examine the selection criteria and decides the selection result for the query BGC. The selection result is stored in the variable "selection_status_for_BGC" and is output by the function for the further usage by other downstream module.
     A scheme of the selection algorithm can be found in the directory "info". This module also stores "textual tags" that can be used to find corresponding information (see list below). '''
 
 
+import io
 import re # Necessary!
 
+import archive_input
+
 
 # # --------------Text strings used for data extraction----------------
 # Declaration of text strings (in easy-to-read form) that are used below for data mining (below, some of these are combined with regular expressions)
@@ -30,9 +33,186 @@ delimiter_btw_CDS_blocks                                                = "   CD
 # unambiguous_aa                                                        = "X"
 
 label_for_file_of_one_BGC                                               = "NOTE: This is a single cluster extracted from a larger record!"
+regex_for_name_of_BGC                                                   = "DEFINITION([^\n]*)\n"
+regex_for_length_of_BGC                                                 = "\s\s\s([0-9]+)\s(bp){1}"
+text_tag_for_product_of_BGC                                             = "/gene_functions=\"biosynthetic (rule-based-clusters)"
 # # --------------Text strings used for data extraction----------------
 
 
+# # --------------Parse Genbank file of a BGC----------------
+def parse_BGC(lines):
+    """
+    Find and extract relevant data of a query BGC and its gene(s) (only core and additional biosynthetic genes) from the lines of its Genbank (.gbk) file, reading each line only once. The DNA sequence of the BGC is not stored, only its length and whether it contains ambiguous nucleotides ("n").
+
+    Parameters
+    ----------
+    lines : iterable of str
+        Lines of a Genbank (.gbk) file for a BGC (each with "\\n" at the end, e.g. an opened file).
+
+    Returns
+    -------
+    features_of_BGC : dict
+        Data of BGC: name of BGC, length of BGC (in bp), product(s) of BGC, data records for core and additional genes, length of DNA sequence (None if there is no "ORIGIN"), whether the DNA sequence contains ambiguous nucleotides,
+        number of "ORIGIN" (delimiter between data of genes and DNA sequence of whole BGC) and whether the label for file of one BGC was found. Together, these give the same results as splitting the whole content of the file (see function "analyze_and_assess_BGC" below).
+    """
+    features_of_BGC = {
+    "Name of BGC"                                       : None,
+    "Length of BGC (in bp)"                             : 0,    # If length of BGC cannot somehow be read
+    "Product(s) of BGC"                                 : [],
+    "Data record for core genes"                        : [],
+    "Data record for additional genes"                  : [],
+    "Length of DNA sequence"                            : None,
+    "Ambiguous nucleotide in DNA sequence"              : False,
+    "Number of delimiters btw data of genes and DNA seq": 0,
+    "Label for file of one BGC found"                   : False
+    }
+
+    name_found                  = False
+    length_found                = False
+    tail_for_length_search      = ""   # End of the text read so far that could be the beginning of the length of BGC (i.e. only spaces and digits), as the length can be split over two lines.
+    products_of_BGC             = set()
+    product_being_read          = None # Parts of a product that is read until the next ":" (the product can be split over two lines).
+    parts_of_current_CDS_block  = []
+
+    # # --------------Extract data of a gene from a finished CDS block----------------
+    def finish_CDS_block():
+        CDS_block = "".join(parts_of_current_CDS_block)
+        for gene_kind, data_record_for_gene_kind in [ ("biosynthetic", features_of_BGC["Data record for core genes"]), ("biosynthetic-additional", features_of_BGC["Data record for additional genes"]) ]:
+            if ("/gene_kind=\"" + gene_kind + "\"") in CDS_block:
+                data_of_gene = extract_data_of_gene_from_CDS_block(CDS_block)
+                if data_of_gene is not None:
+                    data_record_for_gene_kind.append(data_of_gene)
+    # # --------------Extract data of a gene from a finished CDS block----------------
+
+    # # --------------Read one line (or the part of the line before "ORIGIN") with data of genes----------------
+    def read_data_of_genes(text):
+        nonlocal name_found, length_found, tail_for_length_search, product_being_read, parts_of_current_CDS_block
+
+        if name_found == False:
+            match = re.search(regex_for_name_of_BGC, text) # Note: the first field "DEFINITION" always contains the full name of the BGC.
+            if match is not None:
+                features_of_BGC["Name of BGC"] = match.group(1).strip()
+                name_found                     = True
+
+        if length_found == False:
+            text_for_length_search = tail_for_length_search + text
+            match = re.search(regex_for_length_of_BGC, text_for_length_search) # First matching string of form: space*3 + any number + space + "bp".
+            if match is not None:
+                features_of_BGC["Length of BGC (in bp)"] = match.group(1)
+                length_found                             = True
+            else:
+                start_of_tail = len(text_for_length_search)
+                while start_of_tail > 0 and (text_for_length_search[start_of_tail - 1].isspace() or text_for_length_search[start_of_tail - 1] in "0123456789"):
+                    start_of_tail -= 1
+                tail_for_length_search = text_for_length_search[start_of_tail:]
+
+        position = 0
+        while True: # Find all products, i.e. the text between "/gene_functions="biosynthetic (rule-based-clusters)" and the next ":".
+            if product_being_read is not None:
+                end_of_product = text.find(":", position)
+                if end_of_product == -1:
+                    product_being_read.append(text[position:])
+                    break
+                product_being_read.append(text[position:end_of_product])
+                products_of_BGC.add("".join(product_being_read).replace("\n", "").strip())
+                product_being_read = None
+                position           = end_of_product + 1
+            else:
+                start_of_product = text.find(text_tag_for_product_of_BGC, position)
+                if start_of_product == -1:
+                    break
+                product_being_read = []
+                position           = start_of_product + len(text_tag_for_product_of_BGC)
+
+        parts_of_text = text.split(delimiter_btw_CDS_blocks) # Note: "   CDS   " never contains a line break, so splitting each line gives the same CDS blocks as splitting the whole text.
+        parts_of_current_CDS_block.append(parts_of_text[0])
+        for part in parts_of_text[1:]:
+            finish_CDS_block()
+            parts_of_current_CDS_block = [part]
+    # # --------------Read one line (or the part of the line before "ORIGIN") with data of genes----------------
+
+    # # --------------Read one line (or the part of the line before "ORIGIN") of DNA sequence----------------
+    def read_DNA_seq(text):
+        features_of_BGC["Length of DNA sequence"] += len(text) - text.count("\n")
+        if features_of_BGC["Ambiguous nucleotide in DNA sequence"] == False and "n" in text.lower():
+            features_of_BGC["Ambiguous nucleotide in DNA sequence"] = True
+    # # --------------Read one line (or the part of the line before "ORIGIN") of DNA sequence----------------
+
+    for line in lines:
+        if features_of_BGC["Label for file of one BGC found"] == False and label_for_file_of_one_BGC in line:
+            features_of_BGC["Label for file of one BGC found"] = True
+
+        if line.endswith(delimiter_btw_data_of_genes_and_DNA_seq_of_whole_BGC): # "ORIGIN\n" always ends a line.
+            features_of_BGC["Number of delimiters btw data of genes and DNA seq"] += 1
+            text_before_delimiter = line[:-len(delimiter_btw_data_of_genes_and_DNA_seq_of_whole_BGC)]
+            if features_of_BGC["Number of delimiters btw data of genes and DNA seq"] == 1:
+                read_data_of_genes(text_before_delimiter)
+                finish_CDS_block()
+                features_of_BGC["Length of DNA sequence"] = 0
+            elif features_of_BGC["Number of delimiters btw data of genes and DNA seq"] == 2:
+                read_DNA_seq(text_before_delimiter) # Only the text between the first and the second "ORIGIN" is the DNA sequence.
+        elif features_of_BGC["Number of delimiters btw data of genes and DNA seq"] == 0:
+            read_data_of_genes(line)
+        elif features_of_BGC["Number of delimiters btw data of genes and DNA seq"] == 1:
+            read_DNA_seq(line)
+
+    if features_of_BGC["Number of delimiters btw data of genes and DNA seq"] == 0:
+        finish_CDS_block()
+
+    features_of_BGC["Product(s) of BGC"] = sorted(products_of_BGC) # All products in the list should be sorted in a certain order, so that all hybrids with the same constituent products will have identical lists of products.
+
+    return features_of_BGC
+
+
+def parse_genbank_file_of_BGC(path_of_inputfile):
+    """
+    Read a Genbank (.gbk) file for a BGC line by line and extract relevant data of the BGC (see function "parse_BGC" above).
+
+    Parameters
+    ----------
+    path_of_inputfile : str
+        Path of a Genbank (.gbk) file for a BGC.
+
+    Returns
+    -------
+    features_of_BGC : dict
+        Data of BGC (see function "parse_BGC" above).
+    """
+    with archive_input.open_file(path_of_inputfile, "r") as file_object: # Note: file can also be in an archive (see module "archive_input.py").
+        return parse_BGC(file_object)
+
+
+def extract_data_of_gene_from_CDS_block(block):
+    """
+    Extract locus, position and translation of a gene from its CDS block.
+
+    Parameters
+    ----------
+    block : str
+        CDS block of a gene (text between two occurrences of "   CDS   ").
+
+    Returns
+    -------
+    dict of {str : str or list of str}
+        Locus, position ([start position, end position]) and translation of gene.
+    None
+        If one type of information (locus, position, translation) about the gene is insufficient/has incompatible format (treated as if the gene was not there), because further examination for this gene would be impossible.
+    """
+    try:
+        locus_of_gene        = re.search("/locus_tag=\"([^\"]*)\"", block).group(1)                                          # Search for the first "locus_tag" entry in the CDS block and extract from it the locus of gene (".group(1)" returns the matching substring defined by the capturing group in parentheses).
+        position_of_gene     = re.search("[0-9]+\.\.[0-9]+", block).group(0).split("..")                                     # Search in the CDS block for the first match and returns a list (with ".split()"): [start position, end position] (.group(0) returns the whole matching string).
+        translation_of_gene  = re.search("/translation=\"([A-Z\n\s]*)\"", block).group(1).replace("\n", "").replace(" ", "") # Return (with "re.search()") the (first matching) translation in the CDS block for the gene (".group(1)" returns only the translation part without the string "/translation="...""). Note: in each CDS block for each gene, the first occurring translation is always the complete translation of the gene. Last two ".replace()" methods for removing "\n" and spaces (for readability).
+    except:
+        return None
+
+    return {
+        "locus"         : locus_of_gene,
+        "position"      : position_of_gene,
+        "translation"   : translation_of_gene
+    }
+# # --------------Parse Genbank file of a BGC----------------
+
+
 def analyze_and_assess_BGC(content, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection):
     """
     Find, extract and store relevant data of a query BGC and its gene(s) (only core and additional biosynthetic genes) from the content of its Genbank (.gbk) file, then use these data to assess the query BGC.
@@ -48,6 +228,32 @@ def analyze_and_assess_BGC(content, param_for_preliminary_selection, param_for_m
     param_for_2nd_chance_selection      : dict of {str : str}
         Parameter for second-chance selection, i.e. minimum number of additional biosynthetic genes.
 
+    Returns
+    -------
+    info_of_BGC                 : dict of {str : str}
+        General information of BGC: name of BGC, length of BGC (in bp) and product(s) of BGC.
+    selection_status_for_BGC    : str
+        Selection result of BGC: either "discarded", "passed main selection" or "passed second-chance selection".
+    """
+    features_of_BGC = parse_BGC(io.StringIO(content, newline="\n")) # Note: newline="\n" splits the content only at "\n" (like splitting the whole content).
+    return assess_BGC(features_of_BGC, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection)
+
+
+def assess_BGC(features_of_BGC, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection):
+    """
+    Use the extracted data of a query BGC (see function "parse_BGC" above) to assess the query BGC.
+
+    Parameters
+    ----------
+    features_of_BGC                     : dict
+        Data of BGC (see function "parse_BGC" above).
+    param_for_preliminary_selection     : dict of {str : str}
+        Parameter for preliminary selection, i.e. minimum number of core genes.
+    param_for_main_selection            : dict of {str : str}
+        Parameters for main selection, i.e. minimum length of cluster (in bp), minimum distance of each core gene to edges of cluster (in bp) and minimum number of additional biosynthetic genes.
+    param_for_2nd_chance_selection      : dict of {str : str}
+        Parameter for second-chance selection, i.e. minimum number of additional biosynthetic genes.
+
     Returns
     -------
     info_of_BGC                 : dict of {str : str}
@@ -65,94 +271,26 @@ def analyze_and_assess_BGC(content, param_for_preliminary_selection, param_for_m
     min_num_of_additional_genes_for_2nd_chance_selection        = param_for_2nd_chance_selection["Minimum number of additional biosynthetic genes"]
     # # --------------Get values for parameters----------------
 
-    splitted_content = content.split(delimiter_btw_data_of_genes_and_DNA_seq_of_whole_BGC) # Split the content of the file at "ORIGIN" (which is the text between data of genes and the DNA sequence of whole BGC) and return a list of two elements. The first element is a string that contains the CDS blocks of all gene(s), the second element is a string that contains the DNA sequence of the BGC.
-
-    # # --------------Extract DNA sequence of BGC----------------
-    DNA_seq_of_BGC = splitted_content[1].replace("\n", "").lower() # Get the second element of the list "splitted_content", which is the DNA sequence of BGC.
-    # # --------------Extract DNA sequence of BGC----------------
-
-    # # --------------Extract general information of BGC----------------
-    data_of_all_genes = splitted_content[0] # Get the first element of the list "splitted_content", which contains the CDS blocks of all gene(s).
+    # # --------------Get extracted data of BGC----------------
+    if features_of_BGC["Length of DNA sequence"] is None:
+        raise IndexError("Genbank file of BGC contains no \"ORIGIN\"!") # DNA sequence of BGC cannot be found.
 
     info_of_BGC = {}
+    info_of_BGC["Name of BGC"]             = features_of_BGC["Name of BGC"]
+    info_of_BGC["Length of BGC (in bp)"]   = features_of_BGC["Length of BGC (in bp)"]
+    info_of_BGC["Product(s) of BGC"]       = features_of_BGC["Product(s) of BGC"]
 
-    # Use try...except... blocks here to skip extracting data for query BGC in case one of the following types of information is not readable:
-    try:
-        name_of_BGC     = re.search("DEFINITION([^\n]*)\n", data_of_all_genes).group(1).strip() # Note: the (unique) field "DEFINITION" always contains the full name of the BGC (with possibly the length (in bp) of it). With the string method ".strip()", the extracted name does not contain any leading/trailing spaces (for better readability).
-    except:
-        name_of_BGC     = None # If name of BGC cannot somehow be read
-    try:
-        length_of_BGC   = re.search("\s\s\s([0-9]+)\s(bp){1}", data_of_all_genes).group(1) # Return the first matching string of form: space*3 + any number + space + "bp" (the three spaces separate the length from the name of BGC). The method ".group(1)" retrieves only the numeric part.
-    except:
-        length_of_BGC   = 0   # If length of BGC cannot somehow be read
-    try:
-        products_of_BGC = list( set( [product.replace("\n", "").strip() for product in re.findall("/gene_functions=\"biosynthetic \(rule-based-clusters\)([^:]*):", data_of_all_genes)] ) ) # "set()" to eliminate duplicates, at the end a list of (nonduplicate) product(s) will be returned. Note: re.findall(pattern, text) returns the matching substring defined by the capturing group (...) (if there is such a group in the pattern) so .group() is not needed to extract to matching substring.
-                                                                                                                                                                                            # Note: the field "/product="..."" sometimes can contain unrelated or specific information about the product(s) of the BGC, whereas the information in the field "/gene_functions="biosynthetic (rule-based-clusters) ..." always contains general information (i.e., class(es) of products) that suffices the selection procedure.
-        products_of_BGC.sort() # All products in the list should be sorted in a certain order, so that all hybrids with the same constituent products will have identical lists of products. (Note: this method has to be executed separated from the above code, e.g. in a new line!)
-    except:
-        products_of_BGC = [] # In case the BGC has no product or data for the product(s) is incompatible, assign an empty list (in most cases this is equivalent to the case where the BGC has no annotated core biosynthetic gene).
-
-    info_of_BGC["Name of BGC"]             = name_of_BGC
-    info_of_BGC["Length of BGC (in bp)"]   = length_of_BGC
-    info_of_BGC["Product(s) of BGC"]       = products_of_BGC
-    # # --------------Extract general information of BGC----------------
-
-    # # --------------Define function for finding, extracting and storing relevant data for a gene kind in BGC----------------
-
-    def extract_and_store_data_for_a_gene_kind(content, gene_kind, data_record_for_gene_kind):
-        # # --------------Identify all fields containing data for the given gene kind----------------
-        CDS_blocks_for_gene_kind = [ CDS_block for CDS_block in data_of_all_genes.split(delimiter_btw_CDS_blocks) if ("/gene_kind=\"" + gene_kind + "\"") in CDS_block ] # "delimiter_btw_CDS_blocks" = "   CDS   " (defined above).
-                                                                                                                                                                         # Split content of file at each occurrence of "   CDS   " and keep only the CDS blocks with data to given "gene_kind". Spaces in the searching pattern ("   CDS   ") are important! (So that unrelated fields such as translations, i.e. protein sequences that happen to contain "CDS", will not be splitted as well, allowing the whole CDS blocks to be each obtained).
-                                                                                                                                                                         # Due to the "if" condition in the list comprehension, the list "CDS_blocks_for_gene_kind" contains as many elements as the CDS blocks for the given gene kind in file content.
-        # # --------------Identify all fields containing data for the given gene kind----------------
-
-        # # --------------Extract needed data of given gene kind----------------
-        if len(CDS_blocks_for_gene_kind) > 0: # Only proceed to extract data for the given gene kind if this list has at least 1 element, i.e. contains at least one CDS block for gene kind. In case no CDS block for gene kind is present in "content", this list would be an empty list, i.e. [].
-            for block in CDS_blocks_for_gene_kind:
-                try:
-                    locus_of_gene        = re.search("/locus_tag=\"([^\"]*)\"", block).group(1)                                          # Search for the first "locus_tag" entry in the CDS block and extract from it the locus of gene (".group(1)" returns the matching substring defined by the capturing group in parentheses).
-                    position_of_gene     = re.search("[0-9]+\.\.[0-9]+", block).group(0).split("..")                                     # Search in the CDS block for the first match and returns a list (with ".split()"): [start position, end position] (.group(0) returns the whole matching string).
-                    translation_of_gene  = re.search("/translation=\"([A-Z\n\s]*)\"", block).group(1).replace("\n", "").replace(" ", "") # Return (with "re.search()") the (first matching) translation in the CDS block for the gene (".group(1)" returns only the translation part without the string "/translation="...""). Note: in each CDS block for each gene, the first occurring translation is always the complete translation of the gene. Last two ".replace()" methods for removing "\n" and spaces (for readability).
-                except:
-                    continue # Skip to next block when only one type of information (locus, position, translation) about the gene in current block is insufficient/has incompatible format (treated as if the gene was not there), because further examination for this gene would be impossible.
-        # # --------------Extract needed data of given gene kind----------------
-
-        # # --------------Store extracted data in given record----------------
-                data_record_for_gene_kind.append(
-                {
-                    "locus"         : locus_of_gene,
-                    "position"      : position_of_gene,
-                    "translation"   : translation_of_gene
-                }
-                ) # Only executed if block "try" was executed successfully. Otherwise, if block "except" was executed, these code lines will be skipped.
-        # # --------------Store extracted data in given record----------------
-
-    # # --------------Define function for finding, extracting and storing relevant data for a gene kind in BGC----------------
-
-    # # --------------Define data records for storing data of gene kinds----------------
-    data_record_for_core_genes                  = []
-    data_record_for_additional_genes            = []
-    # data_record_for_transport_genes           = [] # not so necessary
-    # data_record_for_regulatory_genes          = [] # not so necessary
-    # data_record_for_resistance_genes          = [] # not so necessary
-    # Note: assume at the beginning that there is no record for each of these gene kinds in file content (i.e. each list is empty at the beginning).
-    # # --------------Define data records for storing data of gene kinds----------------
-
-    # # --------------Extract and store data for specified gene kinds in BGC----------------
-    extract_and_store_data_for_a_gene_kind(content, gene_kind = "biosynthetic", data_record_for_gene_kind = data_record_for_core_genes)
-    extract_and_store_data_for_a_gene_kind(content, gene_kind = "biosynthetic-additional", data_record_for_gene_kind = data_record_for_additional_genes)
-    # extract_and_store_data_for_a_gene_kind(content, gene_kind = "transport", data_record_for_transport_genes)   # not necessary
-    # extract_and_store_data_for_a_gene_kind(content, gene_kind = "regulatory", data_record_for_regulatory_genes) # not necessary
-    # extract_and_store_data_for_a_gene_kind(content, gene_kind = "resistance", data_record_for_resistance_genes) # not necessary
-    # # --------------Extract and store data for specified gene kinds in BGC----------------
+    data_record_for_core_genes             = features_of_BGC["Data record for core genes"]
+    data_record_for_additional_genes       = features_of_BGC["Data record for additional genes"]
+    # # --------------Get extracted data of BGC----------------
 
     # # --------------Check selection criteria and select if fulfilled or discard if not----------------
     selection_status_for_BGC     = "discarded" # Define variable that will contain selection result for BGC (assume at the beginning that BGC does not pass any selection round). This variable will store at the end of analysis for BGC only one of three results: "passed main selection", "passed second-chance selection" or "discarded".
 
     # # --------------Preliminary selection----------------
-    if len(DNA_seq_of_BGC) == 0 or len(info_of_BGC["Product(s) of BGC"]) == 0 or len(data_record_for_core_genes) < int(min_num_of_core_genes):
+    if features_of_BGC["Length of DNA sequence"] == 0 or len(info_of_BGC["Product(s) of BGC"]) == 0 or len(data_record_for_core_genes) < int(min_num_of_core_genes):
         selection_status_for_BGC = "discarded"
-    elif "n" in DNA_seq_of_BGC:
+    elif features_of_BGC["Ambiguous nucleotide in DNA sequence"] == True:
         selection_status_for_BGC = "discarded"
     else:
         for gene in (data_record_for_core_genes + data_record_for_additional_genes): # Merge two lists together for examination:
@@ -165,7 +303,7 @@ def analyze_and_assess_BGC(content, param_for_preliminary_selection, param_for_m
 
     # # --------------Main & second-chance selection----------------
     if selection_status_for_BGC == "passed preliminary selection":
-        if int(info_of_BGC["Length of BGC (in bp)"]) >= int(min_length) \
+        if int(info_of_BGC["Length of BGC (in bp)"]) >= int(min_length) and len(data_record_for_core_genes) > 0 \
             and int(data_record_for_core_genes[0]["position"][0]) >= int(min_distance) \
                 and int(info_of_BGC["Length of BGC (in bp)"]) - int(data_record_for_core_genes[-1]["position"][1]) >= int(min_distance) \
                     and len(data_record_for_additional_genes) >= int(min_num_of_additional_genes_for_main_selection):
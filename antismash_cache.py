@@ -0,0 +1,207 @@
+''' This module keeps a cache of antiSMASH results, so that input files for task 1 that were already analyzed by antiSMASH do not need to be analyzed again. Each antiSMASH run is identified by a "key", i.e. a hash of the content of the input file,
+    of the options passed to antiSMASH (see module "run_antismash.py") and of the run file of antiSMASH (which contains the version of antiSMASH). Results of an antiSMASH run are stored under this key in the directory "cache_of_antiSMASH" as hard links
+    to the files in the antiSMASH-output directory (so that the cache does not need extra disk space), and can be linked back into the antiSMASH-output directory at once when the same key is found again. '''
+
+
+import os
+import shutil
+import hashlib
+
+import names_and_paths
+import run_antismash
+import archive_input
+
+
+size_of_chunks_for_hashing = 1024 * 1024 # Number of bytes read at a time when hashing a file (so that large input files are never loaded completely into memory).
+
+
+# # -----------Make key of an antiSMASH run for an input file-----------------------
+def make_key_of_antismash_run(path_of_inputfile):
+    """
+    Make the key of an antiSMASH run for a given input file, i.e. a hash of the content of the input file, the options passed to antiSMASH and the run file of antiSMASH.
+
+    Parameters
+    ----------
+    path_of_inputfile : str
+        Path of an input file for antiSMASH (e.g. a .fasta file).
+
+    Returns
+    -------
+    str
+        Key (hexadecimal string) of antiSMASH run for input file.
+    """
+    hash_object = hashlib.sha256()
+
+    path_of_antismash_runfile = names_and_paths.path_of_directory_of_thirdparty_programs + "run_antismash"
+    if os.path.isfile(path_of_antismash_runfile):
+        with open(path_of_antismash_runfile, "rb") as file_object:
+            hash_object.update(file_object.read()) # The run file of antiSMASH is small and contains the version of antiSMASH, so that results of another version of antiSMASH will not be reused.
+
+    hash_object.update(("\0" + " ".join(run_antismash.antismash_options) + "\0").encode())
+
+    with archive_input.open_file(path_of_inputfile, "rb") as file_object: # Note: input file can also be in an archive (see module "archive_input.py").
+        for chunk in iter(lambda: file_object.read(size_of_chunks_for_hashing), b""):
+            hash_object.update(chunk)
+
+    return hash_object.hexdigest()
+# # -----------Make key of an antiSMASH run for an input file-----------------------
+
+
+# # -----------Read key of antiSMASH run from an antiSMASH-output directory-----------------------
+def read_key_of_antismash_output_directory(path_of_antismash_output_directory):
+    """
+    Read the key of the antiSMASH run that created a given antiSMASH-output directory.
+
+    Parameters
+    ----------
+    path_of_antismash_output_directory : str
+        Path of an antiSMASH-output directory.
+
+    Returns
+    -------
+    str
+        Key of antiSMASH run, if the directory contains complete results of antiSMASH and its key is known.
+    None
+        Otherwise.
+    """
+    path_of_file_with_key = os.path.join(path_of_antismash_output_directory, names_and_paths.name_of_file_with_key_of_antismash_run)
+    if not is_complete_antismash_output_directory(path_of_antismash_output_directory) or not os.path.isfile(path_of_file_with_key):
+        return None
+    with open(path_of_file_with_key, "r") as file_object:
+        return file_object.read().strip()
+# # -----------Read key of antiSMASH run from an antiSMASH-output directory-----------------------
+
+
+# # -----------Check if antiSMASH-output directory contains complete results-----------------------
+def is_complete_antismash_output_directory(path_of_antismash_output_directory):
+    """
+    Check if a given antiSMASH-output directory contains complete results of antiSMASH (antiSMASH writes the file "index.html" as last step of a successful run).
+
+    Parameters
+    ----------
+    path_of_antismash_output_directory : str
+        Path of an antiSMASH-output directory.
+
+    Returns
+    -------
+    bool
+    """
+    return os.path.isfile(os.path.join(path_of_antismash_output_directory, "index.html"))
+# # -----------Check if antiSMASH-output directory contains complete results-----------------------
+
+
+# # -----------Link all files of a directory to another directory-----------------------
+def link_directory(path_of_source_directory, path_of_destination_directory):
+    """
+    Recreate a directory with all its files in another location, using hard links for the files (or copies, if hard links are not possible, e.g. across file systems).
+
+    Parameters
+    ----------
+    path_of_source_directory        : str
+        Path of directory to link.
+    path_of_destination_directory   : str
+        Path of directory that will contain the linked files.
+
+    Returns
+    -------
+    None.
+    """
+    def link_or_copy_file(path_of_source_file, path_of_destination_file):
+        try:
+            os.link(path_of_source_file, path_of_destination_file)
+        except OSError:
+            shutil.copy2(path_of_source_file, path_of_destination_file) # Fallback, e.g. if source and destination are on different file systems.
+        return path_of_destination_file
+
+    shutil.copytree(path_of_source_directory, path_of_destination_directory, copy_function=link_or_copy_file, dirs_exist_ok=True)
+# # -----------Link all files of a directory to another directory-----------------------
+
+
+# # -----------Find results of antiSMASH for a key in cache-----------------------
+def find_cached_antismash_results(key):
+    """
+    Find results of antiSMASH in cache for a given key.
+
+    Parameters
+    ----------
+    key : str
+        Key of an antiSMASH run.
+
+    Returns
+    -------
+    str
+        Path of directory in cache that contains complete results of antiSMASH for key.
+    None
+        If no complete results can be found in cache for key.
+    """
+    path_of_cached_results = names_and_paths.path_of_directory_of_cache_of_antismash_results + key
+    if is_complete_antismash_output_directory(path_of_cached_results):
+        return path_of_cached_results
+    return None
+# # -----------Find results of antiSMASH for a key in cache-----------------------
+
+
+# # -----------Store results of an antiSMASH run in cache-----------------------
+def store_antismash_results_in_cache(key, path_of_antismash_output_directory):
+    """
+    Store results of an antiSMASH run in cache (as hard links), if the run was complete and the key is not already in cache.
+
+    Parameters
+    ----------
+    key                                 : str
+        Key of antiSMASH run.
+    path_of_antismash_output_directory  : str
+        Path of antiSMASH-output directory of run.
+
+    Returns
+    -------
+    bool
+        True if results were stored in cache, else False.
+
+    Output folder
+    -------------
+    A directory in "cache_of_antiSMASH", named with the key, that contains hard links to all files of antiSMASH-output directory.
+    """
+    if not is_complete_antismash_output_directory(path_of_antismash_output_directory):
+        return False # Do not store incomplete results (e.g. if antiSMASH failed).
+
+    with open(os.path.join(path_of_antismash_output_directory, names_and_paths.name_of_file_with_key_of_antismash_run), "w") as file_object:
+        file_object.write(key + "\n") # Mark antiSMASH-output directory with its key (so that it can be recognized in the next runs of task 1).
+
+    if find_cached_antismash_results(key) is not None:
+        return False # Key is already in cache.
+
+    path_of_cached_results      = names_and_paths.path_of_directory_of_cache_of_antismash_results + key
+    path_of_temporary_directory = path_of_cached_results + "__incomplete"
+    if os.path.isdir(path_of_temporary_directory):
+        shutil.rmtree(path_of_temporary_directory) # Remove leftover of an interrupted earlier attempt.
+    link_directory(path_of_antismash_output_directory, path_of_temporary_directory)
+    if os.path.isdir(path_of_cached_results):
+        shutil.rmtree(path_of_cached_results) # Remove incomplete entry (without "index.html") with same key.
+    os.rename(path_of_temporary_directory, path_of_cached_results) # Rename only at the end, so that an entry in cache is always complete.
+    return True
+# # -----------Store results of an antiSMASH run in cache-----------------------
+
+
+# # -----------Restore results of antiSMASH from cache to an antiSMASH-output directory-----------------------
+def restore_antismash_results_from_cache(path_of_cached_results, path_of_antismash_output_directory):
+    """
+    Link results of antiSMASH from cache into a given antiSMASH-output directory.
+
+    Parameters
+    ----------
+    path_of_cached_results              : str
+        Path of directory in cache that contains results of antiSMASH.
+    path_of_antismash_output_directory  : str
+        Path of antiSMASH-output directory that will contain the results.
+
+    Returns
+    -------
+    None.
+
+    Output folder
+    -------------
+    An antiSMASH-output directory that contains hard links to the files of the cached results.
+    """
+    link_directory(path_of_cached_results, path_of_antismash_output_directory)
+# # -----------Restore results of antiSMASH from cache to an antiSMASH-output directory-----------------------
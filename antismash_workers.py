@@ -0,0 +1,149 @@
+''' This module keeps a fixed number of antiSMASH docker containers ("warm workers") alive during task 1, so that each antiSMASH run is started with "docker exec" in a running container, instead of starting a new container for every input file
+    (as the run file "run_antismash" of antiSMASH does). For many small input files (e.g. thousands of genomes of isolates), the start of a container (and the first access to the image and databases of antiSMASH) otherwise takes a large part of the run time.
+    The directory of the run and the input directory for antiSMASH are mounted into each container at the same paths as on the machine, so that all paths can be passed to antiSMASH unchanged. Input files outside of these directories
+    are analyzed with the run file of antiSMASH as before. A worker is replaced by a new container after a run was stopped by a timeout or if its container is no longer running. '''
+
+
+import os
+import re
+
+import names_and_paths
+import input_parameters
+import run_process
+
+
+prefix_of_names_of_containers   = "antismash_worker_"   # Name of container of a worker = prefix + ID of process of pipeline + "_" + number of worker, so that workers of several runs of the pipeline at the same time never have the same name.
+command_of_antismash            = "antismash"           # Command that runs antiSMASH in the image of antiSMASH.
+regex_for_image_of_antismash    = re.compile(r"antismash/[\w\-]+(?::[^\s\"']+)?") # Name of docker image of antiSMASH in the run file of antiSMASH, e.g. "antismash/standard:7.1.0" or "antismash/standard:${TAG}".
+
+
+# # -----------Helper functions-----------------------
+def path_of_log_file_of_workers():
+    return names_and_paths.path_of_directory_of_logs + "antiSMASH/warm_workers.log"
+
+
+def run_docker_command(arguments):
+    return run_process.run_process([ "docker" ] + arguments, path_of_log_file_of_workers(), wall_clock_timeout_in_s = 300)["Exit code"] == 0 # Note: only short docker commands (start and stop of containers).
+
+
+def find_docker_image_of_antismash():
+    """
+    Find the name of the docker image of antiSMASH, given by the parameter "docker_image_of_antismash" in module "input_parameters.py" or else in the run file of antiSMASH (variables in the name, e.g. "${TAG}", are replaced by their values in the run file).
+
+    Returns
+    -------
+    name_of_image : str
+        Name of docker image of antiSMASH (e.g. "antismash/standard:7.1.0").
+    None
+        If the name of image cannot be found.
+    """
+    if input_parameters.docker_image_of_antismash != "":
+        return input_parameters.docker_image_of_antismash
+
+    path_of_antismash_runfile = names_and_paths.path_of_directory_of_thirdparty_programs + "run_antismash"
+    if not os.path.isfile(path_of_antismash_runfile):
+        return None
+    with open(path_of_antismash_runfile, "r", errors = "replace") as file_object:
+        content_of_runfile = file_object.read()
+
+    match = regex_for_image_of_antismash.search(content_of_runfile)
+    if match is None:
+        return None
+
+    values_of_variables = { name_of_variable : value.strip("\"'") for name_of_variable, value in re.findall(r"^\s*(?:readonly\s+|export\s+)?(\w+)=(\S+)", content_of_runfile, re.MULTILINE) } # Variables of the run file (shell script), e.g. "VERSION=7.1.0".
+
+    def replace_variable(match_of_variable): # E.g. "${TAG}", "$TAG" or "${TAG:-latest}".
+        name_of_variable, default_value = match_of_variable.group(1) or match_of_variable.group(3), match_of_variable.group(2)
+        value = values_of_variables.get(name_of_variable, default_value or "")
+        return re.sub(r"\$\{\w+:-([^}]*)\}", r"\1", value) # Note: the value of a variable can itself be a variable with default value, e.g. "TAG=${ANTISMASH_TAG:-7.1.0}".
+
+    name_of_image = re.sub(r"\$\{(\w+)(?::-([^}]*))?\}|\$(\w+)", replace_variable, match.group(0))
+    return None if "$" in name_of_image or name_of_image.endswith(":") else name_of_image
+# # -----------Helper functions-----------------------
+
+
+# # -----------Start and stop workers-----------------------
+def start_antismash_worker(worker):
+    run_docker_command([ "rm", "--force", worker["Name of container"] ]) # Remove an old container with the same name (e.g. a worker that was replaced).
+    arguments = [ "run", "--detach", "--rm", "--name", worker["Name of container"], "--user", str(os.getuid()) + ":" + str(os.getgid()), "--env", "HOME=/tmp", "--entrypoint", "sleep" ] # Note: the container only waits ("sleep"), antiSMASH runs are started in it with "docker exec".
+    for path_of_mounted_directory in worker["Mounted directories"]:
+        arguments += [ "--volume", path_of_mounted_directory + ":" + path_of_mounted_directory ] # Same path in container as on the machine.
+    worker["Running"] = run_docker_command(arguments + [ worker["Image"], "infinity" ])
+    return worker["Running"]
+
+
+def is_antismash_worker_running(worker):
+    return run_process.run_process([ "docker", "exec", worker["Name of container"], "true" ], path_of_log_file_of_workers(), wall_clock_timeout_in_s = 60)["Exit code"] == 0
+
+
+def start_pool_of_antismash_workers(number_of_workers):
+    """
+    Start a fixed number of warm workers, i.e. containers of antiSMASH that stay alive until they are stopped (see function "stop_pool_of_antismash_workers" below).
+
+    Parameters
+    ----------
+    number_of_workers : int
+        Number of workers (i.e. antiSMASH runs at the same time).
+
+    Returns
+    -------
+    workers : list of dict
+        Each worker contains "Name of container", "Image", "Mounted directories" (real paths of directory of run and input directory for antiSMASH) and "Running" (False if container could not be restarted).
+    None
+        If the docker image of antiSMASH cannot be found or a container cannot be started (antiSMASH is then run with its run file).
+    """
+    name_of_image = find_docker_image_of_antismash()
+    if name_of_image is None:
+        print("\n> Cannot find docker image of antiSMASH in run file of antiSMASH (set parameter \"docker_image_of_antismash\" in module \"input_parameters.py\")! antiSMASH runs without warm workers.")
+        return None
+
+    paths_of_mounted_directories    = list(dict.fromkeys( os.path.realpath(path_of_directory) for path_of_directory in [ names_and_paths.common_path, names_and_paths.path_of_directory_of_input_for_antismash ] ))
+    workers                         = []
+    for number_of_worker in range(1, number_of_workers + 1):
+        worker = { "Name of container" : prefix_of_names_of_containers + str(os.getpid()) + "_" + str(number_of_worker), "Image" : name_of_image, "Mounted directories" : paths_of_mounted_directories }
+        if not start_antismash_worker(worker):
+            print("\n> Cannot start warm worker of antiSMASH (see log file \"" + path_of_log_file_of_workers() + "\")! antiSMASH runs without warm workers.")
+            stop_pool_of_antismash_workers(workers)
+            return None
+        workers.append(worker)
+    return workers
+
+
+def stop_pool_of_antismash_workers(workers):
+    for worker in workers or []:
+        run_docker_command([ "rm", "--force", worker["Name of container"] ])
+# # -----------Start and stop workers-----------------------
+
+
+# # -----------Run antiSMASH in a worker-----------------------
+def can_run_in_antismash_worker(worker, path_of_inputfile, path_of_antismash_output_directory):
+    return worker["Running"] == True and all( any( os.path.realpath(path) == path_of_mounted_directory or os.path.realpath(path).startswith(path_of_mounted_directory + "/") for path_of_mounted_directory in worker["Mounted directories"] ) for path in [ path_of_inputfile, path_of_antismash_output_directory ] ) # Input file and output directory must be visible in container.
+
+
+def make_arguments_for_antismash_worker(worker, path_of_inputfile, path_of_antismash_output_directory, options_of_antismash):
+    return [ "docker", "exec", worker["Name of container"], command_of_antismash, os.path.realpath(path_of_inputfile), "--output-dir", os.path.realpath(path_of_antismash_output_directory) ] + options_of_antismash
+
+
+def replace_antismash_worker_if_broken(worker, result_of_run):
+    """
+    Replace the container of a worker by a new container after a failed antiSMASH run, if the run was stopped by a timeout (then only "docker exec" was stopped, antiSMASH could still run in container) or if the container is no longer running.
+
+    Parameters
+    ----------
+    worker          : dict
+        Worker of the run (see function "start_pool_of_antismash_workers" above).
+    result_of_run   : dict
+        Result of the failed antiSMASH run (see module "run_process.py").
+
+    Returns
+    -------
+    bool
+        True if the container was broken and was replaced (e.g. so that the run can be repeated in the new container), otherwise False.
+    """
+    if result_of_run["Timed out"] == False and is_antismash_worker_running(worker):
+        return False # antiSMASH failed for its input, not the worker.
+    if not start_antismash_worker(worker):
+        print("\n> Cannot restart warm worker of antiSMASH \"" + worker["Name of container"] + "\" (see log file \"" + path_of_log_file_of_workers() + "\")! Its next input files are analyzed with the run file of antiSMASH.")
+        return False
+    return result_of_run["Timed out"] == False # Note: a run that was stopped by a timeout is not repeated.
+# # -----------Run antiSMASH in a worker-----------------------
@@ -0,0 +1,278 @@
+''' This module lets all tasks read their input files directly from archives (.zip, .tar.gz/.tgz and .gz), instead of extracting the archives to disk first (see module "unzip.py"). A file in an archive is given by a "path in archive",
+    i.e. the path of the archive and the name of the file in the archive, separated by "::" (e.g. ".../samples.zip::sample_1/genome.fasta"), which can be used like the path of a file with the functions below (open, stat and copy).
+    Only if an external program (e.g. antiSMASH) needs the path of a real file, a file in an archive is written to disk (see function "materialise_file" below) and removed again after use.
+    Files in a .tar.gz/.tgz archive cannot be read in any order without unpacking the archive again from its beginning for each file, so the files of such an archive with the file extension of the first file read (e.g. all .gbk files) are written to disk once,
+    in the order of the archive (and removed again when the archives are closed). Note: archives inside of archives are not read (these can still be extracted with module "unzip.py"). '''
+
+
+import os
+import io
+import gzip
+import shutil
+import tarfile
+import zipfile
+import tempfile
+import threading
+import contextlib
+
+import create
+import names_and_paths
+
+
+separator_of_archive_and_file   = "::" # Separator between path of archive and name of file in archive.
+file_extensions_of_archives     = [ ".zip", ".tar.gz", ".tgz", ".gz" ] # Note: ".tar.gz" must be checked before ".gz".
+opened_archives                 = {}   # Opened archives, so that an archive with many files is not opened (and its list of files read) again for each file. Key = (process, thread, path of archive), as an opened archive cannot be shared by processes or threads.
+extracted_tar_archives          = {}   # Key = (process, path of .tar.gz/.tgz archive, file extension), value = lock of extraction (so that only one thread extracts the files, without blocking other archives), path of temporary folder with extracted files and threads that read the files.
+lock_of_opened_archives         = threading.Lock()
+
+
+# # -----------Helper functions-----------------------
+def is_path_in_archive(path_of_file):
+    if separator_of_archive_and_file not in path_of_file:
+        return False
+    path_of_archive = split_path_in_archive(path_of_file)[0]
+    return type_of_archive(path_of_archive) is not None and os.path.isfile(path_of_archive) # Note: "::" can also be part of a real path (e.g. of a directory), which is then not a path in archive.
+
+
+def split_path_in_archive(path_of_file):
+    return path_of_file.split(separator_of_archive_and_file, 1) # Path of archive, name of file in archive.
+
+
+def is_file_to_list(name_of_file, file_extensions):
+    return name_of_file.endswith(tuple(file_extensions)) and not name_of_file.split("/")[-1].startswith(tuple(names_and_paths.prefixes_of_names_of_incompatible_files)) # Note: incompatible files (see module "names_and_paths.py") are never listed.
+
+
+def name_of_file(path_of_file):
+    if is_path_in_archive(path_of_file):
+        return split_path_in_archive(path_of_file)[1].split("/")[-1] # Name of file in archive (without its folders in archive and without the path of archive).
+    return path_of_file.split("/")[-1]
+
+
+def type_of_archive(path_of_archive):
+    for file_extension in file_extensions_of_archives:
+        if path_of_archive.endswith(file_extension):
+            return { ".zip" : "zip", ".tar.gz" : "tar", ".tgz" : "tar", ".gz" : "gz" }[file_extension]
+    return None
+
+
+def get_opened_archive(path_of_archive):
+    key = (os.getpid(), threading.get_ident(), path_of_archive)
+    with lock_of_opened_archives:
+        if key not in opened_archives:
+            opened_archives[key] = zipfile.ZipFile(path_of_archive, "r") if type_of_archive(path_of_archive) == "zip" else tarfile.open(path_of_archive, "r:gz")
+        return opened_archives[key]
+
+
+def close_all_archives():
+    """
+    Close the archives opened by the current thread and by finished threads (e.g. workers of the current thread) and remove extracted files that no running thread reads anymore.
+    Note: archives of other running threads of the process (e.g. another run or another task of the same run, see module "start_and_command.py") are not closed.
+    """
+    with lock_of_opened_archives:
+        IDs_of_running_threads = { thread.ident for thread in threading.enumerate() } - { threading.get_ident() } # Other running threads (finished threads are no longer enumerated).
+        for key in [ key for key in opened_archives if key[0] == os.getpid() and key[1] not in IDs_of_running_threads ]:
+            opened_archives.pop(key).close()
+        for key in [ key for key in extracted_tar_archives if key[0] == os.getpid() ]:
+            extracted_tar_archives[key]["Threads"] &= IDs_of_running_threads
+            if len(extracted_tar_archives[key]["Threads"]) == 0:
+                path_of_temporary_folder = extracted_tar_archives.pop(key)["Folder"]
+                if path_of_temporary_folder is not None:
+                    shutil.rmtree(path_of_temporary_folder, ignore_errors = True)
+
+
+def get_extracted_tar_archive(path_of_archive, file_extension):
+    """
+    Write the files of a .tar.gz/.tgz archive with the given file extension (i.e. the files that are listed as input files, see function "list_files_in_archive" below) to a temporary folder in directory "files_from_archives",
+    in the order of the archive (i.e. the archive is unpacked only once), if not done yet. Other archives can be read by other threads in the meantime.
+
+    Parameters
+    ----------
+    path_of_archive : str
+        Path of a .tar.gz/.tgz archive.
+    file_extension  : str
+        File extension of files to extract (e.g. ".gbk").
+
+    Returns
+    -------
+    str
+        Path of temporary folder with the extracted files of archive (with their folders in archive).
+    """
+    with lock_of_opened_archives:
+        extraction = extracted_tar_archives.setdefault((os.getpid(), path_of_archive, file_extension), { "Lock" : threading.Lock(), "Folder" : None, "Threads" : set() })
+        extraction["Threads"].add(threading.get_ident()) # Note: the extracted files are only removed when no running thread has read them (see function "close_all_archives" above).
+
+    with extraction["Lock"]: # Note: only the extraction of this archive is waited for.
+        if extraction["Folder"] is None:
+            path_of_temporary_folder = os.path.normpath(tempfile.mkdtemp(dir = create.create_directory_if_not_exists(names_and_paths.path_of_directory_of_files_from_archives)))
+            with tarfile.open(path_of_archive, "r|gz") as tar_archive: # Note: "r|gz" reads the archive as a stream, i.e. strictly in the order of the archive.
+                for member in tar_archive:
+                    path_of_extracted_file = os.path.normpath(os.path.join(path_of_temporary_folder, member.name))
+                    if not member.isfile() or not is_file_to_list(member.name, [file_extension]) or not path_of_extracted_file.startswith(path_of_temporary_folder + "/"):
+                        continue # Only files to list, and never outside of the temporary folder (e.g. names with "../").
+                    create.create_directory_if_not_exists(os.path.dirname(path_of_extracted_file))
+                    with tar_archive.extractfile(member) as file_object, open(path_of_extracted_file, "wb") as extracted_file_object:
+                        shutil.copyfileobj(file_object, extracted_file_object)
+            extraction["Folder"] = path_of_temporary_folder
+        return extraction["Folder"]
+# # -----------Helper functions-----------------------
+
+
+# # -----------List files in an archive-----------------------
+def list_files_in_archive(path_of_archive, file_extensions):
+    """
+    List all files in an archive with one of the given file extensions (without incompatible files, see module "names_and_paths.py").
+
+    Parameters
+    ----------
+    path_of_archive : str
+        Path of an archive (.zip, .tar.gz/.tgz or .gz).
+    file_extensions : list of str
+        File extension(s) of files to list (e.g. [".fasta"]).
+
+    Returns
+    -------
+    paths_in_archive : list of str
+        Paths in archive of all found files (in the order of the archive). Empty if the archive cannot be read.
+    """
+    kind_of_archive = type_of_archive(path_of_archive)
+    try:
+        if kind_of_archive == "gz":
+            names_of_files = [ os.path.basename(path_of_archive).removesuffix(".gz") ] # A .gz file contains exactly one file.
+        elif kind_of_archive == "zip":
+            names_of_files = [ info.filename for info in get_opened_archive(path_of_archive).infolist() if not info.is_dir() ]
+        else:
+            names_of_files = [ member.name for member in get_opened_archive(path_of_archive).getmembers() if member.isfile() ]
+    except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError):
+        return [] # Skip archive if it somehow cannot be read.
+
+    return [ path_of_archive + separator_of_archive_and_file + name_of_file for name_of_file in names_of_files if is_file_to_list(name_of_file, file_extensions) ]
+# # -----------List files in an archive-----------------------
+
+
+# # -----------Open, stat and copy a file (in an archive or not)-----------------------
+@contextlib.contextmanager
+def open_file(path_of_file, mode="r"):
+    """
+    Open a file for reading, like "open()", also if the file is in an archive (it is then read directly from the archive, without writing it to disk).
+
+    Parameters
+    ----------
+    path_of_file    : str
+        Path of a file or path in archive.
+    mode            : str
+        "r" (text) or "rb" (bytes).
+
+    Returns
+    -------
+    file_object
+        Opened file (to be used in a "with" statement).
+    """
+    if not is_path_in_archive(path_of_file):
+        with open(path_of_file, mode) as file_object:
+            yield file_object
+        return
+
+    path_of_archive, name_of_file = split_path_in_archive(path_of_file)
+    kind_of_archive               = type_of_archive(path_of_archive)
+    if kind_of_archive == "gz":
+        binary_file_object = gzip.open(path_of_archive, "rb")
+    elif kind_of_archive == "zip":
+        binary_file_object = get_opened_archive(path_of_archive).open(name_of_file, "r")
+    else:
+        binary_file_object = open(os.path.join(get_extracted_tar_archive(path_of_archive, os.path.splitext(name_of_file)[1]), name_of_file), "rb") # Note: "extractfile" of an opened .tar.gz archive would unpack the archive again from its beginning for each file read before the last one.
+
+    with binary_file_object:
+        if mode == "rb":
+            yield binary_file_object
+        else:
+            yield io.TextIOWrapper(binary_file_object, newline = None) # Note: like "open()" in text mode, line endings are converted to "\n".
+
+
+def stat_of_file(path_of_file):
+    """
+    Get size and time of last modification of a file (for a file in an archive: size of the file and time of last modification of the archive).
+
+    Parameters
+    ----------
+    path_of_file : str
+        Path of a file or path in archive.
+
+    Returns
+    -------
+    size_of_file                    : int
+        Size of file (in bytes).
+    time_of_last_modification_in_ns : int
+        Time of last modification (in ns).
+    """
+    if not is_path_in_archive(path_of_file):
+        stat_result = os.stat(path_of_file)
+        return stat_result.st_size, stat_result.st_mtime_ns
+
+    path_of_archive, name_of_file = split_path_in_archive(path_of_file)
+    stat_result                   = os.stat(path_of_archive)
+    kind_of_archive               = type_of_archive(path_of_archive)
+    if kind_of_archive == "zip":
+        return get_opened_archive(path_of_archive).getinfo(name_of_file).file_size, stat_result.st_mtime_ns
+    elif kind_of_archive == "tar":
+        return get_opened_archive(path_of_archive).getmember(name_of_file).size, stat_result.st_mtime_ns
+    return stat_result.st_size, stat_result.st_mtime_ns # For a .gz file, the size of the archive (reading the size of the unpacked file would need to unpack the whole file).
+
+
+def copy_file(path_of_file, path_of_destination_file):
+    """
+    Copy a file (also if the file is in an archive) to a given path.
+
+    Parameters
+    ----------
+    path_of_file                : str
+        Path of a file or path in archive.
+    path_of_destination_file    : str
+        Path of copy.
+
+    Returns
+    -------
+    None.
+
+    Output files
+    ------------
+    A copy of the file.
+    """
+    if not is_path_in_archive(path_of_file):
+        shutil.copyfile(path_of_file, path_of_destination_file)
+        return
+    with open_file(path_of_file, "rb") as file_object, open(path_of_destination_file, "wb") as destination_file_object:
+        shutil.copyfileobj(file_object, destination_file_object)
+# # -----------Open, stat and copy a file (in an archive or not)-----------------------
+
+
+# # -----------Write a file in an archive to disk (only if an external program needs a real file)-----------------------
+def materialise_file(path_of_file):
+    """
+    Write a file in an archive to its own temporary folder in directory "files_from_archives" (with its name), e.g. for antiSMASH. A path of a real file is returned unchanged.
+
+    Parameters
+    ----------
+    path_of_file : str
+        Path of a file or path in archive.
+
+    Returns
+    -------
+    str
+        Path of real file.
+
+    Output files
+    ------------
+    A copy of the file in directory "files_from_archives" (should be removed with function "remove_materialised_file" below after use).
+    """
+    if not is_path_in_archive(path_of_file):
+        return path_of_file
+    path_of_temporary_folder = tempfile.mkdtemp(dir = create.create_directory_if_not_exists(names_and_paths.path_of_directory_of_files_from_archives)) # Note: a folder of its own for each file, so that files with the same name in different archives never collide.
+    path_of_real_file        = os.path.join(path_of_temporary_folder, name_of_file(path_of_file))
+    copy_file(path_of_file, path_of_real_file)
+    return path_of_real_file
+
+
+def remove_materialised_file(path_of_file, path_of_real_file):
+    if path_of_real_file != path_of_file:
+        shutil.rmtree(os.path.dirname(path_of_real_file), ignore_errors = True)
+# # -----------Write a file in an archive to disk (only if an external program needs a real file)-----------------------
@@ -0,0 +1,208 @@
+''' This module keeps a persistent cache of the intermediate results of BiG-SCAPE for each BGC (protein sequences, domain predictions by hmmscan and the lists of domains, i.e. the files in the subdirectories "fasta", "domtable", "pfs" and "pfd"
+    of the subdirectory "cache" in a BiGSCAPE-output directory), so that the domains of each BGC are only predicted once. Before BiGSCAPE is run, the intermediate results of all query BGCs that did not change since are put into
+    the new BiGSCAPE-output directory, and BiGSCAPE skips these BGCs when predicting domains (i.e. only new or changed BGCs are analyzed by hmmscan). After a successful run, the intermediate results of all BGCs are kept in the directory "cache_of_BiGSCAPE".
+    Note: BiGSCAPE cannot reuse distances between BGCs of an earlier run, so the distances (and the alignments of domains) are still calculated for all pairs of BGCs. '''
+
+
+import os
+import json
+import hashlib
+
+import create
+import names_and_paths
+import content_fingerprint
+import link_or_copy
+import archive_input
+
+
+subdirectories_of_intermediate_results  = { "fasta" : ".fasta", "domtable" : ".domtable", "pfs" : ".pfs", "pfd" : ".pfd" } # Key = subdirectory of "cache" in BiGSCAPE-output directory, value = file extension of intermediate results of a BGC (name of file = name of BGC + file extension).
+fingerprint_of_reference_BGCs           = "not a query BGC" # Fingerprint of BGCs that are not given as query BGCs (e.g. BGCs from MIBiG).
+version_of_cache_of_bigscape            = "1"
+
+
+# # -----------Helper functions-----------------------
+def path_of_index_of_cache():
+    return names_and_paths.path_of_directory_of_cache_of_bigscape + names_and_paths.name_of_index_of_cache_of_bigscape
+
+
+def make_key_of_bigscape():
+    hash_object = hashlib.sha256(version_of_cache_of_bigscape.encode())
+    path_of_bigscape_runfile = names_and_paths.path_of_directory_of_thirdparty_programs + "run_bigscape"
+    if os.path.isfile(path_of_bigscape_runfile):
+        with open(path_of_bigscape_runfile, "rb") as file_object:
+            hash_object.update(file_object.read()) # The run file of BiGSCAPE contains the version of BiGSCAPE, so that intermediate results of another version of BiGSCAPE will not be reused.
+    return hash_object.hexdigest()
+
+
+def load_index_of_cache():
+    index_of_cache = { "Key of BiG-SCAPE" : make_key_of_bigscape(), "Entries" : {} } # Entries: key = name of BGC, value = fingerprint of Genbank file of BGC.
+    if os.path.isfile(path_of_index_of_cache()):
+        try:
+            with open(path_of_index_of_cache(), "r") as file_object:
+                saved_index = json.load(file_object)
+            if saved_index.get("Key of BiG-SCAPE") == index_of_cache["Key of BiG-SCAPE"]:
+                index_of_cache["Entries"] = saved_index.get("Entries", {})
+        except (OSError, ValueError):
+            pass # Start with an empty cache if the index cannot be read.
+    return index_of_cache
+
+
+def save_index_of_cache(index_of_cache):
+    path_of_temporary_index = path_of_index_of_cache() + ".tmp"
+    with open(path_of_temporary_index, "w") as file_object:
+        json.dump(index_of_cache, file_object)
+    os.replace(path_of_temporary_index, path_of_index_of_cache())
+# # -----------Helper functions-----------------------
+
+
+# # -----------Make fingerprints of query BGCs-----------------------
+def make_fingerprints_of_query_BGCs(inputpaths):
+    """
+    Make the fingerprints of the Genbank files of all query BGCs (see module "content_fingerprint.py"), with the name of each BGC in BiGSCAPE (name of file without file extension).
+
+    Parameters
+    ----------
+    inputpaths : list of str
+        Paths of Genbank (.gbk) files of query BGCs.
+
+    Returns
+    -------
+    fingerprints_of_BGCs : dict of {str : str}
+        Key = name of BGC, value = fingerprint of its Genbank file.
+    """
+    index_of_fingerprints = content_fingerprint.load_index_of_fingerprints()
+    fingerprints_of_BGCs  = {}
+    for path_of_inputfile in inputpaths:
+        name_of_inputfile = archive_input.name_of_file(path_of_inputfile) # Note: for a file in an archive, the name of the file in archive (never with "::").
+        if name_of_inputfile.endswith(".gbk"):
+            fingerprints_of_BGCs[name_of_inputfile.removesuffix(".gbk")] = content_fingerprint.get_fingerprint_of_file(index_of_fingerprints, path_of_inputfile)
+    content_fingerprint.save_index_of_fingerprints(index_of_fingerprints)
+    return fingerprints_of_BGCs
+# # -----------Make fingerprints of query BGCs-----------------------
+
+
+# # -----------Restore intermediate results of BGCs from cache into a BiGSCAPE-output directory-----------------------
+def restore_intermediate_results_from_cache(fingerprints_of_BGCs, path_of_output_directory_from_bigscape):
+    """
+    Put the intermediate results of all BGCs in cache that did not change since (same fingerprint) into a new BiGSCAPE-output directory, so that BiGSCAPE does not analyze them again.
+
+    Parameters
+    ----------
+    fingerprints_of_BGCs                    : dict of {str : str}
+        Fingerprints of query BGCs (see function "make_fingerprints_of_query_BGCs" above).
+    path_of_output_directory_from_bigscape  : str
+        Path of BiGSCAPE-output directory of the next run of BiGSCAPE.
+
+    Returns
+    -------
+    int
+        Number of BGCs with intermediate results from cache.
+
+    Output folder
+    -------------
+    Subdirectory "cache" in BiGSCAPE-output directory, that contains the intermediate results of BGCs from cache.
+    """
+    entries_of_cache = load_index_of_cache()["Entries"]
+    number_of_BGCs   = 0
+
+    for name_of_BGC, fingerprint in entries_of_cache.items():
+        if fingerprints_of_BGCs.get(name_of_BGC, fingerprint_of_reference_BGCs) != fingerprint:
+            continue # BGC has changed (or a query BGC has the name of a reference BGC): its intermediate results are not reused.
+        for subdirectory, file_extension in subdirectories_of_intermediate_results.items():
+            path_of_cached_file = os.path.join(names_and_paths.path_of_directory_of_cache_of_bigscape, subdirectory, name_of_BGC + file_extension)
+            if os.path.isfile(path_of_cached_file):
+                path_of_subdirectory = create.create_directory_if_not_exists(os.path.join(path_of_output_directory_from_bigscape, "cache", subdirectory))
+                link_or_copy.link_or_copy_file(path_of_cached_file, os.path.join(path_of_subdirectory, name_of_BGC + file_extension), "reflink") # Note: not a hard link, so that BiGSCAPE can never change a file in cache.
+        number_of_BGCs += 1
+
+    return number_of_BGCs
+# # -----------Restore intermediate results of BGCs from cache into a BiGSCAPE-output directory-----------------------
+
+
+# # -----------Store intermediate results of BGCs of a BiGSCAPE-output directory in cache-----------------------
+def store_intermediate_results_in_cache(fingerprints_of_BGCs, path_of_output_directory_from_bigscape):
+    """
+    Keep the intermediate results of all BGCs of a successful run of BiGSCAPE in cache (as hard links, if possible).
+
+    Parameters
+    ----------
+    fingerprints_of_BGCs                    : dict of {str : str}
+        Fingerprints of query BGCs (see function "make_fingerprints_of_query_BGCs" above).
+    path_of_output_directory_from_bigscape  : str
+        Path of BiGSCAPE-output directory of the run.
+
+    Returns
+    -------
+    None.
+
+    Output files
+    ------------
+    Intermediate results of all BGCs and an index (.json) in directory "cache_of_BiGSCAPE".
+    """
+    create.create_directory_if_not_exists(names_and_paths.path_of_directory_of_cache_of_bigscape)
+    index_of_cache = load_index_of_cache()
+
+    # # -----------Find intermediate results of all BGCs in BiGSCAPE-output directory-----------------------
+    names_of_BGCs = set()
+    for subdirectory, file_extension in subdirectories_of_intermediate_results.items():
+        path_of_subdirectory = os.path.join(path_of_output_directory_from_bigscape, "cache", subdirectory)
+        if os.path.isdir(path_of_subdirectory):
+            names_of_BGCs.update( name_of_file.removesuffix(file_extension) for name_of_file in os.listdir(path_of_subdirectory) if name_of_file.endswith(file_extension) )
+    # # -----------Find intermediate results of all BGCs in BiGSCAPE-output directory-----------------------
+
+    for name_of_BGC in names_of_BGCs:
+        index_of_cache["Entries"].pop(name_of_BGC, None)
+    save_index_of_cache(index_of_cache) # Note: entries are removed before their files are replaced, so that an interrupted update never leaves an entry with files of another BGC.
+
+    for name_of_BGC in names_of_BGCs:
+        for subdirectory, file_extension in subdirectories_of_intermediate_results.items():
+            path_of_file        = os.path.join(path_of_output_directory_from_bigscape, "cache", subdirectory, name_of_BGC + file_extension)
+            path_of_cached_file = os.path.join(names_and_paths.path_of_directory_of_cache_of_bigscape, subdirectory, name_of_BGC + file_extension)
+            if os.path.isfile(path_of_file):
+                create.create_directory_if_not_exists(os.path.dirname(path_of_cached_file))
+                link_or_copy.link_or_copy_file(path_of_file, path_of_cached_file, "hardlink")
+            elif os.path.isfile(path_of_cached_file):
+                os.remove(path_of_cached_file) # Intermediate result of an earlier version of BGC.
+        index_of_cache["Entries"][name_of_BGC] = fingerprints_of_BGCs.get(name_of_BGC, fingerprint_of_reference_BGCs)
+
+    save_index_of_cache(index_of_cache)
+# # -----------Store intermediate results of BGCs of a BiGSCAPE-output directory in cache-----------------------
+
+
+# # -----------Copy intermediate results of BGCs from an earlier run of BiGSCAPE-----------------------
+def copy_intermediate_results_of_earlier_run(path_of_output_directory_of_earlier_run, path_of_output_directory_from_bigscape, names_of_BGCs=None):
+    """
+    Put the intermediate results of BGCs of an earlier run of BiGSCAPE with the same query BGCs (e.g. with other settings, see module "bigscape_matrix.py") into a new BiGSCAPE-output directory, so that BiGSCAPE does not analyze these BGCs again.
+
+    Parameters
+    ----------
+    path_of_output_directory_of_earlier_run : str
+        Path of BiGSCAPE-output directory of earlier run.
+    path_of_output_directory_from_bigscape  : str
+        Path of BiGSCAPE-output directory of the next run of BiGSCAPE.
+    names_of_BGCs                           : set of str or None
+        Names of BGCs whose intermediate results are reused (e.g. only query BGCs, if the next run does not analyze BGCs from MIBiG). None: all BGCs of earlier run.
+
+    Returns
+    -------
+    int
+        Number of BGCs with intermediate results from earlier run.
+
+    Output folder
+    -------------
+    Subdirectory "cache" in BiGSCAPE-output directory, that contains the intermediate results of BGCs from earlier run.
+    """
+    names_of_BGCs_with_results = set()
+    for subdirectory, file_extension in subdirectories_of_intermediate_results.items():
+        path_of_subdirectory = os.path.join(path_of_output_directory_of_earlier_run, "cache", subdirectory)
+        if not os.path.isdir(path_of_subdirectory):
+            continue
+        for name_of_file in os.listdir(path_of_subdirectory):
+            name_of_BGC = name_of_file.removesuffix(file_extension)
+            if not name_of_file.endswith(file_extension) or (names_of_BGCs is not None and name_of_BGC not in names_of_BGCs):
+                continue
+            path_of_new_subdirectory = create.create_directory_if_not_exists(os.path.join(path_of_output_directory_from_bigscape, "cache", subdirectory))
+            link_or_copy.link_or_copy_file(os.path.join(path_of_subdirectory, name_of_file), os.path.join(path_of_new_subdirectory, name_of_file), "reflink") # Note: not a hard link, so that BiGSCAPE can never change a file of the earlier run.
+            names_of_BGCs_with_results.add(name_of_BGC)
+    return len(names_of_BGCs_with_results)
+# # -----------Copy intermediate results of BGCs from an earlier run of BiGSCAPE-----------------------
@@ -0,0 +1,114 @@
+''' This module runs task 3 for a "matrix" of settings, i.e. for every combination of values for the parameter "cutoffs" and settings for BGCs from MIBiG (with/without), and writes the gene cluster families (GCFs) of all BGCs for each combination to one table
+    in directory "statistics", which helps to choose the settings of task 3. The input files of BiG-SCAPE are put into its input directory only once for all runs, BiG-SCAPE runs only once per setting for BGCs from MIBiG (with all values for "cutoffs" at once,
+    i.e. the distances between BGCs are calculated once and the BGCs are grouped into families for each value), and the domains of the query BGCs are only predicted in the first run (see module "bigscape_cache.py"). '''
+
+
+import os
+import re
+import itertools
+
+import create
+
+
+regex_for_clustering_files  = re.compile(r"_clustering_c(\d+(?:\.\d+)?)\.tsv$") # Name of a file of BiGSCAPE with the families of the BGCs of one class for one value of "cutoffs", e.g. "NRPS_clustering_c0.30.tsv".
+
+
+# # -----------Make matrix of settings-----------------------
+def name_of_MIBiG_setting(analyze_with_BGCs_from_MIBiG):
+    return "with_MIBiG" if analyze_with_BGCs_from_MIBiG == True else "without_MIBiG" # Also name of subdirectory in BiGSCAPE-output directory of the run with this setting.
+
+
+def make_matrix_of_settings(cutoffs, MIBiG_settings):
+    """
+    Make all combinations of the given values for the parameter "cutoffs" and settings for BGCs from MIBiG.
+
+    Parameters
+    ----------
+    cutoffs         : str
+        One or many values for parameter "cutoffs", separated by whitespace.
+    MIBiG_settings  : list of bool
+        Settings for BGCs from MIBiG (True: analyze query BGCs with BGCs from MIBiG).
+
+    Returns
+    -------
+    matrix_of_settings : list of tuple of (bool, float)
+        All combinations of setting for BGCs from MIBiG and value for "cutoffs" (without duplicates, in the given order).
+    """
+    values_of_cutoffs = list(dict.fromkeys( float(value) for value in str(cutoffs).split() ))
+    return list(itertools.product(dict.fromkeys(MIBiG_settings), values_of_cutoffs))
+# # -----------Make matrix of settings-----------------------
+
+
+# # -----------Read families of BGCs from BiGSCAPE-output directory-----------------------
+def read_GCF_assignments(path_of_output_directory_from_bigscape):
+    """
+    Read the families (GCFs) of all BGCs for each value of "cutoffs" from the clustering files (.tsv) of a BiGSCAPE-output directory (only of the latest analysis in its directory "network_files").
+
+    Parameters
+    ----------
+    path_of_output_directory_from_bigscape : str
+        Path of BiGSCAPE-output directory.
+
+    Returns
+    -------
+    GCF_assignments : dict of {tuple of (str, str) : dict of {float : str}}
+        Key = name of BGC and class of BiGSCAPE (e.g. "NRPS" or "mix"), value = number of family of BGC for each value of "cutoffs".
+    """
+    GCF_assignments                 = {}
+    path_of_directory_of_networks   = os.path.join(path_of_output_directory_from_bigscape, "network_files")
+    if not os.path.isdir(path_of_directory_of_networks) or len(os.listdir(path_of_directory_of_networks)) == 0:
+        return GCF_assignments
+
+    path_of_latest_analysis = os.path.join(path_of_directory_of_networks, sorted(os.listdir(path_of_directory_of_networks))[-1]) # Note: names of analyses start with date and time.
+    for dir, subdirs, files in os.walk(path_of_latest_analysis):
+        for name_of_file in files:
+            match = regex_for_clustering_files.search(name_of_file)
+            if match is None:
+                continue
+            class_of_BGCs = os.path.basename(dir)
+            with open(os.path.join(dir, name_of_file), "r") as file_object:
+                for line in file_object:
+                    if line.startswith("#") or line.strip() == "":
+                        continue # Header (columns "#BGC Name" and "Family Number").
+                    name_of_BGC, number_of_family = line.rstrip("\n").split("\t")[:2]
+                    GCF_assignments.setdefault((name_of_BGC, class_of_BGCs), {})[float(match.group(1))] = number_of_family
+
+    return GCF_assignments
+# # -----------Read families of BGCs from BiGSCAPE-output directory-----------------------
+
+
+# # -----------Write table of families of BGCs for all settings-----------------------
+def write_table_of_GCF_assignments(GCF_assignments_of_MIBiG_settings, matrix_of_settings, names_of_query_BGCs, path_of_table):
+    """
+    Write a table (tab-separated) with one row per BGC and class of BiGSCAPE, and the number of its family (GCF) for each combination of settings.
+
+    Parameters
+    ----------
+    GCF_assignments_of_MIBiG_settings   : dict of {bool : dict}
+        Key = setting for BGCs from MIBiG, value = families of BGCs of the run with this setting (see function "read_GCF_assignments" above).
+    matrix_of_settings                  : list of tuple of (bool, float)
+        All combinations of settings (see function "make_matrix_of_settings" above).
+    names_of_query_BGCs                 : set of str
+        Names of query BGCs (other BGCs are from MIBiG).
+    path_of_table                       : str
+        Path of table.
+
+    Returns
+    -------
+    None.
+
+    Output files
+    ------------
+    A table (.tsv) with the columns "BGC", "Class of BiG-SCAPE", "Query BGC" and one column per combination of settings (e.g. "GCF with_MIBiG c0.30"; empty if BGC was not analyzed with these settings).
+    """
+    create.create_directory_if_not_exists(os.path.dirname(path_of_table))
+    keys_of_BGCs = sorted(set( key_of_BGC for GCF_assignments in GCF_assignments_of_MIBiG_settings.values() for key_of_BGC in GCF_assignments ))
+
+    with open(path_of_table, "w") as file_object:
+        file_object.write("\t".join([ "BGC", "Class of BiG-SCAPE", "Query BGC" ] + [ "GCF " + name_of_MIBiG_setting(MIBiG_setting) + " c" + format(cutoff, ".2f") for MIBiG_setting, cutoff in matrix_of_settings ]) + "\n")
+        for name_of_BGC, class_of_BGCs in keys_of_BGCs:
+            row = [ name_of_BGC, class_of_BGCs, "yes" if name_of_BGC in names_of_query_BGCs else "no" ]
+            for MIBiG_setting, cutoff in matrix_of_settings:
+                row.append(GCF_assignments_of_MIBiG_settings.get(MIBiG_setting, {}).get((name_of_BGC, class_of_BGCs), {}).get(cutoff, ""))
+            file_object.write("\t".join(row) + "\n")
+# # -----------Write table of families of BGCs for all settings-----------------------
@@ -4,12 +4,23 @@
 
 import os
 
+import names_and_paths
+
 
 def change_permit_of_all_folders_and_files_in_common_dir(): # Note: this function does not have input or output.
-    path_of_common_dir = os.path.dirname(os.path.realpath(__file__))
+    path_of_common_dir = names_and_paths.common_path # Note: directory of run, if given by command line or configuration file (see module "command_line.py").
 
     for dir, subdirs, files in os.walk(path_of_common_dir):
         for subdir in subdirs:
-            os.system("chmod 777 " + os.path.join(dir, subdir)) # "777" means to grant all users and groups rights to read, write and execute.
+            change_permit_of_path(os.path.join(dir, subdir))
         for file in files:
-            os.system("chmod 777 " + os.path.join(dir, file))
+            change_permit_of_path(os.path.join(dir, file))
+
+
+def change_permit_of_path(path):
+    if os.path.islink(path):
+        return # Note: a symbolic link has no permissions of its own (and os.chmod would change the target, e.g. an input file outside of the common directory).
+    try:
+        os.chmod(path, 0o777) # "777" means to grant all users and groups rights to read, write and execute.
+    except OSError:
+        pass # E.g. file of another user (files created by docker are changed if the pipeline runs as root).
@@ -0,0 +1,181 @@
+''' This module lets the pipeline run without any input from user (e.g. in a batch system or as many pipelines at the same time on one machine): the tasks to execute, the values for all parameters, the options in module "side_options.py"
+    and the directories of a run ("workspace", see module "names_and_paths.py") are given by arguments in the command line and/or by a configuration file (.json). Arguments in the command line overwrite values in the configuration file, and these overwrite the predefined values
+    in modules "input_parameters.py" and "side_options.py".
+    Example: python start_and_command.py --tasks 123 --run-dir /data/runs/sample_1 --input-dir /data/samples/sample_1 --min-length 15000 --cutoffs "0.3 0.5" --option verbose=false
+    Example: python start_and_command.py --tasks 123 --workspaces-root /data/runs --run-name sample_1 --input-dir /data/samples/sample_1
+    Example of a configuration file:
+    { "tasks" : "123", "run_directory" : "/data/runs/sample_1", "input_directory_for_antismash" : "/data/samples/sample_1",
+      "selection_parameters" : { "min_length" : 15000 }, "cutoffs" : "0.3 0.5", "side_options" : { "verbose" : false }, "input_parameters" : { "number_of_parallel_antismash_jobs" : 8 } } '''
+
+
+import os
+import json
+import argparse
+from   datetime import datetime
+
+import side_options
+import input_parameters
+import names_and_paths
+import link_or_copy
+
+
+names_of_selection_parameters = [ "min_num_of_core_genes", "min_length", "min_distance", "min_num_of_additional_genes_for_main_selection", "min_num_of_additional_genes_for_2nd_chance_selection" ] # Same names as in module "input_parameters.py".
+
+
+# # -----------Parser of arguments in command line-----------------------
+def make_parser_of_arguments():
+    parser = argparse.ArgumentParser(prog = "start_and_command.py", description = "Run the pipeline without any input from user (all values that are not given are taken from the configuration file, or else from modules \"input_parameters.py\" and \"side_options.py\").")
+    parser.add_argument("--config",     metavar = "PATH",           help = "path of configuration file (.json)")
+    parser.add_argument("--tasks",      metavar = "TASKS",          help = "task(s) to execute, e.g. 1, 2, 3, 12, 23, 13, 123 or 4 (all tasks)")
+    parser.add_argument("--run-dir",    metavar = "PATH",           help = "directory of run, which will contain all input and output directories of the pipeline (default: directory of pipeline)")
+    parser.add_argument("--workspaces-root", metavar = "PATH",      help = "directory that contains the directories of all runs: the directory of this run is then \"<PATH>/<NAME OF RUN>\" (only used if \"--run-dir\" is not given)")
+    parser.add_argument("--run-name",   metavar = "NAME",           help = "name of run in directory given by \"--workspaces-root\" (default: a new name made of date, time and process ID, e.g. \"run_20240101_120000_1234\")")
+    parser.add_argument("--input-dir",  metavar = "PATH",           help = "input directory for antiSMASH (default: directory \"" + names_and_paths.name_of_input_directory_for_antismash + "\" in directory of run)")
+    for name_of_parameter in names_of_selection_parameters:
+        parser.add_argument("--" + name_of_parameter.replace("_", "-"), metavar = "N", type = int, help = "selection parameter \"" + name_of_parameter + "\" of task 2")
+    parser.add_argument("--cutoffs",    metavar = "VALUES",         help = "one or many values in range (0.0, 1.0] for task 3, separated by whitespace, e.g. \"0.3 0.5\"")
+    parser.add_argument("--option",     metavar = "NAME=VALUE",     action = "append", default = [], help = "set an option of module \"side_options.py\" to true or false, e.g. verbose=false (can be given many times)")
+    parser.add_argument("--parameter",  metavar = "NAME=VALUE",     action = "append", default = [], help = "set a predefined parameter of module \"input_parameters.py\", e.g. number_of_parallel_antismash_jobs=8 (can be given many times)")
+    return parser
+# # -----------Parser of arguments in command line-----------------------
+
+
+# # -----------Check values of settings-----------------------
+def convert_to_boolean(value, name_of_setting):
+    if isinstance(value, bool):
+        return value
+    if str(value).lower() in [ "true", "1", "yes" ]:
+        return True
+    if str(value).lower() in [ "false", "0", "no" ]:
+        return False
+    raise ValueError("Value of option \"" + name_of_setting + "\" should be true or false, not \"" + str(value) + "\"!")
+
+
+def check_tasks(tasks):
+    list_of_tasks_to_execute = list(str(tasks))
+    if len(list_of_tasks_to_execute) == 0 or any(task not in [ "1", "2", "3", "4" ] for task in list_of_tasks_to_execute):
+        raise ValueError("Tasks should be given as numbers 1, 2, 3 or 4 (e.g. 123), not \"" + str(tasks) + "\"!")
+    return list_of_tasks_to_execute
+
+
+def check_cutoffs(cutoffs):
+    cutoffs = str(cutoffs).strip()
+    try:
+        values = [ float(value) for value in cutoffs.split() ]
+    except ValueError:
+        values = []
+    if len(values) == 0 or any(value <= 0.0 or value > 1.0 for value in values):
+        raise ValueError("Cutoffs should be real number(s) in range (0.0, 1.0], separated by whitespace, not \"" + cutoffs + "\"!")
+    return cutoffs
+# # -----------Check values of settings-----------------------
+
+
+# # -----------Get settings of a run from command line and configuration file-----------------------
+def get_settings_of_run(arguments):
+    """
+    Get the settings of a run from arguments in the command line and a configuration file (if given), set the options (module "side_options.py"), the predefined parameters (module "input_parameters.py") and the directories of the run (module "names_and_paths.py").
+
+    Parameters
+    ----------
+    arguments : list of str
+        Arguments in command line (without name of program, i.e. "sys.argv[1:]").
+
+    Returns
+    -------
+    list_of_tasks_to_execute            : list of str
+        Task(s) to execute, e.g. ["1", "2", "3"].
+    param_for_preliminary_selection     : dict of {str : str}
+        Parameter for preliminary selection.
+    param_for_main_selection            : dict of {str : str}
+        Parameters for main selection.
+    param_for_2nd_chance_selection      : dict of {str : str}
+        Parameter for second-chance selection.
+    cutoffs                             : str
+        Value(s) for parameter "cutoffs" of task 3.
+
+    Note: the program ends with an error message (exit code 2) if an argument or a value in the configuration file is invalid.
+    """
+    parser              = make_parser_of_arguments()
+    arguments_of_run    = parser.parse_args(arguments)
+
+    try:
+        # # -----------Read configuration file (if given)-----------------------
+        configuration = {}
+        if arguments_of_run.config is not None:
+            with open(arguments_of_run.config, "r") as file_object:
+                configuration = json.load(file_object)
+        # # -----------Read configuration file (if given)-----------------------
+
+        # # -----------Options (module "side_options.py")-----------------------
+        options = dict(configuration.get("side_options", {}))
+        for option in arguments_of_run.option:
+            name_of_option, _, value = option.partition("=")
+            options[name_of_option.strip()] = value.strip()
+        for name_of_option, value in options.items():
+            if not isinstance(getattr(side_options, name_of_option, None), bool):
+                raise ValueError("There is no option \"" + name_of_option + "\" in module \"side_options.py\"!")
+            setattr(side_options, name_of_option, convert_to_boolean(value, name_of_option))
+        side_options.prompt_user_to_input_tasks_to_execute      = False # No input from user in a run with arguments in command line.
+        side_options.prompt_user_to_input_values_for_parameters = False
+        # # -----------Options (module "side_options.py")-----------------------
+
+        # # -----------Predefined parameters (module "input_parameters.py")-----------------------
+        parameters = dict(configuration.get("input_parameters", {}))
+        for parameter in arguments_of_run.parameter:
+            name_of_parameter, _, value = parameter.partition("=")
+            try:
+                parameters[name_of_parameter.strip()] = json.loads(value.strip()) # E.g. "8", "0.5" or "[1, 2, 3]".
+            except ValueError:
+                parameters[name_of_parameter.strip()] = value.strip() # E.g. "hardlink".
+        for name_of_parameter, value in parameters.items():
+            if name_of_parameter in names_of_selection_parameters + [ "cutoffs" ] or not isinstance(getattr(input_parameters, name_of_parameter, None), (int, float, list, str)):
+                raise ValueError("There is no predefined parameter \"" + name_of_parameter + "\" in module \"input_parameters.py\" (selection parameters and cutoffs have their own arguments)!")
+            type_of_parameter = type(getattr(input_parameters, name_of_parameter))
+            if type(value) is int and type_of_parameter is float:
+                value = float(value) # E.g. "1" for a parameter with value "0.5".
+            if type(value) is not type_of_parameter:
+                raise ValueError("Value of predefined parameter \"" + name_of_parameter + "\" has the wrong type (should be " + type_of_parameter.__name__ + ")!")
+            if name_of_parameter == "mode_of_materialisation_of_files" and value not in link_or_copy.modes_of_materialisation:
+                raise ValueError("Mode of materialisation of files should be one of " + ", ".join(link_or_copy.modes_of_materialisation) + "!")
+            setattr(input_parameters, name_of_parameter, value)
+        # # -----------Predefined parameters (module "input_parameters.py")-----------------------
+
+        # # -----------Selection parameters of task 2 and cutoffs of task 3-----------------------
+        selection_parameters = { name_of_parameter : getattr(input_parameters, name_of_parameter) for name_of_parameter in names_of_selection_parameters }
+        selection_parameters.update(configuration.get("selection_parameters", {}))
+        for name_of_parameter in names_of_selection_parameters:
+            if getattr(arguments_of_run, name_of_parameter) is not None:
+                selection_parameters[name_of_parameter] = getattr(arguments_of_run, name_of_parameter)
+        for name_of_parameter, value in selection_parameters.items():
+            if name_of_parameter not in names_of_selection_parameters or not str(value).isnumeric():
+                raise ValueError("Selection parameter \"" + name_of_parameter + "\" should be one of " + ", ".join(names_of_selection_parameters) + " with a non negative integer value!")
+        if not int(selection_parameters["min_distance"])*2 <= int(selection_parameters["min_length"]):
+            raise ValueError("Minimum distance should be twice smaller than minimum length of cluster!")
+
+        param_for_preliminary_selection = { "Minimum number of core genes"                      : str(selection_parameters["min_num_of_core_genes"]) }
+        param_for_main_selection        = { "Minimum length (in bp)"                            : str(selection_parameters["min_length"]),
+                                            "Minimum distance (in bp)"                          : str(selection_parameters["min_distance"]),
+                                            "Minimum number of additional biosynthetic genes"   : str(selection_parameters["min_num_of_additional_genes_for_main_selection"]) }
+        param_for_2nd_chance_selection  = { "Minimum number of additional biosynthetic genes"   : str(selection_parameters["min_num_of_additional_genes_for_2nd_chance_selection"]) }
+
+        cutoffs = check_cutoffs(arguments_of_run.cutoffs if arguments_of_run.cutoffs is not None else configuration.get("cutoffs", input_parameters.cutoffs))
+        # # -----------Selection parameters of task 2 and cutoffs of task 3-----------------------
+
+        list_of_tasks_to_execute = check_tasks(arguments_of_run.tasks if arguments_of_run.tasks is not None else configuration.get("tasks", "4"))
+
+        # # -----------Directories of run (module "names_and_paths.py")-----------------------
+        path_of_run_directory                   = arguments_of_run.run_dir   if arguments_of_run.run_dir   is not None else configuration.get("run_directory")
+        path_of_root_of_workspaces              = arguments_of_run.workspaces_root if arguments_of_run.workspaces_root is not None else configuration.get("workspaces_root")
+        if path_of_run_directory is None and path_of_root_of_workspaces is not None:
+            name_of_run           = arguments_of_run.run_name if arguments_of_run.run_name is not None else configuration.get("run_name", "run_" + datetime.now().strftime("%Y%m%d_%H%M%S") + "_" + str(os.getpid())) # Note: a new name for each run, so that runs started at the same time never share a directory.
+            path_of_run_directory = os.path.join(path_of_root_of_workspaces, name_of_run)
+        path_of_input_directory_for_antismash   = arguments_of_run.input_dir if arguments_of_run.input_dir is not None else configuration.get("input_directory_for_antismash")
+        if path_of_run_directory is not None or path_of_input_directory_for_antismash is not None:
+            names_and_paths.set_paths_of_run(path_of_run_directory if path_of_run_directory is not None else names_and_paths.common_path, path_of_input_directory_for_antismash)
+        # # -----------Directories of run (module "names_and_paths.py")-----------------------
+
+    except (OSError, ValueError, TypeError, AttributeError) as error: # E.g. configuration file cannot be read, or is not a dictionary.
+        parser.error(str(error))
+
+    return list_of_tasks_to_execute, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, cutoffs
+# # -----------Get settings of a run from command line and configuration file-----------------------
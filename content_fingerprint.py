@@ -0,0 +1,197 @@
+''' This module makes "content fingerprints" of files, i.e. a hash of the content of a file without its volatile lines (e.g. date of analysis or version of the program that created the file), so that two files with the same fingerprint
+    have (almost) identical content (see module "deduplicate.py"). Each file is read only once, line by line (streaming), and its fingerprint is kept in an index (a file (.json) in directory "fingerprints_of_files"),
+    together with size and time of last modification of the file, so that later runs of the pipeline only read files that are new or have changed. For files with different fingerprints, a short hash of each line ("digest of lines", 4 bytes per line)
+    is also kept, so that two files that differ only in a few lines (i.e. near-duplicates, e.g. outputs of antiSMASH for the same input) are found without reading the files again. '''
+
+
+import os
+import re
+import json
+import hashlib
+
+import create
+import names_and_paths
+import archive_input
+
+
+regex_for_volatile_lines        = re.compile(rb"^\s*(Version|Run date|Date)\s*::") # Lines of the structured comment of antiSMASH (e.g. "Version :: 7.1.0", "Run date :: 2024-01-01 12:00:00") that differ between two runs of antiSMASH for the same input.
+regex_for_date_in_LOCUS_line    = re.compile(rb"\s*\d{2}-[A-Z]{3}-\d{4}\s*$")     # Date of analysis at the end of the first line ("LOCUS") of a Genbank file.
+version_of_fingerprints         = "2" # Change this value if the volatile lines above are changed, so that fingerprints made with other rules are not reused.
+name_of_directory_of_digests    = "digests_of_lines" # Subdirectory of directory "fingerprints_of_files" with the digests of lines of files (name of file = fingerprint + ".bin", so that files with the same content share one digest).
+size_of_hash_of_line            = 4     # Size (in bytes) of the hash of a line in a digest of lines.
+max_difference_of_number_of_lines_of_near_duplicates    = 20 # Two files are near-duplicates if their numbers of lines differ by at most this number...
+max_number_of_different_lines_of_near_duplicates        = 50 # ... and at most this number of their lines differ (lines are compared by position, as in the comparison of files without fingerprints, see module "deduplicate.py").
+
+
+# # -----------Make fingerprint of a file-----------------------
+def make_fingerprint_of_file(path_of_file):
+    """
+    Make the fingerprint of a file, i.e. a hash of all its lines except volatile lines (date of analysis in "LOCUS" line, "Version" and "Run date" in structured comment of antiSMASH), and the digest of its lines.
+
+    Parameters
+    ----------
+    path_of_file : str
+        Path of a file (e.g. a .fasta or a .gbk file).
+
+    Returns
+    -------
+    str
+        Fingerprint (hexadecimal string) of file.
+    int
+        Number of lines of file (without volatile lines).
+
+    Output files
+    ------------
+    Digest of lines (.bin) of file in subdirectory "digests_of_lines" of directory "fingerprints_of_files" (if not there yet).
+    """
+    hash_object     = hashlib.blake2b(digest_size = 20)
+    digest_of_lines = bytearray()
+    with archive_input.open_file(path_of_file, "rb") as file_object:
+        for line in file_object:
+            if regex_for_volatile_lines.match(line):
+                continue
+            if line.startswith(b"LOCUS"):
+                line = regex_for_date_in_LOCUS_line.sub(b"", line)
+            line = line.rstrip(b"\r\n") + b"\n" # Note: line endings ("\n" or "\r\n") do not change fingerprint.
+            hash_object.update(line)
+            digest_of_lines += hashlib.blake2b(line, digest_size = size_of_hash_of_line).digest()
+
+    fingerprint = hash_object.hexdigest()
+    if not os.path.isfile(path_of_digest_of_lines(fingerprint)):
+        create.create_directory_if_not_exists(os.path.dirname(path_of_digest_of_lines(fingerprint)))
+        with open(path_of_digest_of_lines(fingerprint) + ".tmp", "wb") as file_object:
+            file_object.write(digest_of_lines)
+        os.replace(path_of_digest_of_lines(fingerprint) + ".tmp", path_of_digest_of_lines(fingerprint))
+    return fingerprint, len(digest_of_lines) // size_of_hash_of_line
+
+
+def path_of_digest_of_lines(fingerprint):
+    return os.path.join(names_and_paths.path_of_directory_of_fingerprints_of_files, name_of_directory_of_digests, fingerprint + ".bin")
+# # -----------Make fingerprint of a file-----------------------
+
+
+# # -----------Load and save index of fingerprints-----------------------
+def load_index_of_fingerprints():
+    """
+    Load the index of fingerprints (or make a new, empty index if there is none yet or if it cannot be read).
+
+    Parameters
+    ----------
+    None.
+
+    Returns
+    -------
+    index_of_fingerprints : dict
+        Index of fingerprints: {"Version": ..., "Entries": {real path of file: [size of file, time of last modification (in ns), fingerprint, number of lines]}}.
+    """
+    path_of_index = names_and_paths.path_of_directory_of_fingerprints_of_files + names_and_paths.name_of_index_of_fingerprints
+    index_of_fingerprints = { "Version" : version_of_fingerprints, "Entries" : {} }
+    if os.path.isfile(path_of_index):
+        try:
+            with open(path_of_index, "r") as file_object:
+                saved_index = json.load(file_object)
+            if saved_index.get("Version") == version_of_fingerprints:
+                index_of_fingerprints["Entries"] = saved_index.get("Entries", {})
+        except (OSError, ValueError):
+            pass # Start with an empty index if the saved index cannot be read (e.g. if it was only partly written).
+    return index_of_fingerprints
+
+
+def save_index_of_fingerprints(index_of_fingerprints):
+    """
+    Save the index of fingerprints (the file is replaced at once, so that it is never only partly written).
+
+    Parameters
+    ----------
+    index_of_fingerprints : dict
+        Index of fingerprints.
+
+    Returns
+    -------
+    None.
+
+    Output files
+    ------------
+    A file (.json) for the index in directory "fingerprints_of_files".
+    """
+    create.create_directory_if_not_exists(names_and_paths.path_of_directory_of_fingerprints_of_files)
+    path_of_index           = names_and_paths.path_of_directory_of_fingerprints_of_files + names_and_paths.name_of_index_of_fingerprints
+    path_of_temporary_index = path_of_index + ".tmp"
+    with open(path_of_temporary_index, "w") as file_object:
+        json.dump(index_of_fingerprints, file_object)
+    os.replace(path_of_temporary_index, path_of_index)
+# # -----------Load and save index of fingerprints-----------------------
+
+
+# # -----------Get fingerprint of a file from index-----------------------
+def get_entry_of_file(index_of_fingerprints, path_of_file):
+    """
+    Get the entry of a file (fingerprint and number of lines) from the index, or make it (and add it to the index) if the file is not in the index yet or has changed since (different size or time of last modification), or if its digest of lines is missing.
+
+    Parameters
+    ----------
+    index_of_fingerprints   : dict
+        Index of fingerprints.
+    path_of_file            : str
+        Path of a file.
+
+    Returns
+    -------
+    list
+        Size of file, time of last modification, fingerprint and number of lines of file.
+    """
+    real_path_of_file                       = path_of_file if archive_input.is_path_in_archive(path_of_file) else os.path.realpath(path_of_file) # Note: the same file can be given with different paths (e.g. symbolic links).
+    size_of_file, time_of_last_modification = archive_input.stat_of_file(real_path_of_file)
+    entry                                   = index_of_fingerprints["Entries"].get(real_path_of_file)
+    if entry is not None and entry[0] == size_of_file and entry[1] == time_of_last_modification and os.path.isfile(path_of_digest_of_lines(entry[2])):
+        return entry
+
+    fingerprint, number_of_lines = make_fingerprint_of_file(real_path_of_file)
+    index_of_fingerprints["Entries"][real_path_of_file] = [size_of_file, time_of_last_modification, fingerprint, number_of_lines] # A list, as JSON has no tuples.
+    return index_of_fingerprints["Entries"][real_path_of_file]
+
+
+def get_fingerprint_of_file(index_of_fingerprints, path_of_file):
+    return get_entry_of_file(index_of_fingerprints, path_of_file)[2] # Fingerprint of file.
+# # -----------Get fingerprint of a file from index-----------------------
+
+
+# # -----------Compare two files by their fingerprints and digests of lines-----------------------
+def are_files_near_duplicates(index_of_fingerprints, path_of_file1, path_of_file2):
+    """
+    Decide from their fingerprints and digests of lines whether two files have (almost) identical content, i.e. the same fingerprint, or numbers of lines that differ by at most 20 and at most 50 different lines (compared by position, as in the comparison of files without fingerprints, see module "deduplicate.py").
+
+    Parameters
+    ----------
+    index_of_fingerprints   : dict
+        Index of fingerprints.
+    path_of_file1           : str
+        Path of first file.
+    path_of_file2           : str
+        Path of second file.
+
+    Returns
+    -------
+    bool
+        True if files have (almost) identical content, otherwise False.
+    """
+    _, _, fingerprint1, number_of_lines1 = get_entry_of_file(index_of_fingerprints, path_of_file1)
+    _, _, fingerprint2, number_of_lines2 = get_entry_of_file(index_of_fingerprints, path_of_file2)
+    if fingerprint1 == fingerprint2:
+        return True
+    if abs(number_of_lines1 - number_of_lines2) > max_difference_of_number_of_lines_of_near_duplicates:
+        return False # Quick comparison, without reading digests of lines.
+
+    with open(path_of_digest_of_lines(fingerprint1), "rb") as file_object:
+        hashes_of_lines1 = memoryview(file_object.read()).cast("I") # Note: "I" has 4 bytes ("size_of_hash_of_line") on all common platforms.
+    with open(path_of_digest_of_lines(fingerprint2), "rb") as file_object:
+        hashes_of_lines2 = memoryview(file_object.read()).cast("I")
+
+    number_of_different_lines = 0
+    for hash_of_line1, hash_of_line2 in zip(hashes_of_lines1, hashes_of_lines2):
+        if hash_of_line1 != hash_of_line2:
+            number_of_different_lines += 1
+            if number_of_different_lines > max_number_of_different_lines_of_near_duplicates:
+                return False
+    return True
+# # -----------Compare two files by their fingerprints and digests of lines-----------------------
@@ -6,5 +6,5 @@ import os  # Necessary!
 
 def create_directory_if_not_exists(path):
     if not os.path.exists(path):
-        os.makedirs(path)
+        os.makedirs(path, exist_ok=True) # Note: "exist_ok" in case another run or worker creates the same directory at the same time.
     return path # Create directory with given path (if not existed) and return this path
@@ -2,9 +2,12 @@
 
 
 import re
+import collections
 
 import names_and_paths
 import side_options
+import content_fingerprint
+import archive_input
 
 
 # # -----------Remove or rename files with duplicate name in given list-----------------------
@@ -29,18 +32,22 @@ def remove_or_rename_files_with_duplicate_name(paths):
     ------------
     None.
     """
-    # # -----------Compare content of two given files-----------------------
+    # # -----------Compare content of two files-----------------------
 
-    def compare_content_of_two_files(path_of_file1, path_of_file2):
+    def read_lines_of_file(path_of_file):
+        with archive_input.open_file(path_of_file) as file_object:
+            return file_object.readlines()
+
+    def compare_content_of_two_files(list_of_lines1, list_of_lines2):
         """
-        Compare content of two given files (this function is used only by the outer function).
+        Compare content of two files, given as lists of their lines (this function is used only by the outer function).
 
         Parameters
         ----------
-        path_of_file1 : str
-            Path of first file (e.g. a .fasta or a .gbk file).
-        path_of_file2 : str
-            Path of second file (e.g. a .fasta or a .gbk file).
+        list_of_lines1 : list of str
+            Lines of first file (e.g. a .fasta or a .gbk file).
+        list_of_lines2 : list of str
+            Lines of second file (e.g. a .fasta or a .gbk file).
 
         Returns
         -------
@@ -51,12 +58,6 @@ def remove_or_rename_files_with_duplicate_name(paths):
         ------------
         None.
         """
-        # # -----------Make a list of lines for each file-----------------------
-        with open(path_of_file1) as file_obj1, open(path_of_file2) as file_obj2:
-            list_of_lines1 = file_obj1.readlines()
-            list_of_lines2 = file_obj2.readlines()
-        # # -----------Make a list of lines for each file-----------------------
-
         # # -----------Compare numbers of lines of both files (quick comparison)-----------------------
         if abs(len(list_of_lines1) - len(list_of_lines2)) > 20:
             return "different content"
@@ -76,57 +77,87 @@ def remove_or_rename_files_with_duplicate_name(paths):
         # Note: the difference of numbers of lines and "num_of_different_lines" are generally independent from each other.
         # # -----------Compare line by line of both files, if they differ less than 20 lines-----------------------
 
-    # # -----------Compare content of two given files-----------------------
-
-
-    paths_to_remove = [] # Define a list that will contain paths of files with duplicate name, if there are any in given list of file(s). which will be removed from given list.
-    paths_to_rename = [] # Define a list that will contain paths of files with duplicate name, if there are any in given list of file(s), which will be renamed in given list.
-
-    # # -----------Loop through list and compare every pair of two files and rename or remove one of them from list if they have duplicate name-----------------------
-    for index1 in range(len(paths) - 1): # Note: in case given list only contains one path for one file, and hence there will be no files with duplicate name, this loop (and the other two after this) will not be executed.
-        path_of_file1                   = paths[index1]
-        name_of_file1                   = path_of_file1.split("/")[-1]  # Note: name of file is always behind the last slash in its path.
-        name_of_file1_without_extension = re.sub("|".join(names_and_paths.file_extensions_of_antismash_inputfiles), "", name_of_file1) # Get name of file without file extension.
-        for index2 in range(index1 + 1, len(paths)): # Loop through list and compare each file in this loop with the file of outer loop. IMPORTANT: this loop has to start from "index1" + 1! This is because all file(s) that this loop will go through were already compared with file(s) with index <= "index1".
-            path_of_file2 = paths[index2]
-            if path_of_file2 in paths_to_remove:
-                continue # Skip examining file if file is (almost) identical to one of other files (found out in previous loop) and is going to be removed later.
-            name_of_file2 = path_of_file2.split("/")[-1]
-            name_of_file2_without_extension = re.sub("|".join(names_and_paths.file_extensions_of_antismash_inputfiles), "", name_of_file2) # Get name of file without file extension.
-
-            if name_of_file2_without_extension == name_of_file1_without_extension: # In case found a file with duplicate name (name of file without extension should be used in comparison):
-
-                if side_options.analyze_files_with_same_name_but_different_content == True: # In case files in given list with duplicate name are not to be skipped, but renamed (only their paths in given list are changed, but neither their actual names nor paths in system) if they have different content, or removed if they have identical content (until one file with the name is left in the list):
-                    result_of_content_comparison = compare_content_of_two_files(path_of_file1, path_of_file2) # Compare the content of the files with duplicate name.
-                    if result_of_content_comparison == "different content":
-                        if not path_of_file2 in paths_to_rename: paths_to_rename.append(path_of_file2) # Add path of one of the two files with duplicate name, here "path_of_file2", to list of paths to be renamed (later) in case of different content. Note: check if path already exists in this list before adding to list, as otherwise the number of paths in this list would increase quickly.
-                    elif result_of_content_comparison == "(almost) identical content":
-                        if not path_of_file2 in paths_to_remove: paths_to_remove.append(path_of_file2) # Add path of one of the two files with duplicate name, here "path_of_file2", to list of paths to be removed (later) in case of (almost) identical content. Note: check if path already exists in this list before adding to list, as otherwise the number of paths in this list would increase quickly.
-                    # Note: file that corresponds to "index1" with its name "name_of_file1" is kept as file with unique name in given list.
-
-                elif side_options.analyze_files_with_same_name_but_different_content == False: # In case files in given list with duplicate name are to be all skipped, i.e. their paths will be removed from given list, regardless of content of the files:
-                    if not path_of_file2 in paths_to_remove: paths_to_remove.append(path_of_file2) # Add path of one of the two files with duplicate name, here "path_of_file2", to list of paths to be removed (later). Note: check if path already exists in this list before adding to list, as otherwise the number of paths in this list would increase quickly.
-
-            else:
-                continue # Continue in case the two files have different names (content of the two files will not be compared in this case).
-
-    for path in paths_to_remove:
-        paths.remove(path) # Remove all path(s) of files with duplicate name, so that only one file is left with the unique name.
-
-    for path_index in range(len(paths_to_rename)):
-        old_path = paths_to_rename[path_index] # "old_path": path before renaming.
-        new_path = old_path + (path_index + 1)*"_" + "renamed" # "new_path": path after renaming by adding the suffix "renamed" behind the file extension. Note: "path_index" + 1 because "path_index" starts at 0. With different number of "_" for each path, each "new_path" should be unique. File extension will not be at the end, but this is not a problem as later the original, correct path of file can be retrieved (e.g. with string methods).
-        # new_path = old_path + "__renamed" + str(path_index) # Alternative: add a (random) numerical identifier as a (unique) suffix.
-        try:
-            paths.remove(old_path)
-            paths.append(new_path) # Note: position where "new_path" is added in "paths" is not important.
-            # Use try...except... block here because somehow some paths cannot be removed.
-        except:
-            print("\n> Cannot remove path of duplicate file: " + old_path) # Print path that cannot somehow be removed, so that user is informed that an identical file will be analyzed more than once. Care must then be taken when interpreting the statistics output at the end of task (e.g. due to overcounting a BGC)!
-            pass # Skip if path cannot somehow be removed from list (this happens sometimes for some input files/folders, that is why a try...except... block is used here to skip this exception). Skipping such paths will only increase the execution time of task as possibly identical files will be analyzed (for task 2 particularly, the statistics will be falsified).
+    # # -----------Compare content of two files-----------------------
+
+
+    pattern_of_file_extensions = re.compile("|".join(names_and_paths.file_extensions_of_antismash_inputfiles)) # Compiled only once for all files.
+
+    # # -----------Group positions of files in list by name of file (without file extension)-----------------------
+    positions_of_files_with_same_name = {} # Key = name of file without file extension, value = positions (in given list) of all files with this name. Note: only files in the same group can have duplicate name, so that files are only compared within their group (instead of comparing every pair of files in list).
+    for position, path_of_file in enumerate(paths):
+        name_of_file_without_extension = pattern_of_file_extensions.sub("", archive_input.name_of_file(path_of_file)) # Note: name of file is always behind the last slash in its path (for a file in an archive: in its name in archive).
+        positions_of_files_with_same_name.setdefault(name_of_file_without_extension, []).append(position)
+    # # -----------Group positions of files in list by name of file (without file extension)-----------------------
+
+    # # -----------Fingerprints of files (only used if files are compared by their fingerprints)-----------------------
+    index_of_fingerprints = None # Index of fingerprints (see module "content_fingerprint.py"), only loaded if a fingerprint is needed.
+
+    def are_files_near_duplicates(path_of_file1, path_of_file2):
+        nonlocal index_of_fingerprints
+        if index_of_fingerprints is None:
+            index_of_fingerprints = content_fingerprint.load_index_of_fingerprints()
+        return content_fingerprint.are_files_near_duplicates(index_of_fingerprints, path_of_file1, path_of_file2) # Note: each file is read at most once (its fingerprint and digest of lines are kept in index).
+    # # -----------Fingerprints of files (only used if files are compared by their fingerprints)-----------------------
+
+    paths_to_remove = set() # Define a set that will contain paths of files with duplicate name, if there are any in given list of file(s), which will be removed from given list.
+    paths_to_rename = {}    # Define a dict that will contain paths of files with duplicate name, if there are any in given list of file(s), which will be renamed in given list. Value = positions of the pair of files (in given list) that led to renaming, so that paths are renamed in the same order as when every pair of files in list is compared one after another.
+
+    # # -----------Compare every pair of two files within each group and rename or remove one of them from list-----------------------
+    for positions in positions_of_files_with_same_name.values():
+        if len(positions) < 2:
+            continue # File has unique name.
+
+        if side_options.analyze_files_with_same_name_but_different_content == False: # In case files in given list with duplicate name are to be all skipped, i.e. their paths will be removed from given list, regardless of content of the files:
+            paths_to_remove.update(paths[position] for position in positions[1:]) # Note: only the first file with the name is kept in given list.
+            continue
+
+        # In case files in given list with duplicate name are not to be skipped, but renamed (only their paths in given list are changed, but neither their actual names nor paths in system) if they have different content, or removed if they have identical content (until one file with the name is left in the list):
+        for index_in_group, position1 in enumerate(positions[:-1]):
+            path_of_file1  = paths[position1]
+            list_of_lines1 = None # Lines of first file are only read once for all comparisons with this file (and only if needed).
+            for position2 in positions[index_in_group + 1:]: # IMPORTANT: compare only with files that come after the first file in given list, as all files before were already compared with it.
+                path_of_file2 = paths[position2]
+                if path_of_file2 in paths_to_remove:
+                    continue # Skip examining file if file is (almost) identical to one of other files (found out in previous loop) and is going to be removed later.
+
+                if side_options.compare_content_of_files_by_fingerprints == True:
+                    result_of_content_comparison = "(almost) identical content" if are_files_near_duplicates(path_of_file1, path_of_file2) else "different content" # Compare the fingerprints (identical content) and digests of lines (almost identical content, same thresholds as below) of the files with duplicate name.
+                else:
+                    if list_of_lines1 is None:
+                        list_of_lines1 = read_lines_of_file(path_of_file1)
+                    result_of_content_comparison = compare_content_of_two_files(list_of_lines1, read_lines_of_file(path_of_file2)) # Compare the content of the files with duplicate name.
+                if result_of_content_comparison == "different content":
+                    paths_to_rename.setdefault(path_of_file2, (position1, position2)) # Add path of one of the two files with duplicate name, here "path_of_file2", to paths to be renamed (later) in case of different content (only the first time).
+                elif result_of_content_comparison == "(almost) identical content":
+                    paths_to_remove.add(path_of_file2) # Add path of one of the two files with duplicate name, here "path_of_file2", to paths to be removed (later) in case of (almost) identical content.
+                # Note: file that corresponds to "position1" is kept as file with unique name in given list.
+    # # -----------Compare every pair of two files within each group and rename or remove one of them from list-----------------------
+
+    if index_of_fingerprints is not None:
+        content_fingerprint.save_index_of_fingerprints(index_of_fingerprints) # Save fingerprints for later runs.
+
+    # # -----------Remove and rename paths in given list-----------------------
+    number_of_occurrences   = collections.Counter(paths)            # Number of occurrences of each path in given list.
+    number_of_paths_to_skip = dict.fromkeys(paths_to_remove, 1)     # Number of occurrences of each path (from the beginning of given list) that are removed from given list.
+    new_paths               = []                                    # Renamed paths, added at the end of given list.
+
+    for path_index, old_path in enumerate(sorted(paths_to_rename, key = paths_to_rename.get)): # "old_path": path before renaming.
+        if number_of_paths_to_skip.get(old_path, 0) < number_of_occurrences[old_path]: # Path is still in given list.
+            number_of_paths_to_skip[old_path] = number_of_paths_to_skip.get(old_path, 0) + 1
+            new_paths.append(old_path + (path_index + 1)*"_" + "renamed") # "new_path": path after renaming by adding the suffix "renamed" behind the file extension. Note: "path_index" + 1 because "path_index" starts at 0. With different number of "_" for each path, each "new_path" should be unique. File extension will not be at the end, but this is not a problem as later the original, correct path of file can be retrieved (e.g. with string methods).
+        else:
+            print("\n> Cannot remove path of duplicate file: " + old_path) # Print path that cannot be removed (i.e. the path was already removed because its file is (almost) identical to another file), so that user is informed that an identical file will be analyzed more than once. Care must then be taken when interpreting the statistics output at the end of task (e.g. due to overcounting a BGC)!
+
+    remaining_paths = []
+    for path in paths:
+        if number_of_paths_to_skip.get(path, 0) > 0:
+            number_of_paths_to_skip[path] -= 1 # Skip (i.e. remove or rename) this occurrence of path.
+        else:
+            remaining_paths.append(path)
+
+    paths[:] = remaining_paths + new_paths # Note: the given list itself is changed (not only returned).
+    # # -----------Remove and rename paths in given list-----------------------
 
     return paths
-    # IMPORTANT: do not remove or change element in a list, here path of an file, while looping through it! Instead, make a second list, e.g. a copy of the original list, for processing during the loop.
-    # # -----------Loop through list and compare every pair of two files and rename or remove one of them from list if they have duplicate name-----------------------
 
 # # -----------Remove or rename files with duplicate name in given list-----------------------
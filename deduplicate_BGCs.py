@@ -0,0 +1,173 @@
+''' This module collapses identical and near-identical BGCs before the similarity analysis (task 3), e.g. the same BGC that was found in several related samples (metagenomes) under different names of files. Each BGC is identified by a fingerprint of its DNA sequence
+    (independent of the strand) or, optionally, of the translations of its core genes (so that also BGCs with only synonymous mutations or slightly different borders of region are collapsed). Optionally, a BGC without identical representative is also
+    collapsed into a near-identical representative, i.e. with an estimated similarity of the k-mers of the translations of its core and additional biosynthetic genes (MinHash sketches, as in module "precluster_BGCs.py") of at least a high threshold.
+    Only one representative of each group is analyzed by BiG-SCAPE, and all members of each group (with their similarity to the representative) are written to a table in directory "statistics", so that the numbers of BGCs per sample can still be recovered. '''
+
+
+import os
+import re
+import hashlib
+
+import create
+import input_parameters
+import analyze_and_assess
+import archive_input
+import precluster_BGCs
+
+
+complement_of_nucleotides = str.maketrans("acgtn", "tgcan") # For reverse complement of DNA sequence.
+
+
+# # -----------Make fingerprints of a BGC-----------------------
+def make_fingerprints_of_BGC(path_of_inputfile):
+    """
+    Read a Genbank (.gbk) file of one BGC (in one pass) and make the fingerprints of its DNA sequence and of the translations of its core genes.
+
+    Parameters
+    ----------
+    path_of_inputfile : str
+        Path of a Genbank (.gbk) file that contains one BGC.
+
+    Returns
+    -------
+    fingerprints : dict of {str : str or None}
+        "Fingerprint of DNA sequence": hash of the DNA sequence or of its reverse complement (whichever is smaller), so that the same BGC on the other strand has the same fingerprint (None if file has no DNA sequence).
+        "Fingerprint of core genes": hash of the sorted translations of all core genes (None if BGC has no core genes).
+        "Product(s) of BGC": product(s) of BGC, e.g. "NRPS+T1PKS".
+        "Translations of genes": translations of core and additional biosynthetic genes (e.g. for the MinHash sketch of BGC).
+    """
+    parts_of_DNA_sequence = []
+
+    def lines_of_file(file_object): # Pass all lines on to the parser of BGCs, and keep the lines of the DNA sequence (between "ORIGIN" and "//").
+        DNA_sequence_being_read = False
+        for line in file_object:
+            if DNA_sequence_being_read:
+                if line.startswith("//"):
+                    DNA_sequence_being_read = False
+                else:
+                    parts_of_DNA_sequence.append("".join(character for character in line.lower() if character.isalpha()))
+            elif line.endswith(analyze_and_assess.delimiter_btw_data_of_genes_and_DNA_seq_of_whole_BGC):
+                DNA_sequence_being_read = True
+            yield line
+
+    with archive_input.open_file(path_of_inputfile, "r") as file_object:
+        features_of_BGC = analyze_and_assess.parse_BGC(lines_of_file(file_object))
+
+    DNA_sequence                    = "".join(parts_of_DNA_sequence)
+    reverse_complement_of_sequence  = DNA_sequence.translate(complement_of_nucleotides)[::-1]
+    translations_of_core_genes      = sorted( gene["translation"] for gene in features_of_BGC["Data record for core genes"] )
+
+    return {
+    "Fingerprint of DNA sequence"   : hashlib.sha256(min(DNA_sequence, reverse_complement_of_sequence).encode()).hexdigest() if len(DNA_sequence) > 0 else None, # Note: files without DNA sequence (no "ORIGIN") are never identical to each other.
+    "Fingerprint of core genes"     : hashlib.sha256("\n".join(translations_of_core_genes).encode()).hexdigest() if len(translations_of_core_genes) > 0 else None,
+    "Product(s) of BGC"             : "+".join(features_of_BGC["Product(s) of BGC"]),
+    "Translations of genes"         : [ gene["translation"] for gene in features_of_BGC["Data record for core genes"] + features_of_BGC["Data record for additional genes"] ]
+    }
+# # -----------Make fingerprints of a BGC-----------------------
+
+
+# # -----------Collapse identical BGCs-----------------------
+def collapse_identical_BGCs(inputpaths, compare_core_genes=False, min_similarity_of_near_identical_BGCs=None):
+    """
+    Group BGCs with the same fingerprint and keep one representative (the first BGC in given list) of each group. Optionally, a BGC without identical representative is grouped with the most similar near-identical representative: candidates are found by
+    locality-sensitive hashing of MinHash sketches (with the parameters for preclustering in module "input_parameters.py", see module "precluster_BGCs.py"), so that each BGC is only compared with a few representatives.
+    A BGC without fingerprint (no DNA sequence, and no core genes if these are compared) is its own representative.
+
+    Parameters
+    ----------
+    inputpaths          : list of str
+        Paths of Genbank (.gbk) files, each contains one BGC (paths can have the suffix "renamed", see module "deduplicate.py").
+    compare_core_genes  : bool
+        True: BGCs with the same translations of core genes are identical (BGCs without core genes are compared by their DNA sequence). False: only BGCs with the same DNA sequence are identical.
+    min_similarity_of_near_identical_BGCs : float or None
+        Minimum estimated similarity (Jaccard index of k-mers, in range [0.0, 1.0]) of a near-identical BGC and its representative. None: only identical BGCs are grouped.
+
+    Returns
+    -------
+    paths_of_representatives : list of str
+        Paths of representatives (in the order of given list).
+    members_of_groups        : list of dict of {str : str}
+        One entry per BGC: path of BGC, path of its representative, its fingerprint, product(s) and estimated similarity to its representative ("1.0" for identical BGCs).
+    """
+    path_of_representative_of_fingerprint   = {} # Key = fingerprint, value = path of representative.
+    similarity_of_fingerprint               = {} # Key = fingerprint, value = estimated similarity to representative (1.0 if identical).
+    paths_of_representatives                = []
+    members_of_groups                       = []
+    number_of_bands                         = input_parameters.number_of_bands_for_preclustering
+    number_of_rows_per_band                 = input_parameters.number_of_rows_per_band_for_preclustering
+    representatives_of_band                 = {} # Key = number of band and hash values of band, value = paths of representatives with these hash values (candidates for near-identical BGCs).
+    sketch_of_representative                = {} # Key = path of representative, value = MinHash sketch.
+
+    for path_of_inputfile in inputpaths:
+        fingerprints_of_BGC = make_fingerprints_of_BGC(re.sub("_+renamed$", "", path_of_inputfile)) # Note: a renamed path has the suffix "renamed" behind its file extension.
+        fingerprint         = fingerprints_of_BGC["Fingerprint of DNA sequence"]
+        if compare_core_genes == True and fingerprints_of_BGC["Fingerprint of core genes"] is not None:
+            fingerprint = "core genes:" + fingerprints_of_BGC["Fingerprint of core genes"]
+
+        if fingerprint is None:
+            paths_of_representatives.append(path_of_inputfile) # Not grouped with any other BGC.
+            members_of_groups.append({ "Member BGC" : path_of_inputfile, "Representative BGC" : path_of_inputfile, "Fingerprint" : "", "Product(s) of BGC" : fingerprints_of_BGC["Product(s) of BGC"], "Similarity to representative" : "1.0" })
+            continue
+
+        if fingerprint not in path_of_representative_of_fingerprint:
+            # # -----------Optional: find near-identical representative-----------------------
+            sketch = None
+            if min_similarity_of_near_identical_BGCs is not None:
+                sketch = precluster_BGCs.make_MinHash_sketch(precluster_BGCs.make_hashes_of_kmers(fingerprints_of_BGC["Translations of genes"], input_parameters.length_of_kmers_for_preclustering), number_of_bands * number_of_rows_per_band)
+            keys_of_bands = [ (number_of_band, sketch[number_of_band*number_of_rows_per_band : (number_of_band + 1)*number_of_rows_per_band]) for number_of_band in range(number_of_bands) ] if sketch is not None else []
+            candidates    = dict.fromkeys( path_of_representative for key_of_band in keys_of_bands for path_of_representative in representatives_of_band.get(key_of_band, []) ) # Note: "dict.fromkeys()" removes duplicate candidates (keeping their order).
+            similarities  = { path_of_representative : precluster_BGCs.estimate_similarity(sketch, sketch_of_representative[path_of_representative]) for path_of_representative in candidates }
+            path_of_near_identical_representative = max(similarities, key = similarities.get, default = None) # Most similar representative (the first one if several are equally similar).
+            # # -----------Optional: find near-identical representative-----------------------
+
+            if path_of_near_identical_representative is not None and similarities[path_of_near_identical_representative] >= min_similarity_of_near_identical_BGCs:
+                path_of_representative_of_fingerprint[fingerprint] = path_of_near_identical_representative # Note: BGCs identical to this BGC get the same representative.
+                similarity_of_fingerprint[fingerprint]             = similarities[path_of_near_identical_representative]
+            else:
+                path_of_representative_of_fingerprint[fingerprint] = path_of_inputfile
+                similarity_of_fingerprint[fingerprint]             = 1.0
+                paths_of_representatives.append(path_of_inputfile)
+                if sketch is not None:
+                    sketch_of_representative[path_of_inputfile] = sketch
+                    for key_of_band in keys_of_bands:
+                        representatives_of_band.setdefault(key_of_band, []).append(path_of_inputfile)
+
+        members_of_groups.append({ "Member BGC" : path_of_inputfile, "Representative BGC" : path_of_representative_of_fingerprint[fingerprint], "Fingerprint" : fingerprint, "Product(s) of BGC" : fingerprints_of_BGC["Product(s) of BGC"], "Similarity to representative" : str(round(similarity_of_fingerprint[fingerprint], 3)) })
+
+    return paths_of_representatives, members_of_groups
+# # -----------Collapse identical BGCs-----------------------
+
+
+# # -----------Write table of members of groups of identical BGCs-----------------------
+def write_table_of_members_of_identical_BGCs(members_of_groups, path_of_table, path_of_input_dir):
+    """
+    Write a table (tab-separated) with one row per BGC and its representative (only the representatives are analyzed by BiG-SCAPE).
+
+    Parameters
+    ----------
+    members_of_groups   : list of dict of {str : str}
+        Members of groups of identical BGCs (see function "collapse_identical_BGCs" above).
+    path_of_table       : str
+        Path of table.
+    path_of_input_dir   : str
+        Path of input directory of task 3 (paths in table are relative to this directory).
+
+    Returns
+    -------
+    None.
+
+    Output files
+    ------------
+    A table (.tsv) with the columns "Member BGC", "Representative BGC", "Number of members of group", "Product(s) of BGC", "Fingerprint" and "Similarity to representative" (estimated, "1.0" for identical BGCs).
+    """
+    create.create_directory_if_not_exists(os.path.dirname(path_of_table))
+    number_of_members_of_representative = {}
+    for member in members_of_groups:
+        number_of_members_of_representative[member["Representative BGC"]] = number_of_members_of_representative.get(member["Representative BGC"], 0) + 1
+
+    with open(path_of_table, "w") as file_object:
+        file_object.write("\t".join([ "Member BGC", "Representative BGC", "Number of members of group", "Product(s) of BGC", "Fingerprint", "Similarity to representative" ]) + "\n")
+        for member in members_of_groups:
+            file_object.write("\t".join([ os.path.relpath(member["Member BGC"], path_of_input_dir), os.path.relpath(member["Representative BGC"], path_of_input_dir),
+                                          str(number_of_members_of_representative[member["Representative BGC"]]), member["Product(s) of BGC"], member["Fingerprint"], member["Similarity to representative"] ]) + "\n")
+# # -----------Write table of members of groups of identical BGCs-----------------------
@@ -5,7 +5,59 @@
 # # ----------------------------------------------------------------------------------------------------------------ALTERNATIVE 1: Use predefined values for all parameters----------------------------------------------------------------------------------------------------------------
 # Note: the predefined values below can all be adapted freely, they can however only all be used if the option "prompt_user_to_input_values_for_parameters" in "side_options.py" is set to False (in that case, the main program "start_and_command.py" will not execute all the functions below).
 
+# # --------------For all tasks of pipeline: predefined parameters for input and output files------------------
+number_of_threads_for_unzipping                             = 4         # Number of zipped files/folders in input directory of a task that are extracted at the same time (also used if values for parameters are input by user).
+mode_of_materialisation_of_files                            = "hardlink" # How files of selected BGCs (task 2) and input files of BiG-SCAPE (task 3) are put into their directories (also used if values for parameters are input by user): "hardlink" (no extra disk space, file is not changed by removing the original file),
+                                                                         # "reflink" (copy that shares content until changed, only on some file systems, e.g. Btrfs, XFS), "symlink" (reference to original file, broken if original file is removed; not used for BiG-SCAPE) or "copy". If not possible, a reflink and then a copy is made (see module "link_or_copy.py").
+# # --------------For all tasks of pipeline: predefined parameters for input and output files------------------
+
+
+# # --------------For all tasks of pipeline: predefined parameters for running external programs (antiSMASH, BiG-SCAPE)------------------
+# Note: these parameters are also used if values for parameters are input by user (see module "run_process.py").
+wall_clock_timeout_of_antismash_run_in_s                    = 0         # Maximum time (in s) of an antiSMASH run, after which the run is stopped (and counted as failed). 0: no timeout.
+idle_timeout_of_antismash_run_in_s                          = 0         # Maximum time (in s) of an antiSMASH run without any output (e.g. a hung docker container), after which the run is stopped. 0: no timeout.
+wall_clock_timeout_of_bigscape_run_in_s                     = 0         # Maximum time (in s) of a BiG-SCAPE run, after which the run is stopped (and counted as failed). 0: no timeout.
+idle_timeout_of_bigscape_run_in_s                           = 0         # Maximum time (in s) of a BiG-SCAPE run without any output, after which the run is stopped. 0: no timeout.
+number_of_retries_of_external_programs                      = 2         # Maximum number of repeated runs of antiSMASH or BiG-SCAPE after a transient failure (exit code in "exit_codes_for_retry_of_external_programs").
+backoff_of_retries_of_external_programs_in_s                = 30        # Waiting time (in s) before the first repeated run (doubles with each further repeated run).
+exit_codes_for_retry_of_external_programs                   = [ 125 ]   # Exit codes of transient failures, e.g. 125: docker could not start the container (add 124 to also repeat runs that were stopped after a timeout).
+# # --------------For all tasks of pipeline: predefined parameters for running external programs (antiSMASH, BiG-SCAPE)------------------
+
+
+# # --------------For task 1 of pipeline: predefined parameters for running antiSMASH------------------
+# Only used if the option "filter_contigs_before_antismash" in "side_options.py" is set to True:
+fraction_of_min_length_for_contig_prefilter                 = 0.5       # Contigs shorter than this fraction of "min_length" (minimum length of BGC in main selection of task 2, see below) are removed before running antiSMASH. Note: BGCs on shorter contigs cannot pass the main selection, but could still pass the second-chance selection, so a value below 1.0 keeps more candidates for second-chance selection.
+max_fraction_of_N_in_contig                                 = 0.5       # Contigs with a higher fraction of ambiguous nucleotides ("N") are removed before running antiSMASH. Note: BGCs with any "N" in their DNA sequence are discarded in preliminary selection of task 2 anyway.
+
+# Only used if the option "split_large_fasta_files_into_shards" in "side_options.py" is set to True:
+max_bp_per_fasta_shard                                      = 50000000  # Maximum total length (in bp) of contigs in one shard. Input files with a larger total length are split into (almost) equally long shards, each with at most this length (unless a single contig is longer).
+
+# Only used if the option "run_antismash_jobs_in_parallel" in "side_options.py" is set to True:
+number_of_parallel_antismash_jobs                           = 4         # Number of antiSMASH runs (i.e. input files) that are executed at the same time.
+number_of_cpus_per_antismash_job                            = 4         # Number of CPUs that each antiSMASH run may use (passed to antiSMASH with flag "--cpus"). Note: "number_of_parallel_antismash_jobs" * "number_of_cpus_per_antismash_job" should not exceed the number of CPUs of the machine.
+
+# Only used if the options "run_antismash_jobs_in_parallel" and "schedule_antismash_jobs_by_size_and_memory" in "side_options.py" are both set to True (estimated memory of an antiSMASH run = "memory_per_antismash_job_in_GB" + "memory_per_Mbp_of_antismash_input_in_GB" * size of input file in Mbp):
+memory_budget_of_antismash_jobs_in_GB                       = 0         # Maximum total estimated memory of all antiSMASH runs at the same time (in GB). 0: 80 % of the memory of the machine.
+memory_per_antismash_job_in_GB                              = 2.0       # Estimated memory of an antiSMASH run, independent of its input (in GB).
+memory_per_Mbp_of_antismash_input_in_GB                     = 0.1       # Estimated additional memory of an antiSMASH run per million bp of its input file (in GB).
+
+# Only used if the option "keep_antismash_workers_warm" in "side_options.py" is set to True:
+docker_image_of_antismash                                   = ""        # Docker image of antiSMASH for the containers of warm workers, e.g. "antismash/standard:7.1.0". "": image that is used by the run file of antiSMASH in directory "thirdparty_programs".
+# # --------------For task 1 of pipeline: predefined parameters for running antiSMASH------------------
+
+
 # # --------------For task 2 of pipeline: predefined parameters that will be used in three selection rounds------------------
+# Only used if the option "run_BGC_selection_in_parallel" in "side_options.py" is set to True (not selection parameters, therefore also used if values for selection parameters are input by user):
+number_of_processes_for_BGC_selection                       = 4         # Number of worker processes that analyze Genbank files at the same time.
+number_of_files_per_chunk_for_BGC_selection                 = 500       # Number of Genbank files that a worker process analyzes at a time.
+
+# Only used if the option "sweep_selection_parameters_in_task_2" in "side_options.py" is set to True (every combination of the values below is assessed):
+sweep_min_num_of_core_genes                                 = [ 1, 2, 3 ]
+sweep_min_length                                            = [ 10000, 15000, 20000, 25000, 30000 ]
+sweep_min_distance                                          = [ 1000, 3000, 5000 ]
+sweep_min_num_of_additional_genes_for_main_selection        = [ 1, 2, 3, 4 ]
+sweep_min_num_of_additional_genes_for_2nd_chance_selection  = [ 3, 5, 7 ]
+
 # For preliminary selection:
 min_num_of_core_genes                                       = 2
 
@@ -34,6 +86,25 @@ param_for_2nd_chance_selection["Minimum number of additional biosynthetic genes"
 
 # # --------------For task 3 of pipeline: predefined parameter for similarity analysis by BiGSCAPE------------------
 cutoffs                                                                                             = "0.7" # One or many values that will be used to group BGCs into families (in case more than one value is passed, e.g. "0.8 0.9", bigscape will establish an analysis for each value). Important: this variable can only take float value(s) in range (0.0, 1.0].
+
+# Only used if the option "run_matrix_of_settings_in_task_3" in "side_options.py" is set to True (every combination of these settings and the value(s) for "cutoffs" above is analyzed):
+MIBiG_settings_for_matrix_of_task_3                         = [ True, False ] # True: analyze query BGCs with BGCs from MIBiG, False: without BGCs from MIBiG.
+
+# Only used if the option "precluster_BGCs_before_task_3" in "side_options.py" is set to True (see module "precluster_BGCs.py"):
+length_of_kmers_for_preclustering                           = 5         # Number of amino acids in each k-mer of the translations of core and additional biosynthetic genes.
+number_of_bands_for_preclustering                           = 40        # Number of bands of MinHash sketch of each BGC. Pairs of BGCs with a similarity of about (1/number_of_bands)^(1/number_of_rows_per_band) or more (here: about 0.3) are very probably compared.
+number_of_rows_per_band_for_preclustering                   = 3         # Number of hash values in each band (the sketch has "number_of_bands" * "number_of_rows_per_band" hash values).
+min_similarity_for_preclustering                            = 0.3       # Minimum estimated similarity (Jaccard index of k-mers, in range [0.0, 1.0]) of two BGCs in the same provisional GCF.
+max_number_of_BGCs_per_BiGSCAPE_run                         = 1000      # Provisional GCFs are put into batches of at most this number of BGCs, each batch is analyzed by its own run of BiG-SCAPE (a larger provisional GCF is analyzed alone).
+
+# Only used if the options "collapse_identical_BGCs_before_task_3" and "collapse_near_identical_BGCs" in "side_options.py" are set to True (see module "deduplicate_BGCs.py"; the sketches of BGCs are made with the parameters for "preclustering" above):
+min_similarity_for_near_identical_BGCs                      = 0.9       # Minimum estimated similarity (Jaccard index of k-mers, in range [0.0, 1.0]) of a near-identical BGC and its representative.
+
+# Only used if the option "use_MIBiG_reference_index_in_task_3" in "side_options.py" is set to True (see module "MIBiG_reference_index.py"; the sketches of BGCs are made with the parameters for "preclustering" above):
+path_of_local_Genbank_files_of_MIBiG                        = ""        # Path of a directory or an archive (e.g. "mibig_gbk_3.1.tar.gz") with the Genbank files of MIBiG, from which the reference index is built once if there is none yet. "": reference index is only built with "python MIBiG_reference_index.py <path>".
+max_number_of_nearest_MIBiG_BGCs                            = 5         # Maximum number of nearest BGCs from MIBiG of each query BGC (these are analyzed by BiG-SCAPE instead of all BGCs from MIBiG).
+min_similarity_for_nearest_MIBiG_BGCs                       = 0.2       # Minimum estimated similarity (Jaccard index of k-mers of translations of all genes, in range [0.0, 1.0]) of a query BGC and a near BGC from MIBiG.
+min_similarity_for_known_BGC                                = 0.5       # Minimum estimated similarity of a query BGC and its nearest BGC from MIBiG for a "known" BGC (otherwise "novel").
 # # --------------For task 3 of pipeline: predefined parameter for similarity analysis by BiGSCAPE------------------
 # # ----------------------------------------------------------------------------------------------------------------ALTERNATIVE 1: Use predefined values for all parameters----------------------------------------------------------------------------------------------------------------
 
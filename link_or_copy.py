@@ -0,0 +1,81 @@
+''' This module puts a file at a new path without copying its content where possible (e.g. files of selected BGCs in task 2 and input files of BiG-SCAPE in task 3): as a hard link (a second name of the same file), a reflink (a copy that shares the content
+    with the original file until one of them is changed, only on some file systems, e.g. Btrfs, XFS), a symbolic link (a reference to the path of the original file) or as a full copy. If a way is not possible (e.g. a hard link across file systems),
+    the next way is tried, until the file is copied. The way is given by the parameter "mode_of_materialisation_of_files" in module "input_parameters.py". '''
+
+
+import os
+import fcntl
+
+import archive_input
+
+
+modes_of_materialisation    = [ "hardlink", "reflink", "symlink", "copy" ]
+request_code_of_reflink     = 0x40049409 # Request code "FICLONE" of "ioctl" (Linux) that makes a reflink of a whole file.
+
+
+# # -----------Link or copy a file in one way-----------------------
+def link_or_copy_file_in_one_way(path_of_file, path_of_destination_file, mode_of_materialisation):
+    if mode_of_materialisation == "copy":
+        archive_input.copy_file(path_of_file, path_of_destination_file) # Note: a file in an archive can only be copied.
+        return
+
+    if mode_of_materialisation == "reflink":
+        with open(path_of_file, "rb") as file_object, open(path_of_destination_file, "wb") as destination_file_object:
+            fcntl.ioctl(destination_file_object.fileno(), request_code_of_reflink, file_object.fileno())
+        return
+
+    path_of_temporary_link = path_of_destination_file + ".link.tmp" # Note: the destination path might already be reserved by an empty file (see module "make_outputfiles_and_stats.py"), so the link is made with a temporary name and then replaces the destination path.
+    if mode_of_materialisation == "hardlink":
+        os.link(path_of_file, path_of_temporary_link)
+    else:
+        os.symlink(os.path.realpath(path_of_file), path_of_temporary_link)
+    try:
+        os.replace(path_of_temporary_link, path_of_destination_file)
+    except OSError:
+        os.remove(path_of_temporary_link)
+        raise
+# # -----------Link or copy a file in one way-----------------------
+
+
+# # -----------Link or copy a file (with fallback)-----------------------
+def link_or_copy_file(path_of_file, path_of_destination_file, mode_of_materialisation="copy", allow_symlink=True):
+    """
+    Put a file at a given path as a hard link, reflink, symbolic link or copy. If the given way is not possible, a reflink and then a copy is tried.
+
+    Parameters
+    ----------
+    path_of_file                : str
+        Path of a file or path in archive (see module "archive_input.py").
+    path_of_destination_file    : str
+        Path of link or copy (an existing file with this path is replaced).
+    mode_of_materialisation     : str
+        "hardlink", "reflink", "symlink" or "copy".
+    allow_symlink               : bool
+        False: a hard link is made instead of a symbolic link (e.g. for input files of BiG-SCAPE, which runs in docker and cannot follow symbolic links to paths outside of its input directory).
+
+    Returns
+    -------
+    str
+        Way in which the file was put at the given path.
+
+    Output files
+    ------------
+    A link or copy of the file.
+    """
+    if mode_of_materialisation not in modes_of_materialisation:
+        raise ValueError("Mode of materialisation of files should be one of " + ", ".join(modes_of_materialisation) + ", not \"" + str(mode_of_materialisation) + "\"!")
+    if mode_of_materialisation == "symlink" and allow_symlink == False:
+        mode_of_materialisation = "hardlink"
+    if archive_input.is_path_in_archive(path_of_file):
+        mode_of_materialisation = "copy"
+
+    modes_to_try = [ mode_of_materialisation ] + [ mode for mode in [ "reflink", "copy" ] if mode != mode_of_materialisation ]
+    for mode in modes_to_try:
+        try:
+            link_or_copy_file_in_one_way(path_of_file, path_of_destination_file, mode)
+            return mode
+        except OSError:
+            if mode == "copy":
+                raise # No other way left.
+            # Otherwise, e.g. hard link across file systems or file system without reflinks: try next way.
+# # -----------Link or copy a file (with fallback)-----------------------
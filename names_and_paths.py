@@ -3,6 +3,8 @@
 
 
 import os
+import contextlib
+import contextvars
 
 
 # Names/prefixes of names/file extensions of relevant files and directories:
@@ -17,10 +19,33 @@ name_of_output_directory_from_bigscape                          = "output_from_B
 name_of_directory_of_statistics                                 = "statistics"
 name_of_directory_of_info_files                                 = "info"
 name_of_directory_of_thirdparty_programs                        = "thirdparty_programs" # This directory contains programs from third party such as antiSMASH, BiG-SCAPE.
+name_of_directory_of_cache_of_antismash_results                 = "cache_of_antiSMASH" # This directory contains (hard links to) results of previous antiSMASH runs, so that input files that were already analyzed do not need to be analyzed again.
+name_of_directory_of_filtered_fasta_files                       = "filtered_input_for_antiSMASH" # This directory contains the input files for antiSMASH after removing short contigs and contigs with too many "N" (see module "prefilter_fasta.py").
+name_of_directory_of_fasta_shards                               = "fasta_shards_for_antiSMASH" # This directory contains the shards (i.e. smaller FASTA files) of large input files for antiSMASH (see module "split_fasta.py").
+name_of_directory_of_antismash_output_of_shards                 = "__shards" # Subdirectory in antiSMASH-output directory of a large input file that contains the antiSMASH-output directories of its shards.
+name_of_directory_of_feature_store_of_BGCs                      = "feature_store_of_BGCs" # This directory contains a table with the data of all BGCs needed for BGC-selection (see module "BGC_feature_store.py").
+name_of_directory_of_files_from_archives                        = "files_from_archives" # This directory temporarily contains input files for antiSMASH that were read from archives (see module "archive_input.py").
+name_of_directory_of_fingerprints_of_files                      = "fingerprints_of_files" # This directory contains the fingerprints of files with duplicate name (see module "content_fingerprint.py").
+name_of_directory_of_cache_of_bigscape                          = "cache_of_BiGSCAPE" # This directory contains the intermediate results of BiG-SCAPE for each BGC (e.g. predicted domains), so that they are reused in the next runs of task 3 (see module "bigscape_cache.py").
+name_of_directory_of_MIBiG_reference_index                      = "MIBiG_reference_index" # This directory contains the reference index of BGCs from MIBiG, used by all runs of the pipeline (see module "MIBiG_reference_index.py").
+name_of_directory_of_run_manifests                              = "run_manifests" # This directory contains one run manifest (.json) for each task, that records the state of each input of the task (see module "run_manifest.py").
+name_of_directory_of_logs                                       = "logs" # This directory contains the log files (output) of all runs of antiSMASH and BiG-SCAPE (see module "run_process.py").
 
 name_of_statistics_file                                         = "statistics_file.txt"
 name_of_plot_of_BGC_statistics                                  = "BGCs.png"
 name_of_plot_of_product_statistics                              = "products.png"
+name_of_summary_of_contig_prefilter                             = "summary_of_contig_prefilter.tsv"
+name_of_table_of_parameter_sweep                                = "parameter_sweep_of_BGC_selection.tsv"
+name_of_table_of_members_of_identical_BGCs                      = "members_of_identical_BGCs.tsv"
+name_of_table_of_GCF_assignments_of_settings                    = "GCFs_for_settings_of_task_3.tsv"
+name_of_table_of_provisional_GCFs                               = "provisional_GCFs.tsv"
+name_of_table_of_nearest_MIBiG_BGCs                             = "nearest_MIBiG_BGCs.tsv"
+name_of_MIBiG_reference_index                                   = "MIBiG_reference_index.json"
+name_of_feature_store_of_BGCs                                   = "features_of_BGCs.pkl"
+name_of_index_of_fingerprints                                   = "index_of_fingerprints.json"
+name_of_index_of_cache_of_bigscape                              = "index_of_cache_of_BiGSCAPE.json"
+suffix_of_names_of_run_manifests                                = "_manifest.json"
+name_of_file_with_key_of_antismash_run                          = ".antismash_cache_key" # File in each antiSMASH-output directory that stores the key of the antiSMASH run (see module "antismash_cache.py"). Note: the prefix "." makes this file an incompatible file for all tasks.
 
 prefixes_of_names_of_incompatible_files                         = [ "." ] # Prefix(es) of names of incompatible files not to analyze by antiSMASH, BiGSCAPE and in BGC-selection.
 # file_extensions_of_files_not_to_analyze                         = [ ".zip", ".tar" ] # Types of files and folders not to analyze.
@@ -30,14 +55,87 @@ file_extensions_of_antismash_outputfiles                        = [ ".gbk" ] # F
 
 
 # Paths of important directories:
-common_path                                                     = os.path.dirname(os.path.realpath(__file__)) + "/" # Path of main or common directory, which contains all files and directories created or used by this pipeline.
+path_of_installation                                            = os.path.dirname(os.path.realpath(__file__)) + "/" # Path of directory that contains all scripts of pipeline.
+path_of_directory_of_thirdparty_programs                        = path_of_installation + name_of_directory_of_thirdparty_programs + "/" # Note: the third-party programs are used by all runs of the pipeline.
+path_of_directory_of_MIBiG_reference_index                      = path_of_installation + name_of_directory_of_MIBiG_reference_index + "/" # Note: the reference index of MIBiG is used by all runs of the pipeline.
 
-path_of_directory_of_input_for_antismash                        = common_path + name_of_input_directory_for_antismash + "/"
-path_of_directory_of_output_from_antismash                      = common_path + name_of_output_directory_from_antismash + "/"
-path_of_directory_of_selected_BGCs                              = common_path + name_of_directory_of_selected_BGCs + "/"
-path_of_directory_of_input_for_bigscape                         = common_path + name_of_input_directory_for_bigscape + "/"
-path_of_directory_of_output_from_bigscape                       = common_path + name_of_output_directory_from_bigscape + "/"
-
-path_of_directory_of_statistics                                 = common_path + name_of_directory_of_statistics + "/"
-path_of_directory_of_thirdparty_programs                        = common_path + name_of_directory_of_thirdparty_programs + "/"
+# Paths of directories of a run: all input and output directories of the pipeline are in the directory of a run, called "workspace" ("common_path", by default the directory of the pipeline, i.e. "path_of_installation"), so that several runs at the same time never use the same directories.
+# These paths are used like variables of this module (e.g. "names_and_paths.path_of_directory_of_statistics" = "common_path" + name_of_directory_of_statistics + "/"), but are taken from the workspace of the current run (see functions below).
+names_of_directories_of_run                                     = {
+"path_of_directory_of_input_for_antismash"                      : name_of_input_directory_for_antismash,
+"path_of_directory_of_output_from_antismash"                    : name_of_output_directory_from_antismash,
+"path_of_directory_of_selected_BGCs"                            : name_of_directory_of_selected_BGCs,
+"path_of_directory_of_input_for_bigscape"                       : name_of_input_directory_for_bigscape,
+"path_of_directory_of_output_from_bigscape"                     : name_of_output_directory_from_bigscape,
+"path_of_directory_of_statistics"                               : name_of_directory_of_statistics,
+"path_of_directory_of_cache_of_antismash_results"               : name_of_directory_of_cache_of_antismash_results,
+"path_of_directory_of_filtered_fasta_files"                     : name_of_directory_of_filtered_fasta_files,
+"path_of_directory_of_fasta_shards"                             : name_of_directory_of_fasta_shards,
+"path_of_directory_of_feature_store_of_BGCs"                    : name_of_directory_of_feature_store_of_BGCs,
+"path_of_directory_of_files_from_archives"                      : name_of_directory_of_files_from_archives,
+"path_of_directory_of_fingerprints_of_files"                    : name_of_directory_of_fingerprints_of_files,
+"path_of_directory_of_cache_of_bigscape"                        : name_of_directory_of_cache_of_bigscape,
+"path_of_directory_of_run_manifests"                            : name_of_directory_of_run_manifests,
+"path_of_directory_of_logs"                                     : name_of_directory_of_logs
+} # Key = name of variable of path, value = name of directory in workspace.
 # Note: os.path.join() could be used here, but be careful with the slash "/" in paths.
+
+
+# # -----------Workspaces (directories of runs)-----------------------
+def make_workspace(path_of_run_directory, path_of_input_directory_for_antismash=None):
+    """
+    Make the workspace of a run, i.e. the paths of all input and output directories of the pipeline (except directory of third-party programs) in the directory of the run. The directories are created by the tasks (if they do not exist yet).
+
+    Parameters
+    ----------
+    path_of_run_directory                   : str
+        Path of directory of run.
+    path_of_input_directory_for_antismash   : str or None
+        Path of input directory for antiSMASH (e.g. a directory of samples outside of directory of run). None: directory "input_for_antiSMASH" in directory of run.
+
+    Returns
+    -------
+    workspace : dict of {str : str}
+        Key = name of variable of path (and "common_path"), value = path.
+    """
+    workspace = { "common_path" : os.path.realpath(path_of_run_directory) + "/" }
+    for name_of_variable, name_of_directory in names_of_directories_of_run.items():
+        workspace[name_of_variable] = workspace["common_path"] + name_of_directory + "/"
+    if path_of_input_directory_for_antismash is not None:
+        workspace["path_of_directory_of_input_for_antismash"] = os.path.realpath(path_of_input_directory_for_antismash) + "/"
+    return workspace
+
+
+default_workspace = make_workspace(path_of_installation)                          # Workspace of all runs in this process, unless a run uses its own workspace (see function "use_workspace" below).
+current_workspace = contextvars.ContextVar("current_workspace", default = None)   # Workspace of the run in the current thread (None: default workspace). Note: a new thread starts without workspace, so threads of a run must be started with "contextvars.copy_context().run" (e.g. see module "run_antismash.py").
+
+
+def set_paths_of_run(path_of_run_directory, path_of_input_directory_for_antismash=None):
+    global default_workspace
+    default_workspace = make_workspace(path_of_run_directory, path_of_input_directory_for_antismash) # E.g. given by command line or configuration file (see module "command_line.py").
+
+
+def get_workspace():
+    return current_workspace.get() or default_workspace
+
+
+def set_workspace_of_process(workspace):
+    global default_workspace
+    default_workspace = workspace # E.g. in a worker process of a run (see module "select_BGCs.py").
+
+
+@contextlib.contextmanager
+def use_workspace(workspace):
+    token = current_workspace.set(workspace) # All paths of this module are taken from this workspace in the current thread (e.g. when several runs are executed as threads in one process), until the end of the "with" statement.
+    try:
+        yield workspace
+    finally:
+        current_workspace.reset(token)
+
+
+def __getattr__(name_of_variable): # Called for all variables that are not defined above, i.e. "common_path" and the paths of directories of a run.
+    workspace = get_workspace()
+    if name_of_variable in workspace:
+        return workspace[name_of_variable]
+    raise AttributeError("module \"names_and_paths\" has no attribute \"" + name_of_variable + "\"")
+# # -----------Workspaces (directories of runs)-----------------------
@@ -0,0 +1,128 @@
+''' This module runs a "parameter sweep" for the BGC-selection (task 2): instead of selecting BGCs with one set of values for the selection parameters, all BGCs are assessed for every combination of values in a grid (given in module "input_parameters.py"),
+    and the numbers of selected/discarded BGCs and the product(s) of selected BGCs are written to one table (one row per combination), which helps to choose values for the selection parameters. Each Genbank file is read only once (see module "BGC_feature_store.py"),
+    then all combinations are assessed with array operations over all BGCs at once. No files are copied. '''
+
+
+import itertools
+import numpy as np
+import pandas as pd
+
+import create
+
+
+# # -----------Make grid of values for selection parameters-----------------------
+def make_grid_of_selection_parameters(values_of_min_num_of_core_genes, values_of_min_length, values_of_min_distance, values_of_min_num_of_additional_genes_for_main_selection, values_of_min_num_of_additional_genes_for_2nd_chance_selection):
+    """
+    Make all combinations of the given values for the selection parameters.
+
+    Parameters
+    ----------
+    values_of_min_num_of_core_genes                                 : list of int
+        Values for minimum number of core genes (preliminary selection).
+    values_of_min_length                                            : list of int
+        Values for minimum length of BGC (in bp) (main selection).
+    values_of_min_distance                                          : list of int
+        Values for minimum distance of each core gene to both edges of BGC (in bp) (main selection).
+    values_of_min_num_of_additional_genes_for_main_selection        : list of int
+        Values for minimum number of additional biosynthetic genes (main selection).
+    values_of_min_num_of_additional_genes_for_2nd_chance_selection  : list of int
+        Values for minimum number of additional biosynthetic genes (second-chance selection).
+
+    Returns
+    -------
+    grid : list of tuple of int
+        All combinations of values (in the order of the parameters above).
+    """
+    return list(itertools.product(values_of_min_num_of_core_genes, values_of_min_length, values_of_min_distance, values_of_min_num_of_additional_genes_for_main_selection, values_of_min_num_of_additional_genes_for_2nd_chance_selection))
+# # -----------Make grid of values for selection parameters-----------------------
+
+
+# # -----------Assess all BGCs for all combinations of values for selection parameters-----------------------
+def sweep_selection_parameters(features, grid):
+    """
+    Assess all BGCs for each combination of values for the selection parameters, with the same selection criteria as in module "analyze_and_assess.py", and count selected/discarded BGCs and product(s) of selected BGCs.
+
+    Parameters
+    ----------
+    features    : pandas.DataFrame
+        Rows of feature store of BGCs (see module "BGC_feature_store.py"). Only files that contain exactly one BGC are assessed.
+    grid        : list of tuple of int
+        Combinations of values for the selection parameters (see function "make_grid_of_selection_parameters" above).
+
+    Returns
+    -------
+    table_of_parameter_sweep : pandas.DataFrame
+        One row per combination: values for the selection parameters, numbers of selected/discarded BGCs and number of selected BGCs per product (or combination of products, e.g. "NRPS+T1PKS").
+
+    Note
+    ----
+    With minimum number of core genes = 0, a BGC without core genes cannot pass the main selection (the distance of core genes to the edges cannot be checked), as in task 2.
+    """
+    features = features[features["File of one BGC"].astype(bool)]
+
+    # # -----------Get data of all BGCs as arrays-----------------------
+    length_of_BGC                   = features["Length of BGC (in bp)"].to_numpy(dtype = np.int64)
+    number_of_core_genes            = features["Number of core genes"].to_numpy(dtype = np.int64)
+    number_of_additional_genes      = features["Number of additional genes"].to_numpy(dtype = np.int64)
+    start_of_first_core_gene        = features["Start of first core gene"].to_numpy(dtype = np.int64)
+    distance_of_last_core_gene      = length_of_BGC - features["End of last core gene"].to_numpy(dtype = np.int64) # Distance of last core gene to right edge of BGC.
+
+    passed_checks_without_parameters = (features["Length of DNA sequence"].to_numpy(dtype = np.int64) > 0) & (features["Number of products"].to_numpy(dtype = np.int64) > 0) \
+                                       & ~features["Ambiguous nucleotide"].to_numpy(dtype = bool) & ~features["Ambiguous amino acid"].to_numpy(dtype = bool) & (number_of_core_genes + number_of_additional_genes > 0) # Part of preliminary selection that does not depend on any parameter.
+
+    products_of_BGCs                = [ "+".join(products_of_BGC) for products_of_BGC in features["Product(s) of BGC"].tolist() ] # Same as in statistics of product(s) of selected BGCs (see module "make_outputfiles_and_stats.py").
+    codes_of_products, products     = pd.factorize(pd.Series(products_of_BGCs, dtype = object), sort = True)
+    # # -----------Get data of all BGCs as arrays-----------------------
+
+    rows_of_table = []
+    for min_num_of_core_genes, min_length, min_distance, min_num_of_additional_genes_for_main_selection, min_num_of_additional_genes_for_2nd_chance_selection in grid:
+        passed_preliminary_selection    = passed_checks_without_parameters & (number_of_core_genes >= min_num_of_core_genes)
+        passed_main_selection           = passed_preliminary_selection & (number_of_core_genes > 0) & (length_of_BGC >= min_length) & (start_of_first_core_gene >= min_distance) & (distance_of_last_core_gene >= min_distance) \
+                                          & (number_of_additional_genes >= min_num_of_additional_genes_for_main_selection)
+        passed_2nd_chance_selection     = passed_preliminary_selection & ~passed_main_selection & (number_of_additional_genes >= min_num_of_additional_genes_for_2nd_chance_selection)
+        selected                        = passed_main_selection | passed_2nd_chance_selection
+
+        row = {
+        "Minimum number of core genes"                                              : min_num_of_core_genes,
+        "Minimum length (in bp)"                                                    : min_length,
+        "Minimum distance (in bp)"                                                  : min_distance,
+        "Minimum number of additional biosynthetic genes (main selection)"          : min_num_of_additional_genes_for_main_selection,
+        "Minimum number of additional biosynthetic genes (second-chance selection)" : min_num_of_additional_genes_for_2nd_chance_selection,
+        "BGCs selected"                                                             : int(selected.sum()),
+        "BGCs passed main selection"                                                : int(passed_main_selection.sum()),
+        "BGCs passed second-chance selection"                                       : int(passed_2nd_chance_selection.sum()),
+        "BGCs discarded"                                                            : int(len(selected) - selected.sum()),
+        "All BGCs"                                                                  : len(selected)
+        }
+        row.update(zip(products, np.bincount(codes_of_products[selected], minlength = len(products)).tolist())) # Number of selected BGCs per product.
+        rows_of_table.append(row)
+
+    return pd.DataFrame(rows_of_table)
+# # -----------Assess all BGCs for all combinations of values for selection parameters-----------------------
+
+
+# # -----------Write table of parameter sweep-----------------------
+def write_table_of_parameter_sweep(table_of_parameter_sweep, path_of_stats_dir, name_of_table):
+    """
+    Write the table of a parameter sweep to a tab-separated file.
+
+    Parameters
+    ----------
+    table_of_parameter_sweep    : pandas.DataFrame
+        Table of parameter sweep (see function "sweep_selection_parameters" above).
+    path_of_stats_dir           : str
+        Path of directory that will contain the table.
+    name_of_table               : str
+        Name of file of table.
+
+    Returns
+    -------
+    None.
+
+    Output files
+    ------------
+    A table (.tsv) with one row per combination of values for the selection parameters.
+    """
+    create.create_directory_if_not_exists(path_of_stats_dir)
+    table_of_parameter_sweep.to_csv(path_of_stats_dir + name_of_table, sep = "\t", index = False)
+# # -----------Write table of parameter sweep-----------------------
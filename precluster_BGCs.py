@@ -0,0 +1,215 @@
+''' This module groups BGCs into "provisional" gene cluster families (GCFs) before the similarity analysis by BiG-SCAPE (task 3), without any third-party program: each BGC is described by the set of all short amino acid sequences ("k-mers") of the translations
+    of its core and additional biosynthetic genes, which is reduced to a small "MinHash sketch" (a fixed number of hash values) that estimates the similarity (Jaccard index) of the k-mers of two BGCs. Locality-sensitive hashing (LSH) then finds pairs of
+    probably similar BGCs (BGCs whose sketches agree in at least one "band" of hash values) in (almost) linear time, instead of comparing all pairs of BGCs. BGCs of similar pairs are in the same provisional GCF.
+    The provisional GCFs can be used for a quick overview of the BGCs (without BiG-SCAPE), or to split task 3 into several smaller runs of BiG-SCAPE (the run time of BiG-SCAPE grows with the square of the number of BGCs). '''
+
+
+import os
+import re
+import hashlib
+
+import create
+import analyze_and_assess
+
+
+range_of_hash_values = 2**64 # Hash values of k-mers are 64-bit integers.
+
+
+# # -----------Make MinHash sketch of a BGC-----------------------
+def make_hashes_of_kmers_of_BGC(path_of_inputfile, length_of_kmers):
+    """
+    Read a Genbank (.gbk) file of one BGC and make the hash values of all k-mers of the translations of its core and additional biosynthetic genes.
+
+    Parameters
+    ----------
+    path_of_inputfile   : str
+        Path of a Genbank (.gbk) file that contains one BGC.
+    length_of_kmers     : int
+        Number of amino acids in a k-mer.
+
+    Returns
+    -------
+    hashes_of_kmers : set of int
+        Hash values of all k-mers (empty if BGC has no core or additional biosynthetic genes).
+    """
+    features_of_BGC = analyze_and_assess.parse_genbank_file_of_BGC(path_of_inputfile)
+    return make_hashes_of_kmers([ gene["translation"] for gene in features_of_BGC["Data record for core genes"] + features_of_BGC["Data record for additional genes"] ], length_of_kmers)
+
+
+def make_hashes_of_kmers(translations, length_of_kmers):
+    kmers = set()
+    for translation in translations:
+        kmers.update( translation[position:position + length_of_kmers] for position in range(len(translation) - length_of_kmers + 1) )
+    return { int.from_bytes(hashlib.blake2b(kmer.encode(), digest_size = 8).digest(), "big") for kmer in kmers } # Hash values of all k-mers of given translations (e.g. of all genes of a BGC from MIBiG, see module "MIBiG_reference_index.py").
+
+
+def make_MinHash_sketch(hashes_of_kmers, number_of_hash_values):
+    """
+    Make the MinHash sketch of a set of hash values of k-mers by "one permutation hashing": the range of hash values is divided into equally large bins, and the sketch contains the smallest hash value in each bin (so that each k-mer is hashed only once).
+    The value of an empty bin is taken from the next nonempty bin ("densification"), so that two sketches can be compared bin by bin.
+
+    Parameters
+    ----------
+    hashes_of_kmers         : set of int
+        Hash values of k-mers of a BGC (see function "make_hashes_of_kmers_of_BGC" above).
+    number_of_hash_values   : int
+        Number of bins (i.e. hash values) in sketch.
+
+    Returns
+    -------
+    sketch : tuple of int
+        MinHash sketch.
+    None
+        If there are no k-mers.
+    """
+    if len(hashes_of_kmers) == 0:
+        return None
+
+    size_of_bin         = range_of_hash_values // number_of_hash_values + 1
+    smallest_values     = [None] * number_of_hash_values
+    for hash_value in hashes_of_kmers:
+        number_of_bin, value_in_bin = divmod(hash_value, size_of_bin)
+        if smallest_values[number_of_bin] is None or value_in_bin < smallest_values[number_of_bin]:
+            smallest_values[number_of_bin] = value_in_bin
+
+    sketch = []
+    for number_of_bin in range(number_of_hash_values):
+        distance_to_nonempty_bin = 0
+        while smallest_values[(number_of_bin + distance_to_nonempty_bin) % number_of_hash_values] is None:
+            distance_to_nonempty_bin += 1
+        sketch.append(smallest_values[(number_of_bin + distance_to_nonempty_bin) % number_of_hash_values] + distance_to_nonempty_bin * size_of_bin) # Note: the distance to the nonempty bin is added, so that borrowed values of two sketches only agree if they are borrowed from the same distance.
+    return tuple(sketch)
+
+
+def estimate_similarity(sketch_1, sketch_2):
+    return sum( value_1 == value_2 for value_1, value_2 in zip(sketch_1, sketch_2) ) / len(sketch_1) # Estimated Jaccard index of the k-mers of two BGCs.
+# # -----------Make MinHash sketch of a BGC-----------------------
+
+
+# # -----------Find provisional GCFs-----------------------
+def find_provisional_GCFs(inputpaths, length_of_kmers, number_of_bands, number_of_rows_per_band, min_similarity):
+    """
+    Group BGCs into provisional GCFs: pairs of BGCs whose sketches agree in all hash values of at least one band are candidates (LSH), and candidates with an estimated similarity of at least "min_similarity" are in the same provisional GCF (together with all BGCs that are similar to one of them). Note: a BGC is only compared with one BGC of each provisional GCF in a bucket of the LSH, so that the run time grows about linearly with the number of BGCs (also for buckets with many identical BGCs).
+
+    Parameters
+    ----------
+    inputpaths              : list of str
+        Paths of Genbank (.gbk) files, each contains one BGC (paths can have the suffix "renamed", see module "deduplicate.py").
+    length_of_kmers         : int
+        Number of amino acids in a k-mer.
+    number_of_bands         : int
+        Number of bands of sketch (sketch has "number_of_bands" * "number_of_rows_per_band" hash values).
+    number_of_rows_per_band : int
+        Number of hash values in a band. Note: pairs of BGCs with a similarity of about (1/number_of_bands)^(1/number_of_rows_per_band) or more are very probably found as candidates.
+    min_similarity          : float
+        Minimum estimated similarity (Jaccard index of k-mers) of two BGCs in the same provisional GCF.
+
+    Returns
+    -------
+    provisional_GCFs : list of list of str
+        Paths of BGCs of each provisional GCF (largest GCF first; BGCs in the order of given list). BGCs without core or additional biosynthetic genes are each in their own GCF.
+    """
+    number_of_hash_values   = number_of_bands * number_of_rows_per_band
+    sketches                = [ make_MinHash_sketch(make_hashes_of_kmers_of_BGC(re.sub("_+renamed$", "", path_of_inputfile), length_of_kmers), number_of_hash_values) for path_of_inputfile in inputpaths ] # Note: a renamed path has the suffix "renamed" behind its file extension.
+
+    # # -----------Group BGCs by union-find-----------------------
+    representative_of_BGC = list(range(len(inputpaths))) # Index of BGC -> index of another BGC in the same GCF (the representative of a GCF refers to itself).
+
+    def find_representative(index_of_BGC):
+        while representative_of_BGC[index_of_BGC] != index_of_BGC:
+            representative_of_BGC[index_of_BGC] = representative_of_BGC[representative_of_BGC[index_of_BGC]] # Shorten path to representative.
+            index_of_BGC                        = representative_of_BGC[index_of_BGC]
+        return index_of_BGC
+    # # -----------Group BGCs by union-find-----------------------
+
+    # # -----------Find candidate pairs by LSH and join similar BGCs-----------------------
+    for number_of_band in range(number_of_bands):
+        BGCs_of_bucket = {} # Key = hash values of band, value = indices of BGCs with these hash values.
+        for index_of_BGC, sketch in enumerate(sketches):
+            if sketch is not None:
+                BGCs_of_bucket.setdefault(sketch[number_of_band*number_of_rows_per_band : (number_of_band + 1)*number_of_rows_per_band], []).append(index_of_BGC)
+
+        for indices_of_BGCs in BGCs_of_bucket.values():
+            BGC_of_GCF_in_bucket = {} # Key = representative of a GCF (when the BGC was added), value = index of one BGC of this GCF in bucket. Note: each BGC is only compared with one BGC of each GCF in bucket (not with all BGCs of bucket), as BGCs in a bucket are mostly similar and often in only a few GCFs.
+            for index_of_BGC in indices_of_BGCs:
+                compared_GCFs = set()
+                for representative_in_bucket, index_of_other_BGC in list(BGC_of_GCF_in_bucket.items()):
+                    representative_1, representative_2 = find_representative(index_of_other_BGC), find_representative(index_of_BGC)
+                    if representative_1 in compared_GCFs:
+                        del BGC_of_GCF_in_bucket[representative_in_bucket] # GCF was joined with another GCF of bucket in the meantime.
+                        continue
+                    compared_GCFs.add(representative_1)
+                    if representative_1 != representative_2 and estimate_similarity(sketches[index_of_other_BGC], sketches[index_of_BGC]) >= min_similarity:
+                        representative_of_BGC[max(representative_1, representative_2)] = min(representative_1, representative_2)
+                BGC_of_GCF_in_bucket.setdefault(find_representative(index_of_BGC), index_of_BGC)
+    # # -----------Find candidate pairs by LSH and join similar BGCs-----------------------
+
+    members_of_GCF = {}
+    for index_of_BGC, path_of_inputfile in enumerate(inputpaths):
+        members_of_GCF.setdefault(find_representative(index_of_BGC), []).append(path_of_inputfile)
+    return sorted(members_of_GCF.values(), key = len, reverse = True)
+# # -----------Find provisional GCFs-----------------------
+
+
+# # -----------Put provisional GCFs into batches for BiG-SCAPE-----------------------
+def make_batches_of_provisional_GCFs(provisional_GCFs, max_number_of_BGCs_per_batch):
+    """
+    Put the provisional GCFs into batches (each batch is analyzed in its own run of BiG-SCAPE), so that a GCF is never split and a batch has at most "max_number_of_BGCs_per_batch" BGCs (unless it contains a single larger GCF).
+
+    Parameters
+    ----------
+    provisional_GCFs                : list of list of str
+        Paths of BGCs of each provisional GCF, largest GCF first (see function "find_provisional_GCFs" above).
+    max_number_of_BGCs_per_batch    : int
+        Maximum number of BGCs in a batch.
+
+    Returns
+    -------
+    batches : list of list of str
+        Paths of BGCs of each batch.
+    """
+    batches = []
+    for members in provisional_GCFs: # Largest GCF first ("first fit decreasing").
+        for batch in batches:
+            if len(batch) + len(members) <= max_number_of_BGCs_per_batch:
+                batch.extend(members)
+                break
+        else:
+            batches.append(list(members))
+    return batches
+# # -----------Put provisional GCFs into batches for BiG-SCAPE-----------------------
+
+
+# # -----------Write table of provisional GCFs-----------------------
+def write_table_of_provisional_GCFs(provisional_GCFs, batches, path_of_table, path_of_input_dir):
+    """
+    Write a table (tab-separated) with one row per BGC and its provisional GCF.
+
+    Parameters
+    ----------
+    provisional_GCFs    : list of list of str
+        Paths of BGCs of each provisional GCF (see function "find_provisional_GCFs" above).
+    batches             : list of list of str or None
+        Paths of BGCs of each batch for BiG-SCAPE (see function "make_batches_of_provisional_GCFs" above). None: BiG-SCAPE is not run.
+    path_of_table       : str
+        Path of table.
+    path_of_input_dir   : str
+        Path of input directory of task 3 (paths in table are relative to this directory).
+
+    Returns
+    -------
+    None.
+
+    Output files
+    ------------
+    A table (.tsv) with the columns "BGC", "Provisional GCF", "Number of members of GCF" and "Batch of BiG-SCAPE" (empty if BiG-SCAPE is not run).
+    """
+    create.create_directory_if_not_exists(os.path.dirname(path_of_table))
+    batch_of_BGC = { path_of_inputfile : str(number_of_batch) for number_of_batch, batch in enumerate(batches or [], start = 1) for path_of_inputfile in batch }
+
+    with open(path_of_table, "w") as file_object:
+        file_object.write("\t".join([ "BGC", "Provisional GCF", "Number of members of GCF", "Batch of BiG-SCAPE" ]) + "\n")
+        for number_of_GCF, members in enumerate(provisional_GCFs, start = 1):
+            for path_of_inputfile in members:
+                file_object.write("\t".join([ os.path.relpath(path_of_inputfile, path_of_input_dir), str(number_of_GCF), str(len(members)), batch_of_BGC.get(path_of_inputfile, "") ]) + "\n")
+# # -----------Write table of provisional GCFs-----------------------
@@ -0,0 +1,110 @@
+''' This module filters the contigs of FASTA files before they are analyzed by antiSMASH (task 1). Contigs that are too short to contain a BGC that could pass the main selection in task 2 (see parameter "min_length" in module "input_parameters.py"),
+    as well as contigs that mostly consist of ambiguous nucleotides ("N"), are removed, so that antiSMASH does not spend time on regions that would be discarded in task 2 anyway (e.g. the many short contigs of metagenome assemblies).
+    FASTA files are only read line by line (streaming), so that at most one contig is kept in memory at a time. '''
+
+
+import os
+
+import create
+import archive_input
+
+
+# # -----------Filter contigs of a FASTA file-----------------------
+def filter_contigs_of_fasta_file(path_of_fasta_file, path_of_filtered_fasta_file, min_length_of_contig, max_fraction_of_N_in_contig):
+    """
+    Write all contigs of a FASTA file that are long enough and do not consist mostly of ambiguous nucleotides ("N") to a new FASTA file.
+
+    Parameters
+    ----------
+    path_of_fasta_file              : str
+        Path of a FASTA file.
+    path_of_filtered_fasta_file     : str
+        Path of FASTA file that will contain the remaining contigs.
+    min_length_of_contig            : int
+        Minimum length of a contig (in bp). Shorter contigs are removed.
+    max_fraction_of_N_in_contig     : float
+        Maximum fraction of ambiguous nucleotides ("N") in a contig. Contigs with a higher fraction are removed.
+
+    Returns
+    -------
+    summary : dict of {str : int or str}
+        Number of contigs and bp before filtering and removed by filtering (for the summary of the pre-filter, see function "write_summary_of_contig_prefilter" below).
+
+    Output files
+    ------------
+    A FASTA file with the remaining contigs.
+    """
+    summary = { "Name of file" : archive_input.name_of_file(path_of_fasta_file), "Contigs (all)" : 0, "bp (all)" : 0, "Contigs removed (too short)" : 0, "bp removed (too short)" : 0, "Contigs removed (too many N)" : 0, "bp removed (too many N)" : 0 }
+
+    create.create_directory_if_not_exists(os.path.dirname(path_of_filtered_fasta_file))
+
+    # # -----------Write or remove one contig-----------------------
+    def write_or_remove_contig(lines_of_contig, length_of_contig, number_of_N):
+        summary["Contigs (all)"] += 1
+        summary["bp (all)"]      += length_of_contig
+        if length_of_contig < min_length_of_contig:
+            summary["Contigs removed (too short)"] += 1
+            summary["bp removed (too short)"]      += length_of_contig
+        elif number_of_N > max_fraction_of_N_in_contig * length_of_contig:
+            summary["Contigs removed (too many N)"] += 1
+            summary["bp removed (too many N)"]      += length_of_contig
+        else:
+            filtered_file_object.writelines(lines_of_contig)
+    # # -----------Write or remove one contig-----------------------
+
+    with archive_input.open_file(path_of_fasta_file, "r") as file_object, open(path_of_filtered_fasta_file, "w") as filtered_file_object:
+        lines_of_contig  = None # Header and sequence lines of the current contig.
+        length_of_contig = 0
+        number_of_N      = 0
+        for line in file_object:
+            if line.startswith(">"):
+                if lines_of_contig is not None:
+                    write_or_remove_contig(lines_of_contig, length_of_contig, number_of_N)
+                lines_of_contig  = [line]
+                length_of_contig = 0
+                number_of_N      = 0
+            elif lines_of_contig is not None:
+                sequence          = line.strip()
+                length_of_contig += len(sequence)
+                number_of_N      += sequence.count("N") + sequence.count("n")
+                lines_of_contig.append(line)
+        if lines_of_contig is not None:
+            write_or_remove_contig(lines_of_contig, length_of_contig, number_of_N)
+
+    return summary
+# # -----------Filter contigs of a FASTA file-----------------------
+
+
+# # -----------Write summary of pre-filter for all FASTA files-----------------------
+def write_summary_of_contig_prefilter(summaries, path_of_summary_file, min_length_of_contig, max_fraction_of_N_in_contig):
+    """
+    Write a summary (tab-separated) of the contigs and bp removed by the pre-filter for each FASTA file (i.e. each sample).
+
+    Parameters
+    ----------
+    summaries                       : list of dict of {str : int or str}
+        Summary of pre-filter for each FASTA file (see function "filter_contigs_of_fasta_file" above).
+    path_of_summary_file            : str
+        Path of summary file.
+    min_length_of_contig            : int
+        Minimum length of a contig (in bp) used for filtering.
+    max_fraction_of_N_in_contig     : float
+        Maximum fraction of ambiguous nucleotides ("N") in a contig used for filtering.
+
+    Returns
+    -------
+    None.
+
+    Output files
+    ------------
+    A summary file (.tsv) with one row for each FASTA file.
+    """
+    create.create_directory_if_not_exists(os.path.dirname(path_of_summary_file))
+    columns = [ "Name of file", "Contigs (all)", "bp (all)", "Contigs removed (too short)", "bp removed (too short)", "Contigs removed (too many N)", "bp removed (too many N)" ]
+
+    with open(path_of_summary_file, "w") as file_object:
+        file_object.write("# Minimum length of contig (in bp) = " + str(min_length_of_contig) + ", maximum fraction of N in contig = " + str(max_fraction_of_N_in_contig) + "\n")
+        file_object.write("\t".join(columns) + "\n")
+        for summary in summaries:
+            file_object.write("\t".join(str(summary[column]) for column in columns) + "\n")
+# # -----------Write summary of pre-filter for all FASTA files-----------------------
@@ -1,27 +1,50 @@
-''' This module runs the program antiSMASH. For this, it requires the installation of the program antiSMASH in the specified directory for third-party programs ("thirdparty_programs"). '''
+''' This module runs the program antiSMASH. For this, it requires the installation of the program antiSMASH in the specified directory for third-party programs ("thirdparty_programs").
+    Several antiSMASH runs can also be executed at the same time in a pool of workers (see function "run_antismash_for_all_jobs" below), optionally the largest input files first and only as many at the same time as fit into a memory budget,
+    and optionally in running containers of antiSMASH ("warm workers", see module "antismash_workers.py"). '''
 
 
 import os
+import time
+import queue
+import contextvars
+from   concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import create
 import names_and_paths
+import side_options
+import run_manifest
+import archive_input
+import input_parameters
+import run_process
+import antismash_workers
 
 
-def run_antismash(path_of_inputfile, path_of_antismash_output_directory):
+antismash_options = [ "--genefinding-tool", "prodigal" ] # Options (flags) that are passed to antiSMASH in every run. Note: these options are also part of the key for the cache of antiSMASH results (see module "antismash_cache.py"), so that results created with different options are never mixed up.
+
+
+def run_antismash(path_of_inputfile, path_of_antismash_output_directory, number_of_cpus=None, path_of_log_file=None, worker=None):
     """
     Run program antiSMASH for one given input file.
 
     Parameters
     ----------
-    path_of_inputfile : str
+    path_of_inputfile                   : str
         Path of one input file for antiSMASH (e.g. a .fasta file).
+    path_of_antismash_output_directory  : str
+        Path of directory that will contain antiSMASH-output for input file.
+    number_of_cpus                      : int or None
+        Number of CPUs that antiSMASH may use for this run. If None, antiSMASH uses its default.
+    path_of_log_file                    : str or None
+        Path of log file with output of antiSMASH. None: file (.log) with name of antiSMASH-output directory in directory "logs/antiSMASH".
+    worker                              : dict or None
+        Warm worker (running container of antiSMASH, see module "antismash_workers.py") in which antiSMASH is run with "docker exec". None (or if input file or output directory is not visible in container of worker): antiSMASH is run with its run file (in a new container).
 
     Returns
     -------
-    1
-        If antiSMASH was successfully executed for file.
+    result_of_run : dict
+        Exit code of antiSMASH run (0 if antiSMASH was successfully executed for file, another number if antiSMASH failed, e.g. due to incorrect input file or timeout), number of attempts, duration, CPU time, peak RSS and path of log file (see module "run_process.py").
     None
-        If antiSMASH fails to run, e.g. incorrect input file.
+        If antiSMASH cannot be found.
 
     Output folder
     -------------
@@ -36,15 +59,163 @@ def run_antismash(path_of_inputfile, path_of_antismash_output_directory):
     # # -----------Checkpoint: check if program antiSMASH can be found-----------
     if not os.path.exists(path_of_antismash_runfile):
         print("\n\n\n>>> Cannot find antiSMASH in directory \"" + names_and_paths.name_of_directory_of_thirdparty_programs + "\"! Please run setup again! Task terminated!")
-        return 0
+        return None
     # # -----------Checkpoint: check if program antiSMASH can be found-----------
 
     # # -----------Prepare running command-----------------------
-    command = path_of_antismash_runfile + " " + path_of_inputfile + " " + path_of_antismash_output_directory + " " + "--genefinding-tool" + " " + "prodigal" # Prepare running command.
+    options_of_run = antismash_options + ([ "--cpus", str(number_of_cpus) ] if number_of_cpus else []) # Limit number of CPUs used by this antiSMASH run (e.g. when several antiSMASH runs are executed at the same time).
+    if worker is not None and antismash_workers.can_run_in_antismash_worker(worker, path_of_inputfile, path_of_antismash_output_directory):
+        arguments = antismash_workers.make_arguments_for_antismash_worker(worker, path_of_inputfile, path_of_antismash_output_directory, options_of_run) # Run antiSMASH in running container of worker (no start of a new container).
+    else:
+        arguments = [ path_of_antismash_runfile, path_of_inputfile, path_of_antismash_output_directory ] + options_of_run # Prepare running command (a list of arguments, so that paths with spaces need no quotes).
+    if path_of_log_file is None:
+        path_of_log_file = names_and_paths.path_of_directory_of_logs + "antiSMASH/" + os.path.relpath(path_of_antismash_output_directory, names_and_paths.path_of_directory_of_output_from_antismash).replace("/", "__") + ".log" # Note: also a unique name for the output directory of a shard.
     # # -----------Prepare running command-----------------------
 
     # # -----------Run antiSMASH-----------------------
-    os.system(command)
+    result_of_run = run_process.run_process( arguments, path_of_log_file, \
+                                             wall_clock_timeout_in_s = input_parameters.wall_clock_timeout_of_antismash_run_in_s, \
+                                             idle_timeout_in_s       = input_parameters.idle_timeout_of_antismash_run_in_s, \
+                                             number_of_retries       = input_parameters.number_of_retries_of_external_programs, \
+                                             backoff_in_s            = input_parameters.backoff_of_retries_of_external_programs_in_s, \
+                                             exit_codes_for_retry    = input_parameters.exit_codes_for_retry_of_external_programs, \
+                                             print_output            = side_options.print_output_of_external_programs )
     # # -----------Run antiSMASH-----------------------
 
-    return 1 # To count number of antiSMASH runs.
+    return result_of_run
+
+
+# # -----------Estimate size and memory of antiSMASH jobs-----------------------
+def estimate_size_of_job(job):
+    return archive_input.stat_of_file(job["Path of input file"])[0] # Size of input file (in bytes, about the number of bp), as run time and memory of antiSMASH grow with the length of its input.
+
+
+def estimate_memory_of_job(job):
+    return input_parameters.memory_per_antismash_job_in_GB + input_parameters.memory_per_Mbp_of_antismash_input_in_GB * estimate_size_of_job(job) / 1e6 # Estimated memory (in GB) of antiSMASH run.
+
+
+def get_memory_budget_of_antismash_jobs():
+    if input_parameters.memory_budget_of_antismash_jobs_in_GB > 0:
+        return input_parameters.memory_budget_of_antismash_jobs_in_GB
+    return 0.8 * os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1e9 # 80 % of the memory of the machine (in GB).
+# # -----------Estimate size and memory of antiSMASH jobs-----------------------
+
+
+# # -----------Run antiSMASH for all given jobs, one after another or several at the same time-----------------------
+def run_all_jobs(jobs, run_job, number_of_parallel_jobs, memory_budget_in_GB): # Execute all jobs with function "run_job", one after another or several at the same time (see function "run_antismash_for_all_jobs" below), and return their exit codes.
+    exit_codes = []
+
+    if memory_budget_in_GB is not None:
+        jobs = sorted(jobs, key = estimate_size_of_job, reverse = True) # Largest job first.
+
+    if number_of_parallel_jobs <= 1:
+        for job in jobs:
+            exit_codes.append(run_job(job))
+    elif memory_budget_in_GB is not None:
+        pending_jobs    = [ (job, estimate_memory_of_job(job)) for job in jobs ]
+        running_jobs    = {} # Key = future of job, value = estimated memory of job.
+        memory_in_use   = 0.0
+        with ThreadPoolExecutor(max_workers = number_of_parallel_jobs) as pool:
+            while len(pending_jobs) > 0 or len(running_jobs) > 0:
+                while len(running_jobs) < number_of_parallel_jobs and len(pending_jobs) > 0: # Start the largest pending jobs that fit into the memory budget.
+                    index_of_job = next( (index for index, (job, memory_of_job) in enumerate(pending_jobs) if memory_in_use + memory_of_job <= memory_budget_in_GB or len(running_jobs) == 0), None ) # Note: a job that is larger than the whole budget is started when no other job is running.
+                    if index_of_job is None:
+                        break # No pending job fits into the budget: wait until a running job is finished.
+                    job, memory_of_job = pending_jobs.pop(index_of_job)
+                    running_jobs[pool.submit(contextvars.copy_context().run, run_job, job)] = memory_of_job # Note: the context is copied here and not in the worker (see below).
+                    memory_in_use     += memory_of_job
+
+                finished_futures, _ = wait(running_jobs, return_when = FIRST_COMPLETED)
+                for future in finished_futures:
+                    memory_in_use -= running_jobs.pop(future)
+                    exit_codes.append(future.result())
+    else:
+        with ThreadPoolExecutor(max_workers = number_of_parallel_jobs) as pool: # Note: threads (not processes) suffice here, as each worker only waits for its antiSMASH run (an external program) to finish.
+            futures    = [ pool.submit(contextvars.copy_context().run, run_job, job) for job in jobs ] # Note: each job runs in the workspace of this run (see module "names_and_paths.py"), as the context is copied here and not in the worker.
+            exit_codes = [ future.result() for future in futures ]
+
+    return exit_codes
+
+
+def run_antismash_for_all_jobs(jobs, number_of_parallel_jobs=1, number_of_cpus_per_job=None, manifest=None, callback_for_finished_job=None, memory_budget_in_GB=None, use_warm_workers=False):
+    """
+    Run program antiSMASH for all given jobs, using a pool of workers that each execute one antiSMASH run at a time.
+
+    Parameters
+    ----------
+    jobs                        : list of dict of {str : str}
+        Each job contains "Path of input file", "Path of output directory" (antiSMASH-output directory for input file, should already be unique), "Name of input file", "Key of input" (key of input in run manifest) and optionally "Path of original input file" (e.g. the unsplit input file of a shard).
+    number_of_parallel_jobs     : int
+        Number of antiSMASH runs that are executed at the same time. With 1, all jobs are executed one after another (in the given order).
+    number_of_cpus_per_job      : int or None
+        Number of CPUs that each antiSMASH run may use. If None, antiSMASH uses its default.
+    manifest                    : dict or None
+        Run manifest of task 1 (see module "run_manifest.py"), in which state, exit code, duration and output path of each job are recorded.
+    callback_for_finished_job   : function or None
+        Function that is called with the job and its exit code as soon as the job is finished (e.g. to start BGC-selection for its output, see function "PIPELINE" in module "start_and_command.py"). Note: with several jobs at the same time, it is called by the worker that executed the job.
+    memory_budget_in_GB         : float or None
+        Maximum total estimated memory (in GB, see function "estimate_memory_of_job" above) of all antiSMASH runs at the same time: the jobs are then started in the order of their size (largest input file first, so that no large job is left over at the end), each as soon as it fits into the budget (a job that is larger than the budget runs alone).
+        None: jobs are started in the given order, only limited by "number_of_parallel_jobs".
+    use_warm_workers            : bool
+        True: keep "number_of_parallel_jobs" containers of antiSMASH running while all jobs are executed, and run antiSMASH for each job in a free container (see module "antismash_workers.py"), instead of starting a new container for each job.
+
+    Returns
+    -------
+    number_of_antismash_runs        : int
+        Number of successful antiSMASH runs.
+    number_of_failed_antismash_runs : int
+        Number of failed antiSMASH runs.
+
+    Output folders
+    --------------
+    For each job, a folder that contains results of antiSMASH for input file of job.
+    """
+    # # -----------Run antiSMASH for one job-----------------------
+    def run_job(job):
+        if side_options.verbose == True: print("\n\n\n> Running antiSMASH for file \"" + job["Name of input file"] + "\"...")
+        if manifest is not None:
+            run_manifest.update_entry_of_run_manifest(manifest, job["Key of input"], { "State" : "running", "Output path" : job["Path of output directory"] }, job.get("Path of original input file", job["Path of input file"])) # Note: for a shard of a large input file, the state is bound to the (unsplit) input file.
+
+        start_of_job      = time.time()
+        path_of_inputfile = archive_input.materialise_file(job["Path of input file"]) # antiSMASH needs a real file: a file in an archive is written to disk only for this run (see module "archive_input.py").
+        worker            = free_workers.get() if free_workers is not None else None # Wait for a free warm worker.
+        try:
+            result_of_run = run_antismash(path_of_inputfile, job["Path of output directory"], number_of_cpus_per_job, worker = worker)
+            if worker is not None and result_of_run is not None and result_of_run["Exit code"] != 0 and antismash_workers.replace_antismash_worker_if_broken(worker, result_of_run):
+                result_of_run = run_antismash(path_of_inputfile, job["Path of output directory"], number_of_cpus_per_job, worker = worker) # Repeat run once in the new container of worker.
+        finally:
+            if worker is not None:
+                free_workers.put(worker)
+            archive_input.remove_materialised_file(job["Path of input file"], path_of_inputfile)
+        duration          = time.time() - start_of_job
+        exit_code         = result_of_run["Exit code"] if result_of_run is not None else None
+
+        if manifest is not None:
+            run_manifest.update_entry_of_run_manifest(manifest, job["Key of input"], dict({ "State" : "done" if exit_code == 0 else "failed", "Exit code" : exit_code, "Duration (in s)" : round(duration, 1) }, **run_process.fields_for_run_manifest(result_of_run)))
+        if exit_code != 0:
+            print("\n> antiSMASH failed for file \"" + job["Name of input file"] + "\" (exit code = " + str(exit_code) + (", see log file \"" + result_of_run["Path of log file"] + "\"" if result_of_run is not None else "") + ")!")
+        if callback_for_finished_job is not None:
+            callback_for_finished_job(job, exit_code)
+        return exit_code
+    # # -----------Run antiSMASH for one job-----------------------
+
+    free_workers = None # Queue of warm workers that do not run antiSMASH at the moment.
+
+    if use_warm_workers == True and len(jobs) > 0:
+        workers = antismash_workers.start_pool_of_antismash_workers(max(1, number_of_parallel_jobs))
+        if workers is not None:
+            free_workers = queue.Queue()
+            for worker in workers:
+                free_workers.put(worker)
+
+    try:
+        exit_codes = run_all_jobs(jobs, run_job, number_of_parallel_jobs, memory_budget_in_GB)
+    finally:
+        if free_workers is not None:
+            antismash_workers.stop_pool_of_antismash_workers(workers)
+
+    number_of_antismash_runs        = exit_codes.count(0)
+    number_of_failed_antismash_runs = len(exit_codes) - number_of_antismash_runs
+
+    return number_of_antismash_runs, number_of_failed_antismash_runs
+# # -----------Run antiSMASH for all given jobs, one after another or several at the same time-----------------------
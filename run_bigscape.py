@@ -9,16 +9,60 @@ import shutil
 import create
 import names_and_paths
 import side_options
+import link_or_copy
+import archive_input
+import bigscape_cache
+import input_parameters
+import run_process
 
 
-def run_bigscape(inputpaths, cutoffs=False):
+# # -----------Create an input directory (temporary) for BiGSCAPE and copy given input files to it-----------
+def stage_input_files_for_bigscape(inputpaths):
+    """
+    Create the input directory (temporary) for BiGSCAPE and put all given input files into it (see module "link_or_copy.py"), e.g. once for several runs of BiGSCAPE with the same input files.
+
+    Parameters
+    ----------
+    inputpaths : list of str
+        Paths of Genbank (.gbk) files, each contains only one BGC.
+
+    Returns
+    -------
+    path_of_input_directory_for_bigscape : str
+        Path of input directory for BiGSCAPE.
+    """
+    path_of_input_directory_for_bigscape = create.create_directory_if_not_exists(names_and_paths.path_of_directory_of_input_for_bigscape) # Create a temporary directory that contains only input files for BiGSCAPE (contains only Genbank input files but e.g. no folders). This directory will be removed after running BiGSCAPE (to avoid size of parent directory increasing quickly).
+
+    for path_of_inputfile in inputpaths:
+        name_of_inputfile = archive_input.name_of_file(path_of_inputfile) # Note: for a file in an archive, the name of the file in archive (never with "::").
+        link_or_copy.link_or_copy_file(path_of_inputfile, os.path.join(path_of_input_directory_for_bigscape, name_of_inputfile), input_parameters.mode_of_materialisation_of_files, allow_symlink = False) # Note: input file can also be in an archive (see module "archive_input.py"). Symbolic links are not used here, as BiGSCAPE (in docker) cannot follow them out of its input directory.
+
+    return path_of_input_directory_for_bigscape
+# # -----------Create an input directory (temporary) for BiGSCAPE and copy given input files to it-----------
+
+
+def run_bigscape(inputpaths, cutoffs=False, analyze_with_BGCs_from_MIBiG=None, path_of_output_directory_from_bigscape=None, path_of_staged_input_directory=None, path_of_output_directory_of_earlier_run=None, paths_of_reference_BGCs=None, result_of_run=None):
     """
     Run program BiGSCAPE for given input file(s).
 
     Parameters
     ----------
-    inputpaths : str
-        Path of the directory that contains all input file(s) for BiGSCAPE (also path of output directory of task 2).
+    inputpaths                              : list of str
+        Paths of Genbank (.gbk) files of query BGCs (e.g. files in output directory of task 2).
+    cutoffs                                 : str or False
+        Value(s) for flag "--cutoffs" of BiGSCAPE, separated by whitespace (BiGSCAPE calculates the distances between BGCs once and groups BGCs into families for each value). False: default value of BiGSCAPE.
+    analyze_with_BGCs_from_MIBiG            : bool or None
+        True: add flag "--mibig". None: as given by option "analyze_query_BGCs_with_BGCs_from_MIBiG" in module "side_options.py".
+    path_of_output_directory_from_bigscape  : str or None
+        Path of BiGSCAPE-output directory. None: directory "output_from_BiGSCAPE".
+    path_of_staged_input_directory          : str or None
+        Path of an input directory that already contains all input files (see function "stage_input_files_for_bigscape" above), which is then not removed after running BiGSCAPE (e.g. for several runs with the same input files). None: create (and remove) the input directory here.
+    path_of_output_directory_of_earlier_run : str or None
+        Path of BiGSCAPE-output directory of an earlier run with the same query BGCs, whose intermediate results (e.g. predicted domains) are reused, so that the domains of no BGC are predicted again.
+    paths_of_reference_BGCs                 : list of str or None
+        Paths of Genbank files of the nearest BGCs from MIBiG of the query BGCs (see module "MIBiG_reference_index.py"), which are analyzed instead of all BGCs from MIBiG (only if BGCs from MIBiG are analyzed). None: all BGCs from MIBiG (flag "--mibig").
+    result_of_run                           : dict or None
+        If given, this dictionary is filled with number of attempts, CPU time, peak RSS and path of log file of the run of BiGSCAPE (see module "run_process.py"), e.g. for the run manifest of task 3.
 
     Input files
     -----------
@@ -26,10 +70,10 @@ def run_bigscape(inputpaths, cutoffs=False):
 
     Returns
     -------
-    True
-        If BiGSCAPE was successfully executed.
+    path_of_output_directory_from_bigscape : str
+        Path of BiGSCAPE-output directory, if BiGSCAPE was successfully executed (i.e. with exit code 0).
     False
-        If the program BiGSCAPE could not be found in directory "thirdparty_programs" or could not be run or a BiGSCAPE-output directory already exists.
+        If the program BiGSCAPE could not be found in directory "thirdparty_programs" or could not be run or failed or a BiGSCAPE-output directory already exists.
 
     Output folder
     -------------
@@ -37,16 +81,17 @@ def run_bigscape(inputpaths, cutoffs=False):
     """
     # # -----------Define paths-----------------------
     path_of_bigscape_runfile                = names_and_paths.path_of_directory_of_thirdparty_programs + "run_bigscape" # Path of run file of BiGSCAPE.
-    path_of_output_directory_from_bigscape  = names_and_paths.path_of_directory_of_output_from_bigscape
+    if path_of_output_directory_from_bigscape is None:
+        path_of_output_directory_from_bigscape = names_and_paths.path_of_directory_of_output_from_bigscape
+    if analyze_with_BGCs_from_MIBiG is None:
+        analyze_with_BGCs_from_MIBiG = side_options.analyze_query_BGCs_with_BGCs_from_MIBiG
     # # -----------Define paths-----------------------
 
     # # -----------Checkpoint: check if BiGSCAPE can be found and run-----------
     if os.path.exists(path_of_bigscape_runfile):
-        try:
-            print("\n\n\n")
-            os.system(path_of_bigscape_runfile) # Test running BiGSCAPE without argument (this will only print out all available running options of BiGSCAPE).
-        except:
-            print("\n\n\n>>> Cannot run BiG-SCAPE CORASON! Please run setup again! Task terminated!\n\n")
+        result_of_test_run = run_process.run_process([ path_of_bigscape_runfile ], names_and_paths.path_of_directory_of_logs + "BiG-SCAPE/test_run.log", wall_clock_timeout_in_s = input_parameters.wall_clock_timeout_of_bigscape_run_in_s, idle_timeout_in_s = input_parameters.idle_timeout_of_bigscape_run_in_s, print_output = side_options.print_output_of_external_programs) # Test running BiGSCAPE without argument (this will only print out all available running options of BiGSCAPE).
+        if result_of_test_run["Exit code"] in [ run_process.exit_code_of_program_not_run, run_process.exit_code_of_timeout ]:
+            print("\n\n\n>>> Cannot run BiG-SCAPE CORASON (see log file \"" + result_of_test_run["Path of log file"] + "\")! Please run setup again! Task terminated!\n\n")
             return False
     else:
         print("\n\n\n>>> Cannot find BiG-SCAPE CORASON in directory \"" + names_and_paths.name_of_directory_of_thirdparty_programs + "\"! Please run setup again! Task terminated!\n\n")
@@ -54,39 +99,82 @@ def run_bigscape(inputpaths, cutoffs=False):
     # # -----------Checkpoint: check if BiGSCAPE can be found and run-----------
 
     # # -----------Create an input directory (temporary) for BiGSCAPE and copy given input files to it-----------
-    path_of_input_directory_for_bigscape = create.create_directory_if_not_exists(names_and_paths.path_of_directory_of_input_for_bigscape) # Create a temporary directory that contains only input files for BiGSCAPE (contains only Genbank input files but e.g. no folders). This directory will be removed after running BiGSCAPE (to avoid size of parent directory increasing quickly).
-
-    for path_of_inputfile in inputpaths:
-        name_of_inputfile = path_of_inputfile.split("/")[-1]
-        shutil.copyfile(path_of_inputfile, os.path.join(path_of_input_directory_for_bigscape, name_of_inputfile))
+    if path_of_staged_input_directory is None:
+        path_of_input_directory_for_bigscape = stage_input_files_for_bigscape(inputpaths)
+    else:
+        path_of_input_directory_for_bigscape = path_of_staged_input_directory # Input files were already put into this directory (e.g. for several runs of BiGSCAPE).
     # # -----------Create an input directory (temporary) for BiGSCAPE and copy given input files to it-----------
 
     # # -----------Checkpoint: rename output if another BiGSCAPE-output folder already exists with same path-----------------------
     if os.path.isdir(path_of_output_directory_from_bigscape) and len(os.listdir(path_of_output_directory_from_bigscape)) != 0: # In case a nonempty directory containing results (e.g. created from last run) already exists:
         if side_options.rename_output_if_name_collides == True:
-            path_of_output_directory_from_bigscape = path_of_output_directory_from_bigscape.replace(names_and_paths.name_of_output_directory_from_bigscape, names_and_paths.name_of_output_directory_from_bigscape + "__renamed") # Add suffix "__renamed" to name of BiGSCAPE-output directory that will be created.
+            path_of_output_directory_from_bigscape = path_of_output_directory_from_bigscape.rstrip("/") + "__renamed/" # Add suffix "__renamed" to name of BiGSCAPE-output directory that will be created.
             while os.path.isdir(path_of_output_directory_from_bigscape) and len(os.listdir(path_of_output_directory_from_bigscape)) != 0:
                 path_of_output_directory_from_bigscape = re.sub("__renamed/?$", "___renamed/", path_of_output_directory_from_bigscape) # Rename path of BiGSCAPE-output directory until path is unique or is an empty directory. Note: the existing directory that contains BiGSCAPE results (e.g. from last run) will not be removed.
         else:
             print("\n\n\n>>> A nonempty output directory from BiG-SCAPE CORASON already exists! Task terminated!\n\n")
+            if path_of_staged_input_directory is None:
+                shutil.rmtree(path_of_input_directory_for_bigscape)
             return False
     # # -----------Checkpoint: rename output if another BiGSCAPE-output folder already exists with same path-----------------------
 
+    # # -----------Optional: put nearest BGCs from MIBiG into input directory (instead of analyzing all BGCs from MIBiG)-----------------------
+    names_of_reference_files = [] # Names of files of BGCs from MIBiG in input directory.
+    if paths_of_reference_BGCs is not None and analyze_with_BGCs_from_MIBiG == True:
+        for path_of_reference_file in paths_of_reference_BGCs:
+            name_of_reference_file = archive_input.name_of_file(path_of_reference_file) # Note: for a file in an archive, the name of the file in archive (never with "::").
+            if not os.path.exists(os.path.join(path_of_input_directory_for_bigscape, name_of_reference_file)):
+                link_or_copy.link_or_copy_file(path_of_reference_file, os.path.join(path_of_input_directory_for_bigscape, name_of_reference_file), input_parameters.mode_of_materialisation_of_files, allow_symlink = False) # Note: the Genbank files of MIBiG can also be in an archive.
+                names_of_reference_files.append(name_of_reference_file)
+    # # -----------Optional: put nearest BGCs from MIBiG into input directory (instead of analyzing all BGCs from MIBiG)-----------------------
+
+    # # -----------Optional: reuse intermediate results of BGCs (e.g. predicted domains) from cache of BiGSCAPE-----------------------
+    if side_options.keep_cache_of_BiGSCAPE_for_incremental_clustering == True:
+        fingerprints_of_BGCs      = bigscape_cache.make_fingerprints_of_query_BGCs(inputpaths)
+        number_of_BGCs_from_cache = bigscape_cache.restore_intermediate_results_from_cache(fingerprints_of_BGCs, path_of_output_directory_from_bigscape)
+        if side_options.verbose == True: print("\n> Reused intermediate results of " + str(number_of_BGCs_from_cache) + " BGC(s) from directory \"" + names_and_paths.name_of_directory_of_cache_of_bigscape + "\" (only the domains of new or changed BGCs are predicted).")
+    # # -----------Optional: reuse intermediate results of BGCs (e.g. predicted domains) from cache of BiGSCAPE-----------------------
+
+    # # -----------Optional: reuse intermediate results of BGCs (e.g. predicted domains) from an earlier run with the same query BGCs-----------------------
+    if path_of_output_directory_of_earlier_run is not None:
+        names_of_query_BGCs = None if analyze_with_BGCs_from_MIBiG == True else { name_of_inputfile.removesuffix(".gbk") for name_of_inputfile in os.listdir(path_of_input_directory_for_bigscape) } # Note: intermediate results of BGCs from MIBiG are only reused if BGCs from MIBiG are analyzed.
+        bigscape_cache.copy_intermediate_results_of_earlier_run(path_of_output_directory_of_earlier_run, path_of_output_directory_from_bigscape, names_of_query_BGCs)
+    # # -----------Optional: reuse intermediate results of BGCs (e.g. predicted domains) from an earlier run with the same query BGCs-----------------------
+
     # # -----------Prepare running command-----------------------
-    command = path_of_bigscape_runfile + " " + path_of_input_directory_for_bigscape + " " + path_of_output_directory_from_bigscape + " --include_gbk_str *" # Make command line (a string) to pipe into terminal and run BiGSCAPE. IMPORTANT: "--include_gbk_str *" in the command line allows BiGSCAPE to analyze all (.gbk) files in the input directory (so that no file will be left out).
+    arguments = [ path_of_bigscape_runfile, path_of_input_directory_for_bigscape, path_of_output_directory_from_bigscape, "--include_gbk_str", "*" ] # Make running command (a list of arguments, no shell) to run BiGSCAPE. IMPORTANT: "--include_gbk_str *" allows BiGSCAPE to analyze all (.gbk) files in the input directory (so that no file will be left out).
     if cutoffs:
-        command += " --cutoffs " + str(cutoffs)     # Add this flag if user has provided value(s) for the parameter "cutoffs". Otherwise, this flag will not be added and BiGSCAPE will analyze with default value c = 0.3.
-    if side_options.analyze_query_BGCs_with_BGCs_from_MIBiG == True:
-        command += " --mibig"                       # Add flag if to use mibig database.
+        arguments += [ "--cutoffs" ] + str(cutoffs).split() # Add this flag if user has provided value(s) for the parameter "cutoffs". Otherwise, this flag will not be added and BiGSCAPE will analyze with default value c = 0.3.
+    if analyze_with_BGCs_from_MIBiG == True and paths_of_reference_BGCs is None:
+        arguments += [ "--mibig" ]                      # Add flag if to use mibig database (otherwise, only the nearest BGCs from MIBiG are in the input directory).
     # Note: do not use if...elif... block. This would allow only one flag to be used at maximum.
     # # -----------Prepare running command-----------------------
 
     # # -----------Run BiGSCAPE-----------------------
-    os.chdir(path_of_input_directory_for_bigscape) # IMPORTANT!!! This allows "--include_gbk_str *" in the running command ("command") to actually refer to all files of selected BGCs in this directory (i.e. BiGSCAPE will analyze all given files of selected BGCs).
-    os.system(command)
-    os.chdir(names_and_paths.common_path) # Change back to main/common directory e.g. for next execution of pipeline.
-
-    shutil.rmtree(path_of_input_directory_for_bigscape) # Remove input directory, as this is no longer needed after execution of task.
+    result_of_bigscape_run = run_process.run_process( arguments, names_and_paths.path_of_directory_of_logs + "BiG-SCAPE/" + os.path.relpath(path_of_output_directory_from_bigscape, names_and_paths.common_path).replace("/", "__") + ".log", \
+                                                      path_of_working_directory = path_of_input_directory_for_bigscape, \
+                                                      wall_clock_timeout_in_s   = input_parameters.wall_clock_timeout_of_bigscape_run_in_s, \
+                                                      idle_timeout_in_s         = input_parameters.idle_timeout_of_bigscape_run_in_s, \
+                                                      number_of_retries         = input_parameters.number_of_retries_of_external_programs, \
+                                                      backoff_in_s              = input_parameters.backoff_of_retries_of_external_programs_in_s, \
+                                                      exit_codes_for_retry      = input_parameters.exit_codes_for_retry_of_external_programs, \
+                                                      print_output              = side_options.print_output_of_external_programs ) # IMPORTANT!!! The command runs in the input directory, so that "*" also refers to all files of selected BGCs in this directory if the run file of BiGSCAPE expands it. Note: only the command runs there, the working directory of the pipeline (shared by all threads) is not changed.
+    exit_code = result_of_bigscape_run["Exit code"]
+    if result_of_run is not None:
+        result_of_run.update(result_of_bigscape_run)
+
+    if path_of_staged_input_directory is None:
+        shutil.rmtree(path_of_input_directory_for_bigscape) # Remove input directory, as this is no longer needed after execution of task. Note: a staged input directory is removed by the caller after its last run.
+    else:
+        for name_of_reference_file in names_of_reference_files:
+            os.remove(os.path.join(path_of_input_directory_for_bigscape, name_of_reference_file)) # Staged input directory only keeps the query BGCs for the next runs.
     # # -----------Run BiGSCAPE-----------------------
 
-    return True
+    if exit_code != 0:
+        print("\n\n\n>>> BiG-SCAPE CORASON failed (exit code = " + str(exit_code) + ", see log file \"" + result_of_bigscape_run["Path of log file"] + "\")!\n\n")
+        return False
+
+    if side_options.keep_cache_of_BiGSCAPE_for_incremental_clustering == True:
+        bigscape_cache.store_intermediate_results_in_cache(fingerprints_of_BGCs, path_of_output_directory_from_bigscape) # Only intermediate results of a successful run are kept.
+
+    return path_of_output_directory_from_bigscape
@@ -0,0 +1,182 @@
+''' This module keeps a persistent "run manifest" for each task of the pipeline, i.e. a file (.json) in directory "run_manifests" that records for each input of the task its state ("pending", "running", "done" or "failed"), exit code, duration and output path.
+    The manifest is saved after every change of state, so that after an interruption of the pipeline (e.g. crash of docker, reboot of machine) it is known which inputs are already done, and the next run of the task only needs to process the unfinished inputs. '''
+
+
+import os
+import re
+import json
+import time
+import threading
+
+import create
+import names_and_paths
+import archive_input
+
+
+lock_of_run_manifests                   = threading.RLock() # Prevents that two workers (e.g. several antiSMASH runs at the same time) change and save a manifest at the same time.
+minimum_interval_between_saves          = 5.0   # Minimum time (in s) between two saves of a manifest, unless a save is requested at once (saving a manifest with many entries, e.g. for hundreds of thousands of BGCs in task 2, after every change would take too long).
+times_of_last_saves_of_run_manifests    = {}    # Time of last save for each manifest (key = path of manifest, as several runs in one process each have their own manifests).
+
+
+# # -----------Load run manifest of a task-----------------------
+def load_run_manifest(name_of_task, parameters=None):
+    """
+    Load the run manifest of a given task (or make a new, empty manifest if there is none yet or if it was made with different parameters).
+
+    Parameters
+    ----------
+    name_of_task    : str
+        Name of task, e.g. "task_1".
+    parameters      : dict or None
+        Parameters of task that influence its results (e.g. selection parameters of task 2). Entries of a manifest made with different parameters are not reused.
+
+    Returns
+    -------
+    manifest : dict
+        Run manifest of task: {"Name of task": ..., "Parameters": ..., "Entries": {key of input: entry of input}}.
+    """
+    path_of_manifest = path_of_run_manifest(name_of_task)
+    manifest         = { "Name of task" : name_of_task, "Path of manifest" : path_of_manifest, "Parameters" : parameters, "Entries" : {} } # Note: the path is kept, so that the manifest is always saved in the workspace of its run (see module "names_and_paths.py").
+
+    if os.path.isfile(path_of_manifest):
+        try:
+            with open(path_of_manifest, "r") as file_object:
+                saved_manifest = json.load(file_object)
+            if saved_manifest.get("Parameters") == parameters:
+                manifest["Entries"] = saved_manifest.get("Entries", {})
+        except (OSError, ValueError):
+            pass # Start with an empty manifest if the saved manifest cannot be read (e.g. if it was only partly written).
+
+    return manifest
+# # -----------Load run manifest of a task-----------------------
+
+
+# # -----------Save run manifest of a task-----------------------
+def save_run_manifest(manifest):
+    """
+    Save a run manifest to its file (the file is replaced at once, so that it is never only partly written).
+
+    Parameters
+    ----------
+    manifest : dict
+        Run manifest of a task.
+
+    Returns
+    -------
+    None.
+
+    Output files
+    ------------
+    A file (.json) for the manifest in directory "run_manifests".
+    """
+    with lock_of_run_manifests:
+        path_of_manifest           = manifest.get("Path of manifest") or path_of_run_manifest(manifest["Name of task"])
+        create.create_directory_if_not_exists(os.path.dirname(path_of_manifest))
+        path_of_temporary_manifest = path_of_manifest + ".tmp"
+        with open(path_of_temporary_manifest, "w") as file_object:
+            json.dump(manifest, file_object, indent=1)
+        os.replace(path_of_temporary_manifest, path_of_manifest)
+        times_of_last_saves_of_run_manifests[path_of_manifest] = time.time()
+# # -----------Save run manifest of a task-----------------------
+
+
+# # -----------Remove run manifest of a task-----------------------
+def remove_run_manifest(name_of_task):
+    """
+    Remove the run manifest of a given task (e.g. if output of task is cleared).
+
+    Parameters
+    ----------
+    name_of_task : str
+        Name of task, e.g. "task_1".
+
+    Returns
+    -------
+    None.
+    """
+    path_of_manifest = path_of_run_manifest(name_of_task)
+    if os.path.isfile(path_of_manifest):
+        os.remove(path_of_manifest)
+# # -----------Remove run manifest of a task-----------------------
+
+
+# # -----------Update entry of an input in run manifest-----------------------
+def update_entry_of_run_manifest(manifest, key_of_input, fields, path_of_inputfile=None, save_at_once=True):
+    """
+    Update (or add) the entry of an input in a run manifest and save the manifest.
+
+    Parameters
+    ----------
+    manifest            : dict
+        Run manifest of a task.
+    key_of_input        : str
+        Key of input in manifest (e.g. path of input file).
+    fields              : dict of {str : any}
+        Fields of entry to update, e.g. {"State": "done", "Exit code": 0, "Duration (in s)": 12.3, "Output path": "..."}.
+    path_of_inputfile   : str or None
+        Path of input file. If given, size and time of last modification of file are recorded, so that a changed input file is later recognized as unfinished.
+    save_at_once        : bool
+        True: save manifest at once. False: save manifest only if the last save is longer ago than "minimum_interval_between_saves" (the manifest should then be saved at the end with function "save_run_manifest").
+
+    Returns
+    -------
+    None.
+    """
+    with lock_of_run_manifests:
+        entry = manifest["Entries"].setdefault(key_of_input, {})
+        if path_of_inputfile is not None:
+            entry["Fingerprint of input"] = make_fingerprint_of_file(path_of_inputfile)
+        entry.update(fields)
+        if save_at_once or time.time() - times_of_last_saves_of_run_manifests.get(manifest.get("Path of manifest") or path_of_run_manifest(manifest["Name of task"]), 0.0) >= minimum_interval_between_saves:
+            save_run_manifest(manifest)
+# # -----------Update entry of an input in run manifest-----------------------
+
+
+# # -----------Get entry of an input if it is already done-----------------------
+def get_entry_of_completed_input(manifest, key_of_input, path_of_inputfile=None):
+    """
+    Get the entry of an input in a run manifest, if the input is already done (and, if a path of input file is given, the input file has not changed since).
+
+    Parameters
+    ----------
+    manifest            : dict
+        Run manifest of a task.
+    key_of_input        : str
+        Key of input in manifest.
+    path_of_inputfile   : str or None
+        Path of input file.
+
+    Returns
+    -------
+    dict
+        Entry of input, if input is done.
+    None
+        Otherwise.
+    """
+    entry = manifest["Entries"].get(key_of_input)
+    if entry is None or entry.get("State") != "done":
+        return None
+    if path_of_inputfile is not None and entry.get("Fingerprint of input") != make_fingerprint_of_file(path_of_inputfile):
+        return None
+    return entry
+# # -----------Get entry of an input if it is already done-----------------------
+
+
+# # -----------Helper functions-----------------------
+def path_of_run_manifest(name_of_task):
+    return names_and_paths.path_of_directory_of_run_manifests + name_of_task + names_and_paths.suffix_of_names_of_run_manifests
+
+
+def make_fingerprint_of_file(path_of_file):
+    try:
+        return list(archive_input.stat_of_file(path_of_file)) # Size and time of last modification of file (a list, as JSON has no tuples). Note: file can also be in an archive (see module "archive_input.py").
+    except (OSError, KeyError):
+        return None
+
+
+def make_fingerprint_of_inputfiles(inputpaths, paths_of_reference_files = None):
+    fingerprint_of_inputfiles = sorted( [path_of_inputfile] + (make_fingerprint_of_file(re.sub("_+renamed$", "", path_of_inputfile)) or [None, None]) for path_of_inputfile in inputpaths ) # Paths, sizes and times of last modification of all input files (e.g. of BiGSCAPE in task 3, paths can have the suffix "renamed", see module "deduplicate.py"). Note: a file that cannot be found has no size and time, so that the fingerprint never matches a run with this file.
+    if paths_of_reference_files is not None:
+        fingerprint_of_inputfiles.append([ "Reference files" ] + sorted(paths_of_reference_files)) # E.g. nearest BGCs from MIBiG of the query BGCs in task 3, which change with the reference index even if the input files do not.
+    return fingerprint_of_inputfiles
+# # -----------Helper functions-----------------------
@@ -0,0 +1,148 @@
+''' This module runs external programs (e.g. antiSMASH and BiG-SCAPE, which run in docker) as managed processes: the command is given as a list of arguments (no shell), the output (stdout and stderr) of each run is written line by line to a log file,
+    a run is stopped if it takes too long in total ("wall-clock timeout") or does not write any output for too long ("idle timeout", e.g. a hung docker container), a run that failed for a transient reason (e.g. docker could not start the container)
+    is repeated after a waiting time that doubles with each attempt ("backoff"), and the CPU time and peak memory (resident set size, RSS) of each run are recorded. '''
+
+
+import os
+import sys
+import time
+import signal
+import threading
+import subprocess
+from   datetime import datetime
+
+import create
+
+
+exit_code_of_timeout            = 124   # Exit code of a run that was stopped after a timeout (as with command "timeout").
+exit_code_of_program_not_run    = 126   # Exit code if the program could not be started (e.g. no permission to execute it).
+grace_period_after_stop_in_s    = 10    # Time for a stopped run to end after signal SIGTERM (e.g. docker forwards it to its container, so that the container is removed), before it is killed with SIGKILL.
+interval_of_checks_in_s         = 0.2
+
+
+# # -----------Run a process once-----------------------
+def send_signal_to_process_group(process, signal_to_send):
+    try:
+        os.killpg(process.pid, signal_to_send)
+    except ProcessLookupError:
+        pass # All processes of the run have already ended.
+
+
+def run_process_once(arguments, file_object_of_log, path_of_working_directory, wall_clock_timeout_in_s, idle_timeout_in_s, print_output):
+    try:
+        process = subprocess.Popen(arguments, stdout = subprocess.PIPE, stderr = subprocess.STDOUT, stdin = subprocess.DEVNULL, cwd = path_of_working_directory, start_new_session = True) # Note: a new process group, so that all processes of the run (e.g. a shell script and docker) can be stopped together.
+    except OSError as error:
+        file_object_of_log.write(("> Program could not be started: " + str(error) + "\n").encode())
+        return exit_code_of_program_not_run, False, 0.0, 0
+
+    time_of_last_output = [time.time()]
+
+    def copy_output_to_log(): # Stream output line by line to log file (and terminal).
+        for line in process.stdout:
+            time_of_last_output[0] = time.time()
+            try:
+                file_object_of_log.write(line)
+                file_object_of_log.flush()
+            except ValueError:
+                return # Log file was already closed (e.g. output of a remaining subprocess after the end of the run).
+            if print_output == True:
+                sys.stdout.buffer.write(line)
+                sys.stdout.flush()
+
+    thread_of_output = threading.Thread(target = copy_output_to_log, daemon = True)
+    thread_of_output.start()
+
+    # # -----------Wait for end of process (or stop it after a timeout)-----------------------
+    start_of_run = time.time()
+    timed_out    = False
+    while True:
+        pid, wait_status, resource_usage = os.wait4(process.pid, os.WNOHANG) # Note: "os.wait4" also returns the resource usage (CPU time, peak RSS) of the process and all its (waited-for) subprocesses.
+        if pid != 0:
+            break
+        if timed_out == False and ((wall_clock_timeout_in_s > 0 and time.time() - start_of_run > wall_clock_timeout_in_s) or (idle_timeout_in_s > 0 and time.time() - time_of_last_output[0] > idle_timeout_in_s)):
+            timed_out = True
+            file_object_of_log.write(("\n> Run stopped after timeout (" + ("wall-clock" if wall_clock_timeout_in_s > 0 and time.time() - start_of_run > wall_clock_timeout_in_s else "idle") + ")!\n").encode())
+            send_signal_to_process_group(process, signal.SIGTERM)
+            time_of_stop = time.time()
+        if timed_out == True and time.time() - time_of_stop > grace_period_after_stop_in_s:
+            send_signal_to_process_group(process, signal.SIGKILL)
+        time.sleep(interval_of_checks_in_s)
+    # # -----------Wait for end of process (or stop it after a timeout)-----------------------
+
+    process.returncode = os.waitstatus_to_exitcode(wait_status) # Note: the process was already waited for by "os.wait4" above.
+    thread_of_output.join(timeout = grace_period_after_stop_in_s) # Note: a remaining subprocess of the run could still keep the output open.
+    process.stdout.close()
+
+    exit_code = exit_code_of_timeout if timed_out == True else process.returncode
+    return exit_code, timed_out, resource_usage.ru_utime + resource_usage.ru_stime, resource_usage.ru_maxrss # Note: "ru_maxrss" is given in KB (Linux).
+# # -----------Run a process once-----------------------
+
+
+# # -----------Run a process (with retries)-----------------------
+def run_process(arguments, path_of_log_file, path_of_working_directory=None, wall_clock_timeout_in_s=0, idle_timeout_in_s=0, number_of_retries=0, backoff_in_s=30, exit_codes_for_retry=(), print_output=False):
+    """
+    Run an external program and write its output to a log file, with timeouts and retries.
+
+    Parameters
+    ----------
+    arguments                   : list of str
+        Program and its arguments (not a command line for a shell, so that no argument has to be quoted).
+    path_of_log_file            : str
+        Path of log file (output of each run is appended to this file).
+    path_of_working_directory   : str or None
+        Directory in which the program runs. None: working directory of the pipeline.
+    wall_clock_timeout_in_s     : float
+        Maximum time (in s) of a run, 0: no timeout.
+    idle_timeout_in_s           : float
+        Maximum time (in s) of a run without any output, 0: no timeout.
+    number_of_retries           : int
+        Maximum number of repeated runs after a failed run with an exit code in "exit_codes_for_retry".
+    backoff_in_s                : float
+        Waiting time (in s) before the first repeated run (doubles with each further repeated run).
+    exit_codes_for_retry        : list of int
+        Exit codes of transient failures (e.g. 125: docker could not start the container; 124: run stopped after timeout).
+    print_output                : bool
+        True: output of program is also printed to terminal.
+
+    Returns
+    -------
+    result_of_run : dict
+        "Exit code" (of last run; 124 after a timeout, 126 if program could not be started), "Timed out" (of last run), "Number of attempts", "Duration (in s)", "CPU time (in s)" (of all runs),
+        "Peak RSS (in MB)" (of all runs) and "Path of log file". Note: for a program in docker, CPU time and peak RSS are only those of the processes of the pipeline (e.g. docker client), as the container is not a subprocess of the pipeline.
+
+    Output files
+    ------------
+    Log file with the output of all runs.
+    """
+    create.create_directory_if_not_exists(os.path.dirname(path_of_log_file))
+    result_of_run = { "Exit code" : None, "Timed out" : False, "Number of attempts" : 0, "Duration (in s)" : 0.0, "CPU time (in s)" : 0.0, "Peak RSS (in MB)" : 0.0, "Path of log file" : path_of_log_file }
+    start_of_runs = time.time()
+
+    with open(path_of_log_file, "ab") as file_object_of_log:
+        for number_of_attempt in range(1, number_of_retries + 2):
+            file_object_of_log.write(("\n> " + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + " Attempt " + str(number_of_attempt) + ": " + " ".join(arguments) + "\n").encode())
+            exit_code, timed_out, cpu_time, peak_rss = run_process_once(arguments, file_object_of_log, path_of_working_directory, wall_clock_timeout_in_s, idle_timeout_in_s, print_output)
+            file_object_of_log.write(("> Exit code = " + str(exit_code) + "\n").encode())
+
+            result_of_run["Exit code"]           = exit_code
+            result_of_run["Timed out"]           = timed_out
+            result_of_run["Number of attempts"]  = number_of_attempt
+            result_of_run["CPU time (in s)"]    += cpu_time
+            result_of_run["Peak RSS (in MB)"]    = max(result_of_run["Peak RSS (in MB)"], peak_rss / 1024)
+
+            if exit_code == 0 or exit_code not in exit_codes_for_retry or number_of_attempt == number_of_retries + 1:
+                break
+            waiting_time = backoff_in_s * 2**(number_of_attempt - 1)
+            file_object_of_log.write(("> Transient failure, run is repeated in " + str(waiting_time) + " s.\n").encode())
+            file_object_of_log.flush()
+            time.sleep(waiting_time)
+
+    result_of_run["Duration (in s)"]  = round(time.time() - start_of_runs, 1)
+    result_of_run["CPU time (in s)"]  = round(result_of_run["CPU time (in s)"], 1)
+    result_of_run["Peak RSS (in MB)"] = round(result_of_run["Peak RSS (in MB)"], 1)
+    return result_of_run
+
+
+def fields_for_run_manifest(result_of_run):
+    return { name_of_field : result_of_run[name_of_field] for name_of_field in [ "Number of attempts", "CPU time (in s)", "Peak RSS (in MB)", "Path of log file" ] if name_of_field in (result_of_run or {}) } # Statistics of a run that are recorded in the run manifest of a task (see module "run_manifest.py"), none if the program was not run.
+# # -----------Run a process (with retries)-----------------------
@@ -0,0 +1,241 @@
+''' This module runs the BGC-selection (task 2) for Genbank antiSMASH-output files: each file is read and its BGC is assessed (see module "analyze_and_assess.py"), the file is copied to the directory of selected BGCs if the BGC is selected, and the statistics are updated (see module "make_outputfiles_and_stats.py").
+    The files can also be analyzed in parallel by a pool of worker processes (see function "select_BGCs_in_files_in_parallel" below), where each worker analyzes a chunk of files with its own statistics, which are merged at the end,
+    or be assessed all at once from the feature store of BGCs, so that only new or changed files are read (see function "select_BGCs_in_files_with_feature_store" below and module "BGC_feature_store.py"). '''
+
+
+from   concurrent.futures import ProcessPoolExecutor
+
+import side_options
+import names_and_paths
+import run_manifest
+import analyze_and_assess
+import make_outputfiles_and_stats
+import BGC_feature_store
+
+
+# # -----------Select BGC in one file-----------------------
+def select_BGC_in_file(path_of_inputfile, name_of_inputfile, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, BGC_stats, product_stats):
+    """
+    Analyze and assess the BGC in a Genbank (.gbk) file, copy the file to the directory of selected BGCs if the BGC is selected and update statistics.
+
+    Parameters
+    ----------
+    path_of_inputfile                   : str
+        Path of Genbank (.gbk) file.
+    name_of_inputfile                   : str
+        Name of Genbank (.gbk) file (might contain the suffix "renamed" to make it unique among all input files of task 2).
+    param_for_preliminary_selection     : dict of {str : str}
+        Parameter for preliminary selection, i.e. minimum number of core genes.
+    param_for_main_selection            : dict of {str : str}
+        Parameters for main selection, i.e. minimum length of cluster (in bp), minimum distance of each core gene to edges of cluster (in bp) and minimum number of additional biosynthetic genes.
+    param_for_2nd_chance_selection      : dict of {str : str}
+        Parameter for second-chance selection, i.e. minimum number of additional biosynthetic genes.
+    BGC_stats                           : dict of {str : int}
+        Statistics of BGC-selection.
+    product_stats                       : dict of {str : int}
+        Statistics of product(s) of selected BGCs.
+
+    Returns
+    -------
+    result : dict
+        "Selection status", "Info of BGC" and "Output path" (path of copy of file, if BGC was selected) of file. If file does not contain exactly one BGC, all these are None.
+
+    Output files
+    ------------
+    A copy of Genbank (.gbk) file in directory of selected BGCs, if BGC is selected.
+    """
+    features_of_BGC = analyze_and_assess.parse_genbank_file_of_BGC(path_of_inputfile) # Read input file line by line (once) and extract data of BGC.
+
+    if not (features_of_BGC["Number of delimiters btw data of genes and DNA seq"] == 1 and features_of_BGC["Label for file of one BGC found"] == True): # Important: check if input file (.gbk) contains only one BGC (i.e. exactly one "ORIGIN" and the label for file of one BGC, see module "analyze_and_assess.py").
+        return { "Selection status" : None, "Info of BGC" : None, "Output path" : None }
+
+    # # --------------Analysis of BGC------------------
+    info_of_BGC, selection_status_for_BGC = analyze_and_assess.assess_BGC(features_of_BGC, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection) # Assess the BGC in query file (according to input parameters) and return selection result.
+    # # --------------Analysis of BGC------------------
+
+    if side_options.verbose == True: print("> Complete analysis of BGC in file \"" + name_of_inputfile + "\"!")
+
+    # # --------------Copy file of BGC if selected and update statistics------------------
+    path_of_copied_file = make_outputfiles_and_stats.copy_file_of_selected_BGC_and_update_stats(info_of_BGC, selection_status_for_BGC, name_of_inputfile, path_of_inputfile, BGC_stats, product_stats) # Note: "info_of_BGC" contains product of BGC that is needed to update statistics of selected BGCs and their products, if BGC is selected.
+    # # --------------Copy file of BGC if selected and update statistics------------------
+
+    return { "Selection status" : selection_status_for_BGC, "Info of BGC" : info_of_BGC, "Output path" : path_of_copied_file }
+# # -----------Select BGC in one file-----------------------
+
+
+# # -----------Select BGCs in a chunk of files (executed by one worker process)-----------------------
+def select_BGCs_in_chunk_of_files(chunk_of_inputfiles, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection):
+    """
+    Select BGCs in a chunk of Genbank (.gbk) files (see function "select_BGC_in_file" above), with statistics only for this chunk.
+
+    Parameters
+    ----------
+    chunk_of_inputfiles                 : list of dict of {str : str}
+        Each input file contains "Key of input" (key of input in run manifest), "Name of input file" and "Path of input file".
+    param_for_preliminary_selection     : dict of {str : str}
+        Parameter for preliminary selection.
+    param_for_main_selection            : dict of {str : str}
+        Parameters for main selection.
+    param_for_2nd_chance_selection      : dict of {str : str}
+        Parameter for second-chance selection.
+
+    Returns
+    -------
+    results         : list of (dict, dict)
+        Each input file of chunk with its result (see function "select_BGC_in_file" above).
+    BGC_stats       : dict of {str : int}
+        Statistics of BGC-selection for chunk.
+    product_stats   : dict of {str : int}
+        Statistics of product(s) of selected BGCs for chunk.
+    """
+    BGC_stats     = { "BGCs selected" : 0, "BGCs discarded" : 0, "All BGCs" : 0 }
+    product_stats = {}
+    results       = []
+
+    for inputfile in chunk_of_inputfiles:
+        results.append( (inputfile, select_BGC_in_file(inputfile["Path of input file"], inputfile["Name of input file"], param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, BGC_stats, product_stats)) )
+
+    return results, BGC_stats, product_stats
+# # -----------Select BGCs in a chunk of files (executed by one worker process)-----------------------
+
+
+# # -----------Select BGCs in all given files, using a pool of worker processes-----------------------
+def select_BGCs_in_files_in_parallel(inputfiles, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, BGC_stats, product_stats, number_of_processes, number_of_files_per_chunk, manifest=None):
+    """
+    Select BGCs in all given Genbank (.gbk) files, using a pool of worker processes that each analyze one chunk of files at a time. The statistics of all chunks are merged into the given statistics.
+
+    Parameters
+    ----------
+    inputfiles                          : list of dict of {str : str}
+        Each input file contains "Key of input" (key of input in run manifest), "Name of input file" and "Path of input file".
+    param_for_preliminary_selection     : dict of {str : str}
+        Parameter for preliminary selection.
+    param_for_main_selection            : dict of {str : str}
+        Parameters for main selection.
+    param_for_2nd_chance_selection      : dict of {str : str}
+        Parameter for second-chance selection.
+    BGC_stats                           : dict of {str : int}
+        Statistics of BGC-selection (will be updated).
+    product_stats                       : dict of {str : int}
+        Statistics of product(s) of selected BGCs (will be updated).
+    number_of_processes                 : int
+        Number of worker processes.
+    number_of_files_per_chunk           : int
+        Number of files that a worker process analyzes at a time (larger chunks reduce the overhead of passing files and results between processes).
+    manifest                            : dict or None
+        Run manifest of task 2 (see module "run_manifest.py"), in which the result of each file is recorded.
+
+    Returns
+    -------
+    None (the given statistics will however be updated).
+
+    Output files
+    ------------
+    Copies of Genbank (.gbk) files of selected BGCs in directory of selected BGCs.
+    """
+    chunks_of_inputfiles = [ inputfiles[i : i + number_of_files_per_chunk] for i in range(0, len(inputfiles), max(number_of_files_per_chunk, 1)) ]
+
+    with ProcessPoolExecutor(max_workers = number_of_processes, initializer = names_and_paths.set_workspace_of_process, initargs = (names_and_paths.get_workspace(),)) as pool: # Note: processes (not threads), as reading and assessing files is done in Python itself. Files of selected BGCs are copied by the worker processes into the workspace of this run.
+        futures = [ pool.submit(select_BGCs_in_chunk_of_files, chunk, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection) for chunk in chunks_of_inputfiles ]
+
+        for future in futures: # Merge results in the order of chunks.
+            results, BGC_stats_of_chunk, product_stats_of_chunk = future.result()
+
+            merge_stats(BGC_stats, BGC_stats_of_chunk)
+            merge_stats(product_stats, product_stats_of_chunk)
+
+            if manifest is not None:
+                for inputfile, result in results:
+                    run_manifest.update_entry_of_run_manifest(manifest, inputfile["Key of input"], dict({ "State" : "done" }, **result), inputfile["Path of input file"], save_at_once = False)
+# # -----------Select BGCs in all given files, using a pool of worker processes-----------------------
+
+
+# # -----------Select BGCs in all given files, using the feature store of BGCs-----------------------
+def select_BGCs_in_files_with_feature_store(inputfiles, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, BGC_stats, product_stats, number_of_processes=1, number_of_files_per_chunk=500, manifest=None):
+    """
+    Select BGCs in all given Genbank (.gbk) files: only files that are not yet in the feature store of BGCs (or have changed) are read, then all BGCs are assessed at once from the feature store. Files of selected BGCs are copied and statistics are updated in the order of the given files.
+
+    Parameters
+    ----------
+    inputfiles                          : list of dict of {str : str}
+        Each input file contains "Key of input" (key of input in run manifest), "Name of input file" and "Path of input file".
+    param_for_preliminary_selection     : dict of {str : str}
+        Parameter for preliminary selection.
+    param_for_main_selection            : dict of {str : str}
+        Parameters for main selection.
+    param_for_2nd_chance_selection      : dict of {str : str}
+        Parameter for second-chance selection.
+    BGC_stats                           : dict of {str : int}
+        Statistics of BGC-selection (will be updated).
+    product_stats                       : dict of {str : int}
+        Statistics of product(s) of selected BGCs (will be updated).
+    number_of_processes                 : int
+        Number of worker processes that read new or changed files at the same time.
+    number_of_files_per_chunk           : int
+        Number of files that a worker process reads at a time.
+    manifest                            : dict or None
+        Run manifest of task 2 (see module "run_manifest.py"), in which the result of each file is recorded.
+
+    Returns
+    -------
+    number_of_read_files : int
+        Number of files that were read (all other files were assessed from the feature store only).
+
+    Output files
+    ------------
+    Copies of Genbank (.gbk) files of selected BGCs in directory of selected BGCs. Updated feature store of BGCs.
+    """
+    paths_of_inputfiles = [ inputfile["Path of input file"] for inputfile in inputfiles ]
+
+    # # -----------Read new or changed files into feature store-----------------------
+    feature_store                       = BGC_feature_store.load_feature_store()
+    feature_store, number_of_read_files = BGC_feature_store.update_feature_store(feature_store, paths_of_inputfiles, number_of_processes, number_of_files_per_chunk)
+    if number_of_read_files > 0:
+        BGC_feature_store.save_feature_store(feature_store)
+    # # -----------Read new or changed files into feature store-----------------------
+
+    # # -----------Assess all BGCs at once-----------------------
+    features_of_inputfiles      = feature_store.loc[paths_of_inputfiles]
+    selection_status_for_BGCs   = BGC_feature_store.assess_BGCs(features_of_inputfiles, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection)
+    # # -----------Assess all BGCs at once-----------------------
+
+    # # -----------Copy files of selected BGCs and update statistics-----------------------
+    for inputfile, selection_status_for_BGC, name_of_BGC, length_of_BGC, products_of_BGC in zip( inputfiles, \
+                                                                                               selection_status_for_BGCs.tolist(), \
+                                                                                               features_of_inputfiles["Name of BGC"].tolist(), \
+                                                                                               features_of_inputfiles["Length of BGC (in bp)"].tolist(), \
+                                                                                               features_of_inputfiles["Product(s) of BGC"].tolist() ):
+        if selection_status_for_BGC is None:
+            result = { "Selection status" : None, "Info of BGC" : None, "Output path" : None } # File does not contain exactly one BGC.
+        else:
+            info_of_BGC         = { "Name of BGC" : name_of_BGC, "Length of BGC (in bp)" : str(length_of_BGC), "Product(s) of BGC" : list(products_of_BGC) }
+            path_of_copied_file = make_outputfiles_and_stats.copy_file_of_selected_BGC_and_update_stats(info_of_BGC, selection_status_for_BGC, inputfile["Name of input file"], inputfile["Path of input file"], BGC_stats, product_stats)
+            result              = { "Selection status" : selection_status_for_BGC, "Info of BGC" : info_of_BGC, "Output path" : path_of_copied_file }
+
+        if manifest is not None:
+            run_manifest.update_entry_of_run_manifest(manifest, inputfile["Key of input"], dict({ "State" : "done" }, **result), inputfile["Path of input file"], save_at_once = False)
+    # # -----------Copy files of selected BGCs and update statistics-----------------------
+
+    return number_of_read_files
+# # -----------Select BGCs in all given files, using the feature store of BGCs-----------------------
+
+
+# # -----------Merge statistics-----------------------
+def merge_stats(stats_dict, stats_dict_to_add):
+    """
+    Add the counts of a statistics to another statistics.
+
+    Parameters
+    ----------
+    stats_dict          : dict of {str : int}
+        A dictionary that stores statistics (will be updated).
+    stats_dict_to_add   : dict of {str : int}
+        A dictionary that stores statistics to add.
+
+    Returns
+    -------
+    None (the given statistics will however be updated).
+    """
+    for entry, count in stats_dict_to_add.items():
+        stats_dict[entry] = stats_dict.get(entry, 0) + count
+# # -----------Merge statistics-----------------------
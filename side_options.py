@@ -6,12 +6,30 @@
 analyze_files_with_same_name_but_different_content          = True              # True (recommended): rename and analyze in all executable tasks input files with duplicate name but different file content. This applies to all executable tasks.
                                                                                 # False: skip analyzing input files with duplicate name, even if they have different content. This applies to all executable tasks.
 
+compare_content_of_files_by_fingerprints                    = True              # True (recommended): compare content of files with duplicate name by their fingerprints, i.e. a hash of each file without volatile lines (e.g. date of analysis, version of antiSMASH), which is made only once for each file and kept in directory "fingerprints_of_files" for later runs. Files with the same fingerprint are treated as identical, files that differ in only a few lines (as with option False) are found by a hash of each of their lines (also kept for later runs).
+                                                                                # False: compare content of files with duplicate name line by line (files that differ in at most 50 lines are treated as (almost) identical). Only used if "analyze_files_with_same_name_but_different_content" is True.
+
 rename_output_if_name_collides                              = True              # True (recommended): before analyzing input files, change name of their output files/folders in case their name would collide with other already existing output. This applies to all executable tasks.
                                                                                 # False: skip analyzing input files if their output files/folders would have same name with other already existing output. This applies to all executable tasks.
 # # -----------Options for dealing with name collision of input or output-----------------------
 
 
+# # -----------Option for input files in archives-----------------------
+read_input_files_from_archives                              = False             # True: read input files of all tasks that are in archives (.zip, .tar.gz/.tgz, .gz) directly from the archives, without extracting the archives to disk (a file is only written to disk while antiSMASH analyzes it). Archives inside of archives are not read. Recommended for large archives (e.g. from sequencing facilities).
+                                                                                # False: extract all zipped files/folders (only .zip) in input directory of a task before performing task (the zipped files/folders are replaced by folders with their content).
+# # -----------Option for input files in archives-----------------------
+
+
+# # -----------Option for resuming interrupted runs-----------------------
+resume_unfinished_work_from_run_manifests                   = True              # True (recommended): record the state of each input of all tasks in a run manifest (directory "run_manifests") and, in the next run of a task, skip inputs that are already done (e.g. after the pipeline was interrupted by a crash of docker or a reboot of machine).
+                                                                                # False: process all inputs of a task in every run (run manifests are still recorded).
+# # -----------Option for resuming interrupted runs-----------------------
+
+
 # # -----------Side option-----------------------
+print_output_of_external_programs                           = False             # True: print output of antiSMASH and BiG-SCAPE to text terminal (it is always written to log files in directory "logs").
+                                                                                # False: output of antiSMASH and BiG-SCAPE is only written to log files in directory "logs" (recommended if several antiSMASH runs are executed at the same time).
+
 verbose                                                     = True              # True: print to text terminal verbose information, e.g. for debugging (encoded by the commands "print()" in main program "start_and_command.py").
                                                                                 # False: print only important results and information to text terminal (note: this option has no influence on standard output of antiSMASH and BiGSCAPE).
 # # -----------Side option-----------------------
@@ -23,19 +41,49 @@ prompt_user_to_input_tasks_to_execute                       = True
 
 prompt_user_to_input_values_for_parameters                  = True              # True: the user will be prompted to input values of parameters needed for all task(s) in each run of the pipeline.
                                                                                 # False: the pipeline will use the predefined values of parameters given in module "input_parameters.py".
+
+run_tasks_1_2_3_as_pipeline                                 = False             # True: if tasks 1, 2 and 3 are all executed, BGCs of each input file are selected (task 2) as soon as antiSMASH is finished for this file, while antiSMASH is still running for other files. BiG-SCAPE (task 3) starts right after the last BGC-selection.
+                                                                                # False: tasks are executed one after another (not used for a parameter sweep in task 2).
 # # -----------Options of user-interface-----------------------
 
 
-# # -----------Option in task 1 (gene prediction)-----------------------
+# # -----------Options in task 1 (gene prediction)-----------------------
 clear_output_of_task_1                                      = False             # True: empty output directory of task before performing task. Use this option when wish to execute this one task only, otherwise next task will not have input. This option can avoid name collision of output as well as interference of results and reduce size of output directory.
                                                                                 # Note: be careful not to remove important files or data unintentionally!
-# # -----------Option in task 1 (gene prediction)-----------------------
+
+run_antismash_jobs_in_parallel                              = False             # True: run antiSMASH for several input files at the same time (number of concurrent jobs and CPUs per job are given in module "input_parameters.py"). Recommended on machines with many CPUs.
+                                                                                # False: run antiSMASH for one input file after another.
+
+schedule_antismash_jobs_by_size_and_memory                  = False             # True: start the antiSMASH runs for the largest input files first (so that no large input file is left over at the end) and only as many runs at the same time as fit into a memory budget (estimated from the sizes of input files, parameters in module "input_parameters.py"), so that the machine does not run out of memory. Only used if "run_antismash_jobs_in_parallel" is True.
+                                                                                # False: start the antiSMASH runs in the order in which the input files are found.
+
+filter_contigs_before_antismash                              = False             # True: remove contigs that are shorter than a minimum length (derived from parameter "min_length" of main selection in task 2) or that mostly consist of ambiguous nucleotides ("N") from each input file before running antiSMASH (thresholds are given in module "input_parameters.py"). A summary of removed contigs and bp for each input file is written to directory "statistics". Recommended for metagenome assemblies.
+                                                                                # False: analyze all contigs of each input file.
+
+split_large_fasta_files_into_shards                         = False             # True: split each input file that is larger than the maximum length per shard (given in module "input_parameters.py") into shards, i.e. smaller FASTA files with whole contigs, that are analyzed by antiSMASH as independent runs (at the same time, if "run_antismash_jobs_in_parallel" is True). The Genbank files of all detected regions are then merged into the antiSMASH-output directory of the input file.
+                                                                                # False: analyze each input file with one antiSMASH run.
+
+reuse_cached_antismash_results                              = False             # True: keep results of all antiSMASH runs in directory "cache_of_antiSMASH" (as hard links, i.e. without using extra disk space) and reuse them for input files with identical content that were already analyzed with the same antiSMASH (options), instead of running antiSMASH again.
+                                                                                # False: run antiSMASH for every input file.
+
+keep_antismash_workers_warm                                 = False             # True: keep containers of antiSMASH running during task 1 (as many as antiSMASH runs at the same time) and start each antiSMASH run in a free container ("docker exec"), instead of starting a new container for every input file (see module "antismash_workers.py"). Recommended for many small input files (e.g. thousands of genomes of isolates).
+                                                                                # False: start a new container of antiSMASH (with the run file of antiSMASH) for every input file.
+# # -----------Options in task 1 (gene prediction)-----------------------
 
 
 # # -----------Options in task 2 (BGC-selection)-----------------------
 clear_output_of_task_2                                      = True             # True: empty output directory of task before performing task. Use this option when wish to execute this one task only, otherwise next task will not have input. This option can avoid name collision of output as well as interference of results and reduce size of output directory.
                                                                                 # Note: be careful not to remove important files or data unintentionally!
 
+run_BGC_selection_in_parallel                               = False             # True: analyze Genbank files in a pool of worker processes (number of processes and files per chunk are given in module "input_parameters.py"). Recommended for many (e.g. hundreds of thousands of) BGCs. Note: if files of selected BGCs have the same name, it is not fixed which of them is renamed.
+                                                                                # False: analyze one Genbank file after another.
+
+sweep_selection_parameters_in_task_2                        = False             # True: instead of BGC-selection, assess all BGCs for every combination of values for the selection parameters in a grid (given in module "input_parameters.py") and write the numbers of selected/discarded BGCs and product(s) of selected BGCs for each combination to a table in directory "statistics". No files are copied. Recommended to choose values for the selection parameters.
+                                                                                # False: select BGCs with one value for each selection parameter.
+
+keep_feature_store_of_BGCs                                  = False             # True: keep a table with the data of all BGCs needed for BGC-selection in directory "feature_store_of_BGCs", so that a new BGC-selection (e.g. with other values for the selection parameters) only reads Genbank files that are new or have changed, and assesses all other BGCs at once from this table. Recommended when trying out several values for the selection parameters.
+                                                                                # False: read all Genbank files in every BGC-selection.
+
 group_products_in_predefined_groups                         = False             # True: group all found products into predefined groups to simplify output products (these product groups can be adapted in module "stats_utils.py").
                                                                                 # False: all found products will only be sorted according to their frequencies.
 
@@ -52,4 +100,28 @@ clear_output_of_task_3                                      = False
                                                                                 # Note: be careful not to remove important files or data unintentionally!
 
 analyze_query_BGCs_with_BGCs_from_MIBiG                     = True              # True (recommended): analyze query BGCs with BGCs from database MIBiG.
+
+collapse_identical_BGCs_before_task_3                       = False             # True: analyze only one representative of identical BGCs (e.g. the same BGC found in several related samples under different names of files) with BiG-SCAPE. BGCs are identical if they have the same DNA sequence (on either strand). Near-identical BGCs are also collapsed with option "collapse_near_identical_BGCs" below, BGCs without DNA sequence are never collapsed. All BGCs and their representatives are listed in a table in directory "statistics", so that the numbers of BGCs per sample can still be recovered. Recommended for many related samples (e.g. metagenomes).
+                                                                                # False: analyze all query BGCs with BiG-SCAPE.
+
+compare_BGCs_by_translations_of_core_genes                  = False             # True: BGCs are also identical if their core genes have the same translations (e.g. BGCs with only synonymous mutations or slightly different borders of region). Only used if "collapse_identical_BGCs_before_task_3" is True.
+                                                                                # False: only BGCs with the same DNA sequence are identical.
+
+collapse_near_identical_BGCs                                = True              # True: a BGC without identical BGC is also collapsed into a near-identical BGC (e.g. with a few SNPs), i.e. with an estimated similarity of the k-mers of the translations of core and additional biosynthetic genes of at least "min_similarity_for_near_identical_BGCs" in module "input_parameters.py". The similarity of each BGC to its representative is listed in the table in directory "statistics". Only used if "collapse_identical_BGCs_before_task_3" is True.
+                                                                                # False: only exactly identical BGCs are collapsed (near-identical BGCs are all analyzed and grouped into one family by BiG-SCAPE).
+
+keep_cache_of_BiGSCAPE_for_incremental_clustering           = False             # True: keep the intermediate results of BiG-SCAPE for each BGC (e.g. domains predicted by hmmscan) in directory "cache_of_BiGSCAPE" and reuse them in the next runs of task 3 for all BGCs that did not change since, so that only the domains of new BGCs are predicted. Recommended if new BGCs are often added to a large collection of BGCs. Note: the distances between all BGCs are still calculated in every run.
+                                                                                # False: BiG-SCAPE analyzes all BGCs from scratch in every run.
+
+run_matrix_of_settings_in_task_3                            = False             # True: run BiG-SCAPE for every combination of the values for "cutoffs" and the settings for BGCs from MIBiG (given in module "input_parameters.py") and write the families (GCFs) of all BGCs for each combination to a table in directory "statistics". Input files are put into the input directory of BiG-SCAPE only once, BiG-SCAPE runs once per setting for BGCs from MIBiG (with all values for "cutoffs" at once), and the domains of the query BGCs are only predicted once. Recommended to choose the settings of task 3.
+                                                                                # False: run BiG-SCAPE once, with the setting "analyze_query_BGCs_with_BGCs_from_MIBiG" above.
+
+precluster_BGCs_before_task_3                               = False             # True: group query BGCs into provisional gene cluster families (GCFs) by the similarity of the translations of their core and additional biosynthetic genes (MinHash sketches and locality-sensitive hashing, no third-party program), write them to a table in directory "statistics" and run BiG-SCAPE separately for batches of provisional GCFs (parameters in module "input_parameters.py"). Recommended for many BGCs, as the run time of BiG-SCAPE grows with the square of the number of BGCs. Note: a matrix of settings (see above) is still run for all BGCs together.
+                                                                                # False: analyze all query BGCs in one run of BiG-SCAPE.
+
+skip_BiGSCAPE_after_preclustering                           = False             # True: only write the provisional GCFs (quick overview of BGCs), without running BiG-SCAPE. Only used if "precluster_BGCs_before_task_3" is True.
+                                                                                # False: run BiG-SCAPE after grouping BGCs into provisional GCFs.
+
+use_MIBiG_reference_index_in_task_3                         = False             # True: find the nearest BGCs from MIBiG of each query BGC by a local reference index of MIBiG (see module "MIBiG_reference_index.py") and write them to a table in directory "statistics", together with a call "known" or "novel" for each query BGC. If "analyze_query_BGCs_with_BGCs_from_MIBiG" is True, BiG-SCAPE then only analyzes the nearest BGCs from MIBiG instead of all BGCs from MIBiG.
+                                                                                # False: no reference index of MIBiG is used.
 # # -----------Options in task 3 (similarity analysis)-----------------------
@@ -0,0 +1,130 @@
+''' This module splits large FASTA files (e.g. metagenome assemblies) into smaller FASTA files ("shards"), each with a similar total length (in bp) of whole contigs, so that the shards can be analyzed by antiSMASH as independent runs at the same time.
+    FASTA files are only read line by line (streaming), so that a whole assembly is never loaded into memory. After all shards of a FASTA file were analyzed, the Genbank files of the detected regions (BGCs) are merged back into the antiSMASH-output directory of the FASTA file. '''
+
+
+import os
+
+import create
+import names_and_paths
+import archive_input
+
+
+# # -----------Count total length of all sequences in a FASTA file-----------------------
+def count_bp_of_fasta_file(path_of_fasta_file):
+    """
+    Count total length (in bp) of all sequences (contigs) in a FASTA file, reading the file line by line.
+
+    Parameters
+    ----------
+    path_of_fasta_file : str
+        Path of a FASTA file.
+
+    Returns
+    -------
+    number_of_bp : int
+        Total length (in bp) of all sequences in FASTA file.
+    """
+    number_of_bp = 0
+    with archive_input.open_file(path_of_fasta_file, "r") as file_object:
+        for line in file_object:
+            if not line.startswith(">"):
+                number_of_bp += len(line.strip())
+    return number_of_bp
+# # -----------Count total length of all sequences in a FASTA file-----------------------
+
+
+# # -----------Split a FASTA file into shards-----------------------
+def split_fasta_file_into_shards(path_of_fasta_file, path_of_directory_of_shards, number_of_shards, number_of_bp=None):
+    """
+    Split a FASTA file into a given number of shards with similar total length (in bp), without splitting any contig. The FASTA file is read line by line, and each contig is written to the current shard until the shard reaches its share of the total length.
+
+    Parameters
+    ----------
+    path_of_fasta_file              : str
+        Path of a FASTA file.
+    path_of_directory_of_shards     : str
+        Path of directory that will contain the shards (existing shards in this directory are replaced).
+    number_of_shards                : int
+        Maximum number of shards (fewer shards are made if the FASTA file has fewer contigs).
+    number_of_bp                    : int or None
+        Total length (in bp) of all sequences in FASTA file, if already known (otherwise it is counted first).
+
+    Returns
+    -------
+    paths_of_shards : list of str
+        Paths of all shards (in order of contigs in FASTA file).
+
+    Output files
+    ------------
+    FASTA file(s) of shards, named after the FASTA file with suffix "__shard_001", "__shard_002", etc.
+    """
+    if number_of_bp is None:
+        number_of_bp = count_bp_of_fasta_file(path_of_fasta_file)
+    bp_per_shard = number_of_bp / max(number_of_shards, 1) # Share of the total length for each shard (contig-balanced: a shard is closed once it reaches this share, so that all shards have similar length).
+
+    create.create_directory_if_not_exists(path_of_directory_of_shards)
+    name_of_fasta_file = archive_input.name_of_file(path_of_fasta_file)
+    for extension in names_and_paths.file_extensions_of_antismash_inputfiles:
+        name_of_fasta_file = name_of_fasta_file.replace(extension, "")
+
+    paths_of_shards     = []
+    shard_file_object   = None
+    bp_in_current_shard = 0
+
+    with archive_input.open_file(path_of_fasta_file, "r") as file_object:
+        for line in file_object:
+            if line.startswith(">"):
+                if shard_file_object is None or (bp_in_current_shard >= bp_per_shard and len(paths_of_shards) < number_of_shards): # Start a new shard at the beginning of the next contig.
+                    if shard_file_object is not None:
+                        shard_file_object.close()
+                    path_of_shard       = os.path.join(path_of_directory_of_shards, name_of_fasta_file + "__shard_" + str(len(paths_of_shards) + 1).zfill(3) + names_and_paths.file_extensions_of_antismash_inputfiles[0])
+                    shard_file_object   = open(path_of_shard, "w")
+                    bp_in_current_shard = 0
+                    paths_of_shards.append(path_of_shard)
+            elif shard_file_object is not None:
+                bp_in_current_shard += len(line.strip())
+            else:
+                continue # Skip lines before the first header of a contig.
+            shard_file_object.write(line)
+
+    if shard_file_object is not None:
+        shard_file_object.close()
+
+    return paths_of_shards
+# # -----------Split a FASTA file into shards-----------------------
+
+
+# # -----------Merge Genbank files of regions from antiSMASH-output of all shards-----------------------
+def merge_region_files_of_shards(paths_of_antismash_output_directories_of_shards, path_of_antismash_output_directory):
+    """
+    Move the Genbank (.gbk) files of all regions (i.e. files that each contain one BGC) from the antiSMASH-output directories of all shards of a FASTA file to the antiSMASH-output directory of the FASTA file.
+
+    Parameters
+    ----------
+    paths_of_antismash_output_directories_of_shards : list of str
+        Paths of antiSMASH-output directories of all shards.
+    path_of_antismash_output_directory              : str
+        Path of antiSMASH-output directory of the (unsplit) FASTA file.
+
+    Returns
+    -------
+    number_of_merged_files : int
+        Number of moved Genbank files.
+
+    Output files
+    ------------
+    Genbank (.gbk) files of all regions, moved to antiSMASH-output directory of FASTA file. All other output of antiSMASH for shards stays in the antiSMASH-output directories of the shards.
+    """
+    number_of_merged_files = 0
+    for path_of_output_directory_of_shard in paths_of_antismash_output_directories_of_shards:
+        if not os.path.isdir(path_of_output_directory_of_shard):
+            continue
+        for name_of_file in os.listdir(path_of_output_directory_of_shard):
+            if ".region" in name_of_file and name_of_file.endswith(tuple(names_and_paths.file_extensions_of_antismash_outputfiles)): # antiSMASH names the Genbank file of each region e.g. "<name of contig>.region001.gbk".
+                destination_path = os.path.join(path_of_antismash_output_directory, name_of_file)
+                if os.path.exists(destination_path):
+                    destination_path = os.path.join(path_of_antismash_output_directory, os.path.basename(path_of_output_directory_of_shard) + "__" + name_of_file) # Note: names of contigs are normally unique in a FASTA file, so this should rarely happen.
+                os.replace(os.path.join(path_of_output_directory_of_shard, name_of_file), destination_path)
+                number_of_merged_files += 1
+    return number_of_merged_files
+# # -----------Merge Genbank files of regions from antiSMASH-output of all shards-----------------------
@@ -4,8 +4,13 @@
 
 import re
 import os
+import sys
+import math
 import time
 import shutil
+import queue
+import threading
+import contextvars
 from   datetime import datetime
 from   tabulate import tabulate
 
@@ -13,26 +18,43 @@ import side_options
 import names_and_paths
 import create
 import unzip
+import archive_input
 import input_parameters
 import deduplicate
+import deduplicate_BGCs
 import run_antismash
+import antismash_cache
+import prefilter_fasta
+import split_fasta
+import run_manifest
 import analyze_and_assess
+import select_BGCs
+import BGC_feature_store
+import parameter_sweep
 from   analyze_and_assess import delimiter_btw_data_of_genes_and_DNA_seq_of_whole_BGC, label_for_file_of_one_BGC
 import make_outputfiles_and_stats
 import print_to_terminal
 import run_bigscape
+import bigscape_matrix
+import precluster_BGCs
+import MIBiG_reference_index
+import run_process
 import change_permit
+import command_line
 
 
 # # --------------------------------------------------------------------------TASK 1 OF PIPELINE: Gene prediction with antiSMASH--------------------------------------------------------------------------
 
-def TASK_1():
+def TASK_1(callback_for_finished_antismash_output=None, min_length_of_BGC=None):
     """
     Execute task 1 (BGC prediction by antiSMASH).
 
     Parameters
     ----------
-    None.
+    callback_for_finished_antismash_output : function or None
+        Function that is called with the path of an antiSMASH-output directory as soon as it contains the complete results for an input file (e.g. to start BGC-selection for it, see function "PIPELINE" below). If None, nothing is called.
+    min_length_of_BGC                      : str or None
+        Minimum length of BGC (in bp) in main selection of task 2, from which the minimum length of contig for the pre-filter is derived (only used if option "filter_contigs_before_antismash" is set to True). If None (e.g. task 2 is not executed), the predefined value "min_length" in module "input_parameters.py" is used.
 
     Input files
     -----------
@@ -57,6 +79,7 @@ def TASK_1():
     if side_options.clear_output_of_task_1 == True:
         shutil.rmtree(path_of_output_dir_for_task_1) # Remove whole directory of output from antiSMASH.
         create.create_directory_if_not_exists(path_of_output_dir_for_task_1) # Create directory for output from antiSMASH again.
+        run_manifest.remove_run_manifest("task_1") # Records of earlier antiSMASH runs are no longer valid.
     # # --------------Optional: clear antiSMASH-output directory before running antiSMASH------------------
 
     # # --------------Checkpoint: check if input directory for antiSMASH is not empty (input for this task)------------------
@@ -69,7 +92,8 @@ def TASK_1():
     # From here, directory that contains input file(s) for antiSMASH is not empty (i.e. input for this task is available) and proceed to the next codes:
 
     # # --------------Unzip all file(s)/folder(s) in input directory---------------
-    unzip.unzip_all_files_and_folders_in_dir(path_of_input_dir_for_task_1)
+    if side_options.read_input_files_from_archives == False: # Otherwise, input files in archives are read directly from the archives (see below).
+        unzip.unzip_all_files_and_folders_in_dir(path_of_input_dir_for_task_1)
     # # --------------Unzip all file(s)/folder(s) in input directory---------------
 
     # # --------------Loop through input directory and find path(s) of all input file(s) for task---------------
@@ -80,54 +104,361 @@ def TASK_1():
             if not name_of_file.startswith(tuple(names_and_paths.prefixes_of_names_of_incompatible_files)) and name_of_file.endswith(tuple(names_and_paths.file_extensions_of_antismash_inputfiles)): # Checkpoint: check if file is a correct input file (e.g. a .fasta file) for antiSMASH.
                 path_of_inputfile = os.path.join(dir, name_of_file)
                 inputpaths.append(path_of_inputfile) # Note: a list can generally hold up to 9223372036854775807 elements. So this list can contain max. that many paths of input files.
+            elif side_options.read_input_files_from_archives == True and name_of_file.endswith(tuple(archive_input.file_extensions_of_archives)): # Input files in an archive (e.g. .zip, .tar.gz) are read directly from the archive.
+                inputpaths.extend(archive_input.list_files_in_archive(os.path.join(dir, name_of_file), names_and_paths.file_extensions_of_antismash_inputfiles))
     # # --------------Loop through input directory and find path(s) of all input file(s) for task---------------
 
     # # --------------Deduplicate input---------------
     deduplicate.remove_or_rename_files_with_duplicate_name(inputpaths) # Remove or rename paths in the list for antiSMASH-input files with duplicate name, which will make a list of paths of input files with unique name so that their antiSMASH-output directories, which have the same name as their input files and are created in the same directory (directory for antiSMASH-output), do not conflict in their names.
     # # --------------Deduplicate input---------------
 
-    start_antismash_run = time.time() # Start timing gene prediction by antiSMASH.
-    number_of_antismash_runs = 0 # For results report.
-
-    # # --------------Loop through list of input file(s) and run antiSMASH for each input file---------------
+    # # --------------Load run manifest of task (records state of each input file from earlier runs)---------------
+    parameters_of_task_1 = { "antiSMASH options" : " ".join(run_antismash.antismash_options) }
+    if side_options.filter_contigs_before_antismash == True:
+        min_length_of_contig                                 = int(int(min_length_of_BGC if min_length_of_BGC is not None else input_parameters.min_length) * input_parameters.fraction_of_min_length_for_contig_prefilter) # Minimum length of contig (in bp) for pre-filter, derived from minimum length of BGC in main selection of task 2.
+        parameters_of_task_1["Minimum length of contig (in bp)"] = min_length_of_contig
+        parameters_of_task_1["Maximum fraction of N in contig"]  = input_parameters.max_fraction_of_N_in_contig # Results of earlier runs with other thresholds of pre-filter are not reused.
+    manifest_of_task_1 = run_manifest.load_run_manifest("task_1", parameters = parameters_of_task_1)
+    # # --------------Load run manifest of task (records state of each input file from earlier runs)---------------
+
+    # # --------------Loop through list of input file(s) and prepare one antiSMASH job for each input file---------------
+    jobs                                = [] # Define a list that will contain one job (a dict with path of input file, path of antiSMASH-output directory, name of input file and key of input file in run manifest) for each input file (or for each shard of a large input file).
+    reserved_antismash_output_dirs      = set() # Paths of antiSMASH-output directories that are already given to a job (these do not exist yet before running antiSMASH, but must not be used by another job).
+    keys_of_antismash_runs              = {}    # Key of antiSMASH run (see module "antismash_cache.py") for each antiSMASH-output directory of a job, only used if option "reuse_cached_antismash_results" is set to True.
+    summaries_of_contig_prefilter       = []    # Summary of removed contigs and bp for each input file (only if option "filter_contigs_before_antismash" is set to True).
+    sharded_inputfiles                  = []    # Large input files that were split into shards (only if option "split_large_fasta_files_into_shards" is set to True).
+    number_of_reused_antismash_results  = 0     # For results report.
+    number_of_completed_inputfiles      = 0     # For results report: number of input files that were already done in an earlier run of task (according to run manifest).
+
+    # # -----------Report a finished antiSMASH-output directory (only used in pipelined mode)-----------------------
+    def report_finished_antismash_output(path_of_antismash_output_directory):
+        if callback_for_finished_antismash_output is not None and os.path.basename(os.path.dirname(path_of_antismash_output_directory.rstrip("/"))) != names_and_paths.name_of_directory_of_antismash_output_of_shards: # Note: output of a shard is only reported with the output of its (unsplit) input file, after its Genbank files of regions are merged (see below).
+            callback_for_finished_antismash_output(path_of_antismash_output_directory)
+    # # -----------Report a finished antiSMASH-output directory (only used in pipelined mode)-----------------------
+
+    # # -----------Prepare a job for one input file (or shard), or reuse results of antiSMASH from cache-----------------------
+    def prepare_job(path_of_inputfile, path_of_antismash_output_directory, name_of_inputfile, key_of_inputfile, path_of_original_inputfile):
+        nonlocal number_of_reused_antismash_results
+
+        # # -----------Optional: link results of antiSMASH from cache instead of running antiSMASH-----------------------
+        if side_options.reuse_cached_antismash_results == True:
+            key_of_antismash_run   = antismash_cache.make_key_of_antismash_run(path_of_inputfile)
+            path_of_cached_results = antismash_cache.find_cached_antismash_results(key_of_antismash_run)
+            if path_of_cached_results is not None:
+                if side_options.verbose == True: print("\n> Found results of antiSMASH for file \"" + name_of_inputfile + "\" in cache!")
+                antismash_cache.restore_antismash_results_from_cache(path_of_cached_results, path_of_antismash_output_directory)
+                number_of_reused_antismash_results += 1
+                run_manifest.update_entry_of_run_manifest(manifest_of_task_1, key_of_inputfile, { "State" : "done", "Exit code" : 0, "Duration (in s)" : 0.0, "Output path" : path_of_antismash_output_directory }, path_of_original_inputfile, save_at_once = False)
+                report_finished_antismash_output(path_of_antismash_output_directory)
+                return
+            keys_of_antismash_runs[path_of_antismash_output_directory] = key_of_antismash_run
+        # # -----------Optional: link results of antiSMASH from cache instead of running antiSMASH-----------------------
+
+        jobs.append( { "Path of input file" : path_of_inputfile, "Path of output directory" : path_of_antismash_output_directory, "Name of input file" : name_of_inputfile, "Key of input" : key_of_inputfile, "Path of original input file" : path_of_original_inputfile } )
+        run_manifest.update_entry_of_run_manifest(manifest_of_task_1, key_of_inputfile, { "State" : "pending", "Exit code" : None, "Duration (in s)" : None, "Output path" : path_of_antismash_output_directory }, path_of_original_inputfile, save_at_once = False)
+    # # -----------Prepare a job for one input file (or shard), or reuse results of antiSMASH from cache-----------------------
 
     for path_of_inputfile in inputpaths:
         # # -----------Prepare path of input and output-----------------------
-        name_of_inputfile                   = path_of_inputfile.split("/")[-1] # Get name of antiSMASH-input file from its path. Note: this name may contain the suffix "renamed" due to the preprocessing step previously.
+        key_of_inputfile                    = path_of_inputfile # Key of input file in run manifest (path of input file in the deduplicated list, which is unique).
+        name_of_inputfile                   = archive_input.name_of_file(path_of_inputfile) # Get name of antiSMASH-input file from its path. Note: this name may contain the suffix "renamed" due to the preprocessing step previously.
         name_of_antismash_output_directory  = re.sub("|".join(names_and_paths.file_extensions_of_antismash_inputfiles), "", name_of_inputfile) # Remove file extension(s) (e.g. .fasta) from name of input file to get name of antiSMASH-output directory for input file. But the suffix "renamed" remains in the name, so that this name is unique in the antiSMASH-output directory.
         path_of_antismash_output_directory  = path_of_output_dir_for_task_1 + name_of_antismash_output_directory # Make path of antiSMASH-output directory. This path should be unique due to the preprocessing step previously.
 
         path_of_inputfile = re.sub("_+renamed$", "", path_of_inputfile) # Get the original, correct path of input file in case this path was modified in previous preprocessing step. Note: only omit the string "renamed" at the end of the path (i.e. in name of file).
+        path_of_original_inputfile = path_of_inputfile # State of input file in run manifest is always bound to the original input file (even if antiSMASH analyzes a filtered copy or shards of it).
         # # -----------Prepare path of input and output-----------------------
 
+        # # -----------Optional: skip input file if it was already done in an earlier run of task, or continue an unfinished earlier run in the same output directory-----------------------
+        continue_unfinished_run = False
+        if side_options.resume_unfinished_work_from_run_manifests == True:
+            entry_of_inputfile = run_manifest.get_entry_of_completed_input(manifest_of_task_1, key_of_inputfile, path_of_inputfile)
+            if entry_of_inputfile is not None and os.path.isdir(entry_of_inputfile["Output path"]):
+                number_of_completed_inputfiles += 1
+                report_finished_antismash_output(entry_of_inputfile["Output path"])
+                continue # Input file was already analyzed successfully by antiSMASH in an earlier run of task.
+
+            entry_of_inputfile = manifest_of_task_1["Entries"].get(key_of_inputfile)
+            if entry_of_inputfile is not None and entry_of_inputfile.get("State") in ["running", "failed"] and os.path.isdir(entry_of_inputfile["Output path"]) and entry_of_inputfile["Output path"] not in reserved_antismash_output_dirs:
+                path_of_antismash_output_directory = entry_of_inputfile["Output path"]
+                if entry_of_inputfile.get("Number of shards") is None:
+                    shutil.rmtree(path_of_antismash_output_directory) # Remove incomplete output of the unfinished (e.g. interrupted) earlier antiSMASH run, and run antiSMASH again in the same output directory (instead of creating an output directory with a new name).
+                # Note: for a large input file that was split into shards, the output of shards that are already done is kept (see below).
+                continue_unfinished_run = True
+        # # -----------Optional: skip input file if it was already done in an earlier run of task, or continue an unfinished earlier run in the same output directory-----------------------
+
+        # # -----------Optional: remove short contigs and contigs with too many "N" from input file-----------------------
+        if side_options.filter_contigs_before_antismash == True:
+            path_of_filtered_inputfile    = names_and_paths.path_of_directory_of_filtered_fasta_files + name_of_antismash_output_directory + names_and_paths.file_extensions_of_antismash_inputfiles[0] # Name is unique, like name of antiSMASH-output directory.
+            summary_of_contig_prefilter   = prefilter_fasta.filter_contigs_of_fasta_file(path_of_inputfile, path_of_filtered_inputfile, min_length_of_contig, input_parameters.max_fraction_of_N_in_contig)
+            summaries_of_contig_prefilter.append(summary_of_contig_prefilter)
+            number_of_removed_contigs     = summary_of_contig_prefilter["Contigs removed (too short)"] + summary_of_contig_prefilter["Contigs removed (too many N)"]
+            if number_of_removed_contigs == summary_of_contig_prefilter["Contigs (all)"]:
+                os.remove(path_of_filtered_inputfile)
+                if side_options.verbose == True: print("\n> All contigs of file \"" + name_of_inputfile + "\" were removed by pre-filter! File will not be analyzed by antiSMASH.")
+                continue # Nothing left to analyze.
+            elif number_of_removed_contigs == 0:
+                os.remove(path_of_filtered_inputfile) # Nothing was removed: analyze the original input file.
+            else:
+                path_of_inputfile = path_of_filtered_inputfile # antiSMASH analyzes the filtered input file.
+        # # -----------Optional: remove short contigs and contigs with too many "N" from input file-----------------------
+
+        # # -----------Optional: skip input file if its antiSMASH-output directory already contains results for identical input-----------------------
+        if side_options.reuse_cached_antismash_results == True:
+            key_of_antismash_run = antismash_cache.make_key_of_antismash_run(path_of_inputfile)
+            if antismash_cache.read_key_of_antismash_output_directory(path_of_antismash_output_directory) == key_of_antismash_run:
+                if side_options.verbose == True: print("\n> Results of antiSMASH for file \"" + name_of_inputfile + "\" already exist and will be reused!")
+                number_of_reused_antismash_results += 1
+                run_manifest.update_entry_of_run_manifest(manifest_of_task_1, key_of_inputfile, { "State" : "done", "Exit code" : 0, "Duration (in s)" : 0.0, "Output path" : path_of_antismash_output_directory }, path_of_original_inputfile, save_at_once = False)
+                report_finished_antismash_output(path_of_antismash_output_directory)
+                continue # Input file (with identical content) was already analyzed by the same antiSMASH and its results are still in antiSMASH-output directory: no need to run antiSMASH again.
+        # # -----------Optional: skip input file if its antiSMASH-output directory already contains results for identical input-----------------------
+
         # # -----------Checkpoint for name collision of output: if an antiSMASH-output directory exists with same name-----------------------
-        if os.path.isdir(path_of_antismash_output_directory): # In case a directory with same name already exists in antiSMASH-output directory:
+        if continue_unfinished_run == False and (os.path.isdir(path_of_antismash_output_directory) or path_of_antismash_output_directory in reserved_antismash_output_dirs): # In case a directory with same name already exists in antiSMASH-output directory (or is already given to another job):
             if side_options.rename_output_if_name_collides == True: # In case name of antiSMASH-output directory is to be renamed so that input file can be analyzed:
                 path_of_antismash_output_directory += "__latest_output"
-                while os.path.isdir(path_of_antismash_output_directory): # In case new name for output directory is not yet unique:
+                while os.path.isdir(path_of_antismash_output_directory) or path_of_antismash_output_directory in reserved_antismash_output_dirs: # In case new name for output directory is not yet unique:
                     path_of_antismash_output_directory = re.sub("__latest_output$", "___latest_output", path_of_antismash_output_directory) # Extend the underscore before "latest" in name of output directory until a unique name is found.
             else:
                 continue # Skip in case name of antiSMASH-output directory is not to be renamed so that input file cannot be analyzed, e.g. when user does not want to lose old output.
         # # -----------Checkpoint for name collision of output: if an antiSMASH-output directory exists with same name-----------------------
 
-        # # --------------Run antiSMASH for each input file---------------
-        if side_options.verbose == True: print("\n\n\n> Running antiSMASH for file \"" + name_of_inputfile + "\"...")
-        number_of_antismash_runs += run_antismash.run_antismash(path_of_inputfile, path_of_antismash_output_directory) # Run antiSMASH for input file and update the number of antiSMASH runs.
-        # # --------------Run antiSMASH for each input file---------------
+        reserved_antismash_output_dirs.add(path_of_antismash_output_directory)
+
+        # # -----------Optional: split large input file into shards and prepare one job for each shard-----------------------
+        if side_options.split_large_fasta_files_into_shards == True:
+            number_of_bp_of_inputfile = split_fasta.count_bp_of_fasta_file(path_of_inputfile)
+            if number_of_bp_of_inputfile > input_parameters.max_bp_per_fasta_shard:
+                number_of_shards                       = math.ceil(number_of_bp_of_inputfile / input_parameters.max_bp_per_fasta_shard)
+                paths_of_shards                        = split_fasta.split_fasta_file_into_shards(path_of_inputfile, names_and_paths.path_of_directory_of_fasta_shards + os.path.basename(path_of_antismash_output_directory) + "/", number_of_shards, number_of_bp_of_inputfile)
+                path_of_dir_of_antismash_output_of_shards = create.create_directory_if_not_exists(os.path.join(path_of_antismash_output_directory, names_and_paths.name_of_directory_of_antismash_output_of_shards))
+                if side_options.verbose == True: print("\n> Split file \"" + name_of_inputfile + "\" (" + "{:,}".format(number_of_bp_of_inputfile) + " bp) into " + str(len(paths_of_shards)) + " shard(s)!")
+
+                sharded_inputfile = { "Key of input" : key_of_inputfile, "Path of input file" : path_of_inputfile, "Path of output directory" : path_of_antismash_output_directory, "Path of directory of shards" : os.path.dirname(paths_of_shards[0]) if paths_of_shards else None, "Paths of output directories of shards" : [] }
+                for path_of_shard in paths_of_shards:
+                    name_of_shard                           = os.path.basename(path_of_shard)
+                    path_of_antismash_output_dir_of_shard   = os.path.join(path_of_dir_of_antismash_output_of_shards, re.sub("|".join(names_and_paths.file_extensions_of_antismash_inputfiles), "", name_of_shard))
+                    key_of_shard                            = key_of_inputfile + " [" + name_of_shard + "]"
+                    sharded_inputfile["Paths of output directories of shards"].append(path_of_antismash_output_dir_of_shard)
+
+                    if side_options.resume_unfinished_work_from_run_manifests == True and run_manifest.get_entry_of_completed_input(manifest_of_task_1, key_of_shard, path_of_original_inputfile) is not None and antismash_cache.is_complete_antismash_output_directory(path_of_antismash_output_dir_of_shard):
+                        continue # Shard was already analyzed successfully in an earlier run of task.
+                    if os.path.isdir(path_of_antismash_output_dir_of_shard):
+                        shutil.rmtree(path_of_antismash_output_dir_of_shard) # Remove incomplete output of shard from an unfinished earlier run.
+
+                    prepare_job(path_of_shard, path_of_antismash_output_dir_of_shard, name_of_shard, key_of_shard, path_of_original_inputfile) # Note: the state of each shard in run manifest is bound to the (unsplit) input file.
+
+                sharded_inputfiles.append(sharded_inputfile)
+                run_manifest.update_entry_of_run_manifest(manifest_of_task_1, key_of_inputfile, { "State" : "running", "Exit code" : None, "Duration (in s)" : None, "Output path" : path_of_antismash_output_directory, "Number of shards" : len(paths_of_shards) }, path_of_original_inputfile, save_at_once = False)
+                continue
+        # # -----------Optional: split large input file into shards and prepare one job for each shard-----------------------
+
+        prepare_job(path_of_inputfile, path_of_antismash_output_directory, name_of_inputfile, key_of_inputfile, path_of_original_inputfile)
+
+    run_manifest.save_run_manifest(manifest_of_task_1) # Save manifest with all pending jobs before running antiSMASH.
+    # # --------------Loop through list of input file(s) and prepare one antiSMASH job for each input file---------------
 
+    # # --------------Run antiSMASH for all jobs (one after another, or several at the same time)---------------
+    if side_options.run_antismash_jobs_in_parallel == True:
+        number_of_parallel_jobs = input_parameters.number_of_parallel_antismash_jobs
+        number_of_cpus_per_job  = input_parameters.number_of_cpus_per_antismash_job
+    else:
+        number_of_parallel_jobs = 1
+        number_of_cpus_per_job  = None # antiSMASH uses its default number of CPUs.
+
+    start_antismash_run = time.time() # Start timing gene prediction by antiSMASH.
+
+    number_of_antismash_runs, number_of_failed_antismash_runs = run_antismash.run_antismash_for_all_jobs(jobs, number_of_parallel_jobs, number_of_cpus_per_job, manifest_of_task_1, \
+                                                                                                         lambda job, exit_code: report_finished_antismash_output(job["Path of output directory"]) if exit_code == 0 else None, \
+                                                                                                         run_antismash.get_memory_budget_of_antismash_jobs() if side_options.schedule_antismash_jobs_by_size_and_memory == True else None, \
+                                                                                                         side_options.keep_antismash_workers_warm) # Run antiSMASH for all input files and get the number of successful and failed antiSMASH runs (for results report). State of each job is recorded in run manifest.
+
+    archive_input.close_all_archives() # Input files in archives are no longer read.
     end_antismash_run  = time.time() # Stop timing gene prediction by antiSMASH.
     antismash_run_time = end_antismash_run - start_antismash_run
-
-    print("\n\n\n>>> Task 1: Finished BGC-prediction by antiSMASH for " + str(number_of_antismash_runs) + " input file(s) in directory \"" + names_and_paths.name_of_input_directory_for_antismash + "\" (antiSMASH run time = " + str(round(antismash_run_time, 1)) + " s)!\n\n")
+    # # --------------Run antiSMASH for all jobs (one after another, or several at the same time)---------------
+
+    # # --------------Optional: store results of all new antiSMASH runs in cache---------------
+    for path_of_antismash_output_directory, key_of_antismash_run in keys_of_antismash_runs.items():
+        antismash_cache.store_antismash_results_in_cache(key_of_antismash_run, path_of_antismash_output_directory) # Note: results of failed antiSMASH runs are not stored.
+    # # --------------Optional: store results of all new antiSMASH runs in cache---------------
+
+    # # --------------Optional: merge Genbank files of regions from all shards of each large input file---------------
+    for sharded_inputfile in sharded_inputfiles:
+        split_fasta.merge_region_files_of_shards(sharded_inputfile["Paths of output directories of shards"], sharded_inputfile["Path of output directory"])
+        all_shards_done = all( antismash_cache.is_complete_antismash_output_directory(path) for path in sharded_inputfile["Paths of output directories of shards"] )
+        run_manifest.update_entry_of_run_manifest(manifest_of_task_1, sharded_inputfile["Key of input"], { "State" : "done" if all_shards_done else "failed", "Exit code" : 0 if all_shards_done else None })
+        if all_shards_done == True and sharded_inputfile["Path of directory of shards"] is not None:
+            shutil.rmtree(sharded_inputfile["Path of directory of shards"]) # Shards are no longer needed once all of them were analyzed successfully.
+        if all_shards_done == True:
+            report_finished_antismash_output(sharded_inputfile["Path of output directory"])
+    # # --------------Optional: merge Genbank files of regions from all shards of each large input file---------------
+
+    # # --------------Optional: write summary of pre-filter for all input files---------------
+    if side_options.filter_contigs_before_antismash == True and len(summaries_of_contig_prefilter) > 0:
+        prefilter_fasta.write_summary_of_contig_prefilter(summaries_of_contig_prefilter, names_and_paths.path_of_directory_of_statistics + names_and_paths.name_of_summary_of_contig_prefilter, min_length_of_contig, input_parameters.max_fraction_of_N_in_contig)
+    if os.path.isdir(names_and_paths.path_of_directory_of_filtered_fasta_files):
+        shutil.rmtree(names_and_paths.path_of_directory_of_filtered_fasta_files) # Filtered input files are no longer needed after antiSMASH (they are made again from the original input files in the next run of task 1).
+    # # --------------Optional: write summary of pre-filter for all input files---------------
+
+    print("\n\n\n>>> Task 1: Finished BGC-prediction by antiSMASH for " + str(number_of_antismash_runs) + " input file(s) in directory \"" + names_and_paths.name_of_input_directory_for_antismash + "\" (antiSMASH run time = " + str(round(antismash_run_time, 1)) + " s)" + (", reused results of antiSMASH for " + str(number_of_reused_antismash_results) + " input file(s)" if number_of_reused_antismash_results > 0 else "") + "!\n\n")
+    if len(summaries_of_contig_prefilter) > 0:
+        print(">>> Pre-filter removed " + str(sum(summary["Contigs removed (too short)"] + summary["Contigs removed (too many N)"] for summary in summaries_of_contig_prefilter)) + " contig(s) (" + "{:,}".format(sum(summary["bp removed (too short)"] + summary["bp removed (too many N)"] for summary in summaries_of_contig_prefilter)) + " bp) from " + str(len(summaries_of_contig_prefilter)) + " input file(s) before running antiSMASH (see file \"" + names_and_paths.name_of_summary_of_contig_prefilter + "\" in directory \"" + names_and_paths.name_of_directory_of_statistics + "\")!\n\n")
+    if len(sharded_inputfiles) > 0:
+        print(">>> Split " + str(len(sharded_inputfiles)) + " large input file(s) into " + str(sum(len(sharded_inputfile["Paths of output directories of shards"]) for sharded_inputfile in sharded_inputfiles)) + " shard(s) for antiSMASH (see option \"split_large_fasta_files_into_shards\")!\n\n")
+    if number_of_completed_inputfiles > 0:
+        print(">>> Skipped " + str(number_of_completed_inputfiles) + " input file(s) that were already analyzed by antiSMASH in an earlier run (see run manifest in directory \"" + names_and_paths.name_of_directory_of_run_manifests + "\")!\n\n")
+    if number_of_failed_antismash_runs > 0:
+        print(">>> antiSMASH failed for " + str(number_of_failed_antismash_runs) + " input file(s)! These will be analyzed again in the next run of task 1.\n\n")
     print("_"*200)
 
-    # # --------------Loop through list of input file(s) and run antiSMASH for each input file---------------
-
 # # --------------------------------------------------------------------------TASK 1 OF PIPELINE: Gene prediction with antiSMASH--------------------------------------------------------------------------
 
 
 # # --------------------------------------------------------------------------TASK 2 OF PIPELINE: BGC-selection from antiSMASH-output--------------------------------------------------------------------------
 
+# # -----------Select BGC of one input file of task 2 (or reuse selection result from an earlier run of task)-----------------------
+def select_BGC_of_inputfile(path_of_inputfile, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, BGC_stats, product_stats, manifest_of_task_2, inputfiles_for_later_selection=None):
+    """
+    Select the BGC of one input file of task 2 and update statistics, or reuse its selection result from an earlier run of task 2 (according to run manifest).
+
+    Parameters
+    ----------
+    path_of_inputfile                   : str
+        Path of a Genbank (.gbk) file in the deduplicated list of input files (might have the suffix "renamed"), also key of input file in run manifest.
+    param_for_preliminary_selection     : dict of {str : str}
+        Parameter for preliminary selection.
+    param_for_main_selection            : dict of {str : str}
+        Parameters for main selection.
+    param_for_2nd_chance_selection      : dict of {str : str}
+        Parameter for second-chance selection.
+    BGC_stats                           : dict of {str : int}
+        Statistics of BGC-selection.
+    product_stats                       : dict of {str : int}
+        Statistics of product(s) of selected BGCs.
+    manifest_of_task_2                  : dict
+        Run manifest of task 2.
+    inputfiles_for_later_selection      : list of dict or None
+        If given (and option "run_BGC_selection_in_parallel" or "keep_feature_store_of_BGCs" is set to True), input file is only added to this list and analyzed later.
+
+    Returns
+    -------
+    str
+        Path of copy of file in directory of selected BGCs, if BGC is selected.
+    None
+        Otherwise (or if input file is analyzed later).
+    """
+    # # -----------Get name and path of input file-----------------------
+    key_of_inputfile  = path_of_inputfile # Key of input file in run manifest.
+    name_of_inputfile = archive_input.name_of_file(path_of_inputfile) # Note: for a file in an archive, only the name of the file in archive (never "::", which would make a real path look like a path in archive). Note: this name might contain the suffix "renamed", added by the preprocessing step previously, to make name unique among all input file(s) of this task.
+    path_of_inputfile = re.sub("_+renamed$", "", path_of_inputfile) # Get the original, correct path of input file in case this path was modified in previous preprocessing step. Note: only omit the string "renamed" at the end of the path (i.e. in name of file), not also somewhere in the middle of the path, if there is any.
+    # # -----------Get name and path of input file-----------------------
+
+    # # --------------Optional: reuse selection result of input file from an earlier run of task------------------
+    entry_of_inputfile = None
+    if side_options.resume_unfinished_work_from_run_manifests == True:
+        entry_of_inputfile = run_manifest.get_entry_of_completed_input(manifest_of_task_2, key_of_inputfile, path_of_inputfile)
+
+    if entry_of_inputfile is not None:
+        if entry_of_inputfile["Selection status"] is None:
+            return None # Input file does not contain exactly one BGC (found out in an earlier run).
+        file_already_copied = entry_of_inputfile["Output path"] is not None and os.path.isfile(entry_of_inputfile["Output path"]) # Note: file of selected BGC must be copied again e.g. if directory of selected BGCs was cleared.
+        path_of_copied_file = make_outputfiles_and_stats.copy_file_of_selected_BGC_and_update_stats( entry_of_inputfile["Info of BGC"], \
+                                                                                                     entry_of_inputfile["Selection status"], \
+                                                                                                     name_of_inputfile ,\
+                                                                                                     path_of_inputfile, \
+                                                                                                     BGC_stats, \
+                                                                                                     product_stats, \
+                                                                                                     copy_file = not file_already_copied )
+        if file_already_copied == True:
+            path_of_copied_file = entry_of_inputfile["Output path"]
+        run_manifest.update_entry_of_run_manifest(manifest_of_task_2, key_of_inputfile, { "Output path" : path_of_copied_file }, save_at_once = False)
+        return path_of_copied_file
+    # # --------------Optional: reuse selection result of input file from an earlier run of task------------------
+
+    # # --------------Optional: analyze input file later (in a pool of worker processes, or from feature store of BGCs)------------------
+    if inputfiles_for_later_selection is not None and (side_options.run_BGC_selection_in_parallel == True or side_options.keep_feature_store_of_BGCs == True):
+        inputfiles_for_later_selection.append( { "Key of input" : key_of_inputfile, "Name of input file" : name_of_inputfile, "Path of input file" : path_of_inputfile } )
+        return None
+    # # --------------Optional: analyze input file later (in a pool of worker processes, or from feature store of BGCs)------------------
+
+    # # --------------Analysis of BGC, copy file of BGC if selected and update statistics------------------
+    result_for_inputfile = select_BGCs.select_BGC_in_file(path_of_inputfile, name_of_inputfile, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, BGC_stats, product_stats) # Analyze the BGC in query file (according to input parameters), copy file if BGC is selected and update statistics. Note: "Selection status" is None if file does not contain exactly one BGC.
+    # # --------------Analysis of BGC, copy file of BGC if selected and update statistics------------------
+
+    run_manifest.update_entry_of_run_manifest(manifest_of_task_2, key_of_inputfile, dict({ "State" : "done" }, **result_for_inputfile), path_of_inputfile, save_at_once = False)
+    return result_for_inputfile["Output path"]
+# # -----------Select BGC of one input file of task 2 (or reuse selection result from an earlier run of task)-----------------------
+
+
+# # -----------Report results of analysis and selection for all analyzed BGCs of task 2-----------------------
+def report_results_of_BGC_selection(param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, BGC_stats, product_stats, analysis_time):
+    """
+    Print selection parameters and statistics of BGC-selection to Terminal, make plots and statistics file.
+
+    Parameters
+    ----------
+    param_for_preliminary_selection     : dict of {str : str}
+        Parameter for preliminary selection.
+    param_for_main_selection            : dict of {str : str}
+        Parameters for main selection.
+    param_for_2nd_chance_selection      : dict of {str : str}
+        Parameter for second-chance selection.
+    BGC_stats                           : dict of {str : int}
+        Statistics of BGC-selection.
+    product_stats                       : dict of {str : int}
+        Statistics of product(s) of selected BGCs.
+    analysis_time                       : float
+        Analysis time (in s).
+
+    Returns
+    -------
+    None.
+
+    Output files
+    ------------
+    Plots and statistics file in directory "statistics".
+    """
+    print("\n\n\n>>> Task 2: Finished BGC-selection in directory \"" + names_and_paths.name_of_output_directory_from_antismash + "\" (analysis time = " + str(round(analysis_time, 1)) + " s) with the following values for the parameters:")
+
+    # # --------------Print out selection parameters------------------
+    print_to_terminal.print_parameters(param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection)
+    # # --------------Print out selection parameters------------------
+
+    path_of_stats_dir = create.create_directory_if_not_exists(names_and_paths.path_of_directory_of_statistics) # Create path of directory for plots and statistics file, if this does not exist already. Directory is also created.
+
+    if BGC_stats["All BGCs"] > 0: # Only make statistics if at least one BGC was found in directory for antiSMASH-output.
+        # # --------------Make plots and show statistics------------------
+        make_outputfiles_and_stats.plot_stats( param_for_preliminary_selection, \
+                                               param_for_main_selection, \
+                                               param_for_2nd_chance_selection, \
+                                               BGC_stats, \
+                                               product_stats, \
+                                               path_of_stats_dir )
+
+        print_to_terminal.print_BGC_stats(BGC_stats) # Print results of BGC-selection to Terminal.
+
+        print_to_terminal.print_product_stats(product_stats) # Print product statistics to Terminal (this should be executed after printing statistics of BGC-selection).
+
+        print("_"*200)
+        # # --------------Make plots and show statistics------------------
+
+    else: # In case no BGC was found in all analyzed antiSMASH-output directories:
+        print("\n\n\n> No BGC was found!\n\n")
+        print("_"*200)
+
+    # # --------------Make statistics file------------------
+    make_outputfiles_and_stats.make_stats_file( param_for_preliminary_selection, \
+                                                param_for_main_selection, \
+                                                param_for_2nd_chance_selection, \
+                                                BGC_stats, \
+                                                product_stats, \
+                                                path_of_stats_dir ) # Make statistics file for all analyzed antiSMASH-output (note: this file is made even if there was no BGC found in all antiSMASH-output).
+    # # --------------Make statistics file------------------
+# # -----------Report results of analysis and selection for all analyzed BGCs of task 2-----------------------
+
+
 def TASK_2(param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection):
     """
     Execute task 2 (BGC-selection).
@@ -161,7 +492,7 @@ def TASK_2(param_for_preliminary_selection, param_for_main_selection, param_for_
     # # --------------Define paths and create directory for input and output of task---------------
 
     # # --------------Optional: clear directory of selected BGCs before BGC-selection------------------
-    if side_options.clear_output_of_task_2 == True:
+    if side_options.clear_output_of_task_2 == True and side_options.sweep_selection_parameters_in_task_2 == False: # Note: a parameter sweep does not copy any file, so the directory of selected BGCs is kept.
         shutil.rmtree(path_of_output_dir_for_task_2) # Remove whole directory of selected BGCs.
         create.create_directory_if_not_exists(path_of_output_dir_for_task_2) # Create directory for selected BGCs again.
     # # --------------Optional: clear directory of selected BGCs before BGC-selection------------------
@@ -176,7 +507,8 @@ def TASK_2(param_for_preliminary_selection, param_for_main_selection, param_for_
     # From here, directory that contains output file(s) for antiSMASH is not empty (i.e. input for this task is available) and proceed to the next codes:
 
     # # --------------Unzip all file(s)/folder(s) in input directory---------------
-    unzip.unzip_all_files_and_folders_in_dir(path_of_input_dir_for_task_2)
+    if side_options.read_input_files_from_archives == False: # Otherwise, input files in archives are read directly from the archives (see below).
+        unzip.unzip_all_files_and_folders_in_dir(path_of_input_dir_for_task_2)
     # # --------------Unzip all file(s)/folder(s) in input directory---------------
 
     # # --------------Loop through input directory and find path(s) of all input file(s) for task---------------
@@ -187,12 +519,39 @@ def TASK_2(param_for_preliminary_selection, param_for_main_selection, param_for_
             if not name_of_file.startswith(tuple(names_and_paths.prefixes_of_names_of_incompatible_files)) and name_of_file.endswith(tuple(names_and_paths.file_extensions_of_antismash_outputfiles)): # Checkpoint: check if file is a correct input file for task (e.g. a .gbk file), but here not yet check if file (should be .gbk file) contains only one BGC or many (this is done below).
                 path_of_inputfile = os.path.join(dir, name_of_file)
                 inputpaths.append(path_of_inputfile)
+            elif side_options.read_input_files_from_archives == True and name_of_file.endswith(tuple(archive_input.file_extensions_of_archives)): # Genbank files in an archive (e.g. .zip, .tar.gz) are read directly from the archive.
+                inputpaths.extend(archive_input.list_files_in_archive(os.path.join(dir, name_of_file), names_and_paths.file_extensions_of_antismash_outputfiles))
     # # --------------Loop through input directory and find path(s) of all input file(s) for task---------------
 
     # # --------------Deduplicate input---------------
     deduplicate.remove_or_rename_files_with_duplicate_name(inputpaths) # Remove or rename paths in the list of antiSMASH-output files with duplicate name, which will make a list of paths of input files each with a unique name.
     # # --------------Deduplicate input---------------
 
+    # # --------------Optional: parameter sweep (assess all BGCs for a grid of values for selection parameters) instead of BGC-selection------------------
+    if side_options.sweep_selection_parameters_in_task_2 == True:
+        start_of_sweep = time.time()
+
+        paths_of_inputfiles = [ re.sub("_+renamed$", "", path_of_inputfile) for path_of_inputfile in inputpaths ] # Original, correct paths of input files.
+        feature_store, _    = BGC_feature_store.update_feature_store( BGC_feature_store.load_feature_store(), \
+                                                                      paths_of_inputfiles, \
+                                                                      input_parameters.number_of_processes_for_BGC_selection if side_options.run_BGC_selection_in_parallel == True else 1, \
+                                                                      input_parameters.number_of_files_per_chunk_for_BGC_selection ) # Each file is read only once (files that are already in feature store are not read again).
+        if side_options.keep_feature_store_of_BGCs == True:
+            BGC_feature_store.save_feature_store(feature_store)
+
+        grid = parameter_sweep.make_grid_of_selection_parameters( input_parameters.sweep_min_num_of_core_genes, \
+                                                                  input_parameters.sweep_min_length, \
+                                                                  input_parameters.sweep_min_distance, \
+                                                                  input_parameters.sweep_min_num_of_additional_genes_for_main_selection, \
+                                                                  input_parameters.sweep_min_num_of_additional_genes_for_2nd_chance_selection )
+        table_of_parameter_sweep = parameter_sweep.sweep_selection_parameters(feature_store.loc[paths_of_inputfiles], grid)
+        parameter_sweep.write_table_of_parameter_sweep(table_of_parameter_sweep, names_and_paths.path_of_directory_of_statistics, names_and_paths.name_of_table_of_parameter_sweep)
+
+        print("\n\n\n>>> Task 2: Finished parameter sweep for " + str(len(grid)) + " combination(s) of values for selection parameters in directory \"" + names_and_paths.name_of_output_directory_from_antismash + "\" (time = " + str(round(time.time() - start_of_sweep, 1)) + " s)! Results can be found in file \"" + names_and_paths.name_of_table_of_parameter_sweep + "\" in directory \"" + names_and_paths.name_of_directory_of_statistics + "\".\n\n")
+        print("_"*200)
+        return # No BGC-selection (and no files copied) in a parameter sweep.
+    # # --------------Optional: parameter sweep (assess all BGCs for a grid of values for selection parameters) instead of BGC-selection------------------
+
     start_analysis = time.time() # For results report.
 
     # # --------------Define dictionaries for statistics of BGCs (selected + discarded + all) and their products (only of selected BGCs) found in all antiSMASH-output------------------
@@ -208,76 +567,52 @@ def TASK_2(param_for_preliminary_selection, param_for_main_selection, param_for_
 
     if side_options.verbose == True: print("\n\n")
 
-    # # --------------Loop through list of input file(s) and analyze each BGC---------------
-    for path_of_inputfile in inputpaths:
-        # # -----------Get name and path of input file-----------------------
-        name_of_inputfile = path_of_inputfile.split("/")[-1] # Note: this name might contain the suffix "renamed", added by the preprocessing step previously, to make name unique among all input file(s) of this task.
-        path_of_inputfile = re.sub("_+renamed$", "", path_of_inputfile) # Get the original, correct path of input file in case this path was modified in previous preprocessing step. Note: only omit the string "renamed" at the end of the path (i.e. in name of file), not also somewhere in the middle of the path, if there is any.
-        # # -----------Get name and path of input file-----------------------
-
-        with open(path_of_inputfile, "r") as file_object:
-            file_content = file_object.read()
+    # # --------------Load run manifest of task (records selection result of each input file from earlier runs with the same parameters)---------------
+    manifest_of_task_2 = run_manifest.load_run_manifest("task_2", parameters = { "Preliminary selection" : param_for_preliminary_selection, "Main selection" : param_for_main_selection, "Second-chance selection" : param_for_2nd_chance_selection })
+    # # --------------Load run manifest of task (records selection result of each input file from earlier runs with the same parameters)---------------
 
-        if len(re.findall(delimiter_btw_data_of_genes_and_DNA_seq_of_whole_BGC, file_content)) == 1 and label_for_file_of_one_BGC in file_content: # Important: check if input file (.gbk) contains only one BGC. Note: these textual tags are imported from module "analyze_and_assess.py" (see above).
-
-            # # --------------Analysis of BGC------------------
-            info_of_BGC, selection_status_for_BGC = analyze_and_assess.analyze_and_assess_BGC(file_content, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection) # Analyze the BGC in query file (according to input parameters) and return selection result.
-            # # --------------Analysis of BGC------------------
-
-            if side_options.verbose == True: print("> Complete analysis of BGC in file \"" + name_of_inputfile + "\"!")
+    # # --------------Loop through list of input file(s) and analyze each BGC---------------
+    inputfiles_for_later_selection = [] # Input files that are analyzed after the loop, in a pool of worker processes or from feature store of BGCs (only if option "run_BGC_selection_in_parallel" or "keep_feature_store_of_BGCs" is set to True).
 
-            # # --------------Copy file of BGC if selected and update statistics------------------
-            make_outputfiles_and_stats.copy_file_of_selected_BGC_and_update_stats( info_of_BGC, \
-                                                                                   selection_status_for_BGC, \
-                                                                                   name_of_inputfile ,\
-                                                                                   path_of_inputfile, \
-                                                                                   BGC_stats, \
-                                                                                   product_stats ) # Note: "info_of_BGC" contains product of BGC that is needed to update statistics of selected BGCs and their products, if BGC is selected.
-            # # --------------Copy file of BGC if selected and update statistics------------------
+    for path_of_inputfile in inputpaths:
+        select_BGC_of_inputfile(path_of_inputfile, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, BGC_stats, product_stats, manifest_of_task_2, inputfiles_for_later_selection) # Note: input file can be reused from an earlier run of task, or be analyzed later (see below).
+
+    # # --------------Optional: analyze input files from feature store of BGCs, or in a pool of worker processes------------------
+    number_of_processes_for_BGC_selection = input_parameters.number_of_processes_for_BGC_selection if side_options.run_BGC_selection_in_parallel == True else 1
+
+    if len(inputfiles_for_later_selection) > 0 and side_options.keep_feature_store_of_BGCs == True:
+        number_of_read_files = select_BGCs.select_BGCs_in_files_with_feature_store( inputfiles_for_later_selection, \
+                                                                                    param_for_preliminary_selection, \
+                                                                                    param_for_main_selection, \
+                                                                                    param_for_2nd_chance_selection, \
+                                                                                    BGC_stats, \
+                                                                                    product_stats, \
+                                                                                    number_of_processes_for_BGC_selection, \
+                                                                                    input_parameters.number_of_files_per_chunk_for_BGC_selection, \
+                                                                                    manifest_of_task_2 ) # Only new or changed files are read, all other BGCs are assessed from feature store.
+        if side_options.verbose == True: print("> Read " + str(number_of_read_files) + " new or changed file(s), assessed " + str(len(inputfiles_for_later_selection) - number_of_read_files) + " file(s) from feature store of BGCs!")
+
+    elif len(inputfiles_for_later_selection) > 0:
+        select_BGCs.select_BGCs_in_files_in_parallel( inputfiles_for_later_selection, \
+                                                      param_for_preliminary_selection, \
+                                                      param_for_main_selection, \
+                                                      param_for_2nd_chance_selection, \
+                                                      BGC_stats, \
+                                                      product_stats, \
+                                                      number_of_processes_for_BGC_selection, \
+                                                      input_parameters.number_of_files_per_chunk_for_BGC_selection, \
+                                                      manifest_of_task_2 ) # Statistics of all worker processes are merged into "BGC_stats" and "product_stats".
+    # # --------------Optional: analyze input files from feature store of BGCs, or in a pool of worker processes------------------
+
+    run_manifest.save_run_manifest(manifest_of_task_2)
+    archive_input.close_all_archives() # Input files in archives are no longer read.
 
     end_analysis  = time.time() # Stop analysis time
     analysis_time = end_analysis - start_analysis # For results report.
     # # --------------Loop through list of input file(s) and analyze each BGC---------------
 
     # # --------------Report results of analysis and selection for all analyzed BGCs------------------
-
-    print("\n\n\n>>> Task 2: Finished BGC-selection in directory \"" + names_and_paths.name_of_output_directory_from_antismash + "\" (analysis time = " + str(round(analysis_time, 1)) + " s) with the following values for the parameters:")
-
-    # # --------------Print out selection parameters------------------
-    print_to_terminal.print_parameters(param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection)
-    # # --------------Print out selection parameters------------------
-
-    path_of_stats_dir = create.create_directory_if_not_exists(names_and_paths.path_of_directory_of_statistics) # Create path of directory for plots and statistics file, if this does not exist already. Directory is also created.
-
-    if BGC_stats["All BGCs"] > 0: # Only make statistics if at least one BGC was found in directory for antiSMASH-output.
-        # # --------------Make plots and show statistics------------------
-        make_outputfiles_and_stats.plot_stats( param_for_preliminary_selection, \
-                                               param_for_main_selection, \
-                                               param_for_2nd_chance_selection, \
-                                               BGC_stats, \
-                                               product_stats, \
-                                               path_of_stats_dir )
-
-        print_to_terminal.print_BGC_stats(BGC_stats) # Print results of BGC-selection to Terminal.
-
-        print_to_terminal.print_product_stats(product_stats) # Print product statistics to Terminal (this should be executed after printing statistics of BGC-selection).
-
-        print("_"*200)
-        # # --------------Make plots and show statistics------------------
-
-    else: # In case no BGC was found in all analyzed antiSMASH-output directories:
-        print("\n\n\n> No BGC was found!\n\n")
-        print("_"*200)
-
-    # # --------------Make statistics file------------------
-    make_outputfiles_and_stats.make_stats_file( param_for_preliminary_selection, \
-                                                param_for_main_selection, \
-                                                param_for_2nd_chance_selection, \
-                                                BGC_stats, \
-                                                product_stats, \
-                                                path_of_stats_dir ) # Make statistics file for all analyzed antiSMASH-output (note: this file is made even if there was no BGC found in all antiSMASH-output).
-    # # --------------Make statistics file------------------
-
+    report_results_of_BGC_selection(param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, BGC_stats, product_stats, analysis_time)
     # # --------------Report results of analysis and selection for all analyzed BGCs------------------
 
 # # --------------------------------------------------------------------------TASK 2 OF PIPELINE: BGC-selection from antiSMASH-output--------------------------------------------------------------------------
@@ -285,14 +620,16 @@ def TASK_2(param_for_preliminary_selection, param_for_main_selection, param_for_
 
 # # --------------------------------------------------------------------------TASK 3 OF PIPELINE: Similarity analysis with BiGSCAPE--------------------------------------------------------------------------
 
-def TASK_3(cutoffs):
+def TASK_3(cutoffs, inputpaths=None):
     """
     Execute task 3 (similarity analysis by BiGSCAPE).
 
     Parameters
     ----------
-    cutoffs : one or many float values in range [0, 1], separated by whitespace
+    cutoffs     : one or many float values in range [0, 1], separated by whitespace
         Maximum distance of BGCs in a GCF.
+    inputpaths  : list of str or None
+        Paths of files of selected BGCs (given by function "PIPELINE", i.e. task 2 that ran while task 1 was still running). None: search directory of selected BGCs for input files (default).
 
     Input files
     -----------
@@ -321,44 +658,201 @@ def TASK_3(cutoffs):
         create.create_directory_if_not_exists(path_of_output_dir_for_task_3) # Create directory for BiGSCAPE output again.
     # # --------------Optional: clear BiGSCAPE-output directory before running BiGSCAPE------------------
 
-    # # --------------Checkpoint: check if directory of selected BGCs is not empty (input for this task)------------------
-    if len(os.listdir(path_of_input_dir_for_task_3)) == 0:
-        print("\n\n\n>>> Input directory \"" + names_and_paths.name_of_directory_of_selected_BGCs + "\" is empty! Task terminated!\n\n")
-        print("_"*200)
-        return # In case directory for selected BGCs is empty: end execution of task.
-    # # --------------Checkpoint: check if directory of selected BGCs is not empty (input for this task)------------------
-
-    # From here, directory that contains selected BGCs is not empty (i.e. input for this task is available) and proceed to the next codes:
-
-    # # --------------Unzip all file(s)/folder(s) in input directory---------------
-    unzip.unzip_all_files_and_folders_in_dir(path_of_input_dir_for_task_3)
-    # # --------------Unzip all file(s)/folder(s) in input directory---------------
-
-    # # --------------Loop through input directory and find path(s) of all input file(s) for task---------------
-    inputpaths = [] # Define a list that will contain paths of all files of selected BGCs.
-
-    for dir, subdirs, files in os.walk(path_of_input_dir_for_task_3, topdown=True): # "os.walk()": loop through all folders and files in directory with given path "path_of_input_dir_for_task_3". "dir": path of a certain directory found inside the directory of given path "path_of_input_dir_for_task_3", "subdirs": contains name(s) of subdirectory(-ies) in the directory "dir", "files": contains name(s) of file(s) in the directory "dir". "topdown": search from given directory with given path to its deepest file(s)/folder(s).
-        for name_of_file in files: # Loop through all file(s) that can be found in directory of given path "path_of_input_dir_for_task_3", here directory of selected BGCs.
-            if not name_of_file.startswith(tuple(names_and_paths.prefixes_of_names_of_incompatible_files)) and name_of_file.endswith(tuple(names_and_paths.file_extensions_of_antismash_outputfiles)): # Checkpoint: check if file is a correct input file for task (e.g. a .gbk file of a selected BGC).
-                path_of_inputfile = os.path.join(dir, name_of_file)
-                with open(path_of_inputfile, "r") as file_object:
+    if inputpaths is None: # Otherwise, input files were already found (and checked) by function "PIPELINE".
+        # # --------------Checkpoint: check if directory of selected BGCs is not empty (input for this task)------------------
+        if len(os.listdir(path_of_input_dir_for_task_3)) == 0:
+            print("\n\n\n>>> Input directory \"" + names_and_paths.name_of_directory_of_selected_BGCs + "\" is empty! Task terminated!\n\n")
+            print("_"*200)
+            return # In case directory for selected BGCs is empty: end execution of task.
+        # # --------------Checkpoint: check if directory of selected BGCs is not empty (input for this task)------------------
+
+        # From here, directory that contains selected BGCs is not empty (i.e. input for this task is available) and proceed to the next codes:
+
+        # # --------------Unzip all file(s)/folder(s) in input directory---------------
+        if side_options.read_input_files_from_archives == False: # Otherwise, input files in archives are read directly from the archives (see below).
+            unzip.unzip_all_files_and_folders_in_dir(path_of_input_dir_for_task_3)
+        # # --------------Unzip all file(s)/folder(s) in input directory---------------
+
+        # # --------------Loop through input directory and find path(s) of all input file(s) for task---------------
+        inputpaths = [] # Define a list that will contain paths of all files of selected BGCs.
+
+        for dir, subdirs, files in os.walk(path_of_input_dir_for_task_3, topdown=True): # "os.walk()": loop through all folders and files in directory with given path "path_of_input_dir_for_task_3". "dir": path of a certain directory found inside the directory of given path "path_of_input_dir_for_task_3", "subdirs": contains name(s) of subdirectory(-ies) in the directory "dir", "files": contains name(s) of file(s) in the directory "dir". "topdown": search from given directory with given path to its deepest file(s)/folder(s).
+            paths_of_candidate_files = [] # Paths of possible input files in directory "dir" (or in archives in directory "dir").
+            for name_of_file in files: # Loop through all file(s) that can be found in directory of given path "path_of_input_dir_for_task_3", here directory of selected BGCs.
+                if not name_of_file.startswith(tuple(names_and_paths.prefixes_of_names_of_incompatible_files)) and name_of_file.endswith(tuple(names_and_paths.file_extensions_of_antismash_outputfiles)): # Checkpoint: check if file is a correct input file for task (e.g. a .gbk file of a selected BGC).
+                    paths_of_candidate_files.append(os.path.join(dir, name_of_file))
+                elif side_options.read_input_files_from_archives == True and name_of_file.endswith(tuple(archive_input.file_extensions_of_archives)): # Genbank files in an archive (e.g. .zip, .tar.gz) are read directly from the archive.
+                    paths_of_candidate_files.extend(archive_input.list_files_in_archive(os.path.join(dir, name_of_file), names_and_paths.file_extensions_of_antismash_outputfiles))
+
+            for path_of_inputfile in paths_of_candidate_files:
+                with archive_input.open_file(path_of_inputfile, "r") as file_object:
                     file_content = file_object.read()
 
                 if len(re.findall(delimiter_btw_data_of_genes_and_DNA_seq_of_whole_BGC, file_content)) == 1 and label_for_file_of_one_BGC in file_content: # Important: check if input file (.gbk) contains only one BGC.
                     inputpaths.append(path_of_inputfile)
-    # # --------------Loop through input directory and find path(s) of all input file(s) for task---------------
+        # # --------------Loop through input directory and find path(s) of all input file(s) for task---------------
+
+    elif len(inputpaths) == 0:
+        print("\n\n\n>>> No BGC was selected in task 2! Task terminated!\n\n")
+        print("_"*200)
+        return # In case no BGC was selected: end execution of task.
 
     # # --------------Deduplicate input---------------
     deduplicate.remove_or_rename_files_with_duplicate_name(inputpaths) # Remove or rename paths in the list of antiSMASH-output files with duplicate name, which will make a list of paths of input files each with a unique name.
     # # --------------Deduplicate input---------------
 
+    # # --------------Optional: collapse identical BGCs (e.g. the same BGC found in several samples) into one representative------------------
+    if side_options.collapse_identical_BGCs_before_task_3 == True:
+        number_of_BGCs_before_collapsing = len(inputpaths)
+        inputpaths, members_of_groups    = deduplicate_BGCs.collapse_identical_BGCs(inputpaths, side_options.compare_BGCs_by_translations_of_core_genes, input_parameters.min_similarity_for_near_identical_BGCs if side_options.collapse_near_identical_BGCs == True else None)
+        deduplicate_BGCs.write_table_of_members_of_identical_BGCs(members_of_groups, names_and_paths.path_of_directory_of_statistics + names_and_paths.name_of_table_of_members_of_identical_BGCs, path_of_input_dir_for_task_3)
+        print("\n\n\n>>> Task 3: Collapsed " + str(number_of_BGCs_before_collapsing) + " query BGCs into " + str(len(inputpaths)) + " unique BGCs (all members of each group are listed in file \"" + names_and_paths.name_of_table_of_members_of_identical_BGCs + "\" in directory \"" + names_and_paths.name_of_directory_of_statistics + "\").")
+    # # --------------Optional: collapse identical BGCs (e.g. the same BGC found in several samples) into one representative------------------
+
+    # # --------------Optional: find nearest BGCs from MIBiG of all query BGCs by reference index of MIBiG (known or novel BGCs)------------------
+    reference_index = None # Reference index of MIBiG: if loaded, BiGSCAPE only analyzes the nearest BGCs from MIBiG of its query BGCs.
+    hits_of_BGCs    = {}
+
+    if side_options.use_MIBiG_reference_index_in_task_3 == True:
+        reference_index = MIBiG_reference_index.load_MIBiG_reference_index()
+        if reference_index is None and input_parameters.path_of_local_Genbank_files_of_MIBiG != "": # Build reference index once (used by all later runs).
+            print("\n\n\n>>> Task 3: Building reference index of MIBiG from \"" + input_parameters.path_of_local_Genbank_files_of_MIBiG + "\"...")
+            MIBiG_reference_index.build_MIBiG_reference_index(input_parameters.path_of_local_Genbank_files_of_MIBiG)
+            reference_index = MIBiG_reference_index.load_MIBiG_reference_index()
+
+        if reference_index is None:
+            print("\n\n\n>>> Task 3: No reference index of MIBiG found in directory \"" + names_and_paths.name_of_directory_of_MIBiG_reference_index + "\" (see module \"MIBiG_reference_index.py\")! All BGCs from MIBiG are analyzed by BiG-SCAPE CORASON (if BGCs from MIBiG are analyzed).")
+        else:
+            start_of_search      = time.time()
+            hits_of_BGCs         = MIBiG_reference_index.find_nearest_MIBiG_BGCs(reference_index, inputpaths, input_parameters.max_number_of_nearest_MIBiG_BGCs, input_parameters.min_similarity_for_nearest_MIBiG_BGCs)
+            number_of_known_BGCs = MIBiG_reference_index.write_table_of_nearest_MIBiG_BGCs(reference_index, hits_of_BGCs, input_parameters.min_similarity_for_known_BGC, names_and_paths.path_of_directory_of_statistics + names_and_paths.name_of_table_of_nearest_MIBiG_BGCs, path_of_input_dir_for_task_3)
+            print("\n\n\n>>> Task 3: Found nearest BGCs from MIBiG of " + str(len(inputpaths)) + " query BGCs: " + str(number_of_known_BGCs) + " known and " + str(len(inputpaths) - number_of_known_BGCs) + " novel BGCs (time = " + str(round(time.time() - start_of_search, 1)) + " s, see file \"" + names_and_paths.name_of_table_of_nearest_MIBiG_BGCs + "\" in directory \"" + names_and_paths.name_of_directory_of_statistics + "\").")
+    # # --------------Optional: find nearest BGCs from MIBiG of all query BGCs by reference index of MIBiG (known or novel BGCs)------------------
+
+    # # --------------Optional: group BGCs into provisional GCFs (by MinHash sketches and LSH) for a quick overview or to split task into smaller runs of BiGSCAPE------------------
+    batches_of_inputpaths = [ inputpaths ] # Paths of input files of each run of BiGSCAPE.
+
+    if side_options.precluster_BGCs_before_task_3 == True:
+        start_of_preclustering = time.time()
+        provisional_GCFs       = precluster_BGCs.find_provisional_GCFs( inputpaths, \
+                                                                        input_parameters.length_of_kmers_for_preclustering, \
+                                                                        input_parameters.number_of_bands_for_preclustering, \
+                                                                        input_parameters.number_of_rows_per_band_for_preclustering, \
+                                                                        input_parameters.min_similarity_for_preclustering )
+        if side_options.skip_BiGSCAPE_after_preclustering == False and side_options.run_matrix_of_settings_in_task_3 == False:
+            batches_of_inputpaths = precluster_BGCs.make_batches_of_provisional_GCFs(provisional_GCFs, input_parameters.max_number_of_BGCs_per_BiGSCAPE_run)
+        precluster_BGCs.write_table_of_provisional_GCFs(provisional_GCFs, batches_of_inputpaths if len(batches_of_inputpaths) > 1 else None, names_and_paths.path_of_directory_of_statistics + names_and_paths.name_of_table_of_provisional_GCFs, path_of_input_dir_for_task_3)
+        print("\n\n\n>>> Task 3: Grouped " + str(len(inputpaths)) + " query BGCs into " + str(len(provisional_GCFs)) + " provisional GCFs (time = " + str(round(time.time() - start_of_preclustering, 1)) + " s, see file \"" + names_and_paths.name_of_table_of_provisional_GCFs + "\" in directory \"" + names_and_paths.name_of_directory_of_statistics + "\").")
+
+        if side_options.skip_BiGSCAPE_after_preclustering == True:
+            archive_input.close_all_archives()
+            print("_"*200)
+            return # Quick overview of BGCs only, without BiGSCAPE.
+    # # --------------Optional: group BGCs into provisional GCFs (by MinHash sketches and LSH) for a quick overview or to split task into smaller runs of BiGSCAPE------------------
+
+    # # --------------Optional: run BiGSCAPE separately for batches of provisional GCFs------------------
+    if len(batches_of_inputpaths) > 1:
+        manifest_of_task_3          = run_manifest.load_run_manifest("task_3", parameters = { "cutoffs" : cutoffs, "MIBiG" : side_options.analyze_query_BGCs_with_BGCs_from_MIBiG, "Batches of provisional GCFs" : True, "Nearest BGCs from MIBiG only" : reference_index is not None })
+        number_of_successful_runs   = 0
+
+        for number_of_batch, batch_of_inputpaths in enumerate(batches_of_inputpaths, start = 1):
+            key_of_bigscape_run         = "BiG-SCAPE run of batch " + str(number_of_batch)
+            paths_of_reference_BGCs     = MIBiG_reference_index.paths_of_nearest_MIBiG_BGCs(reference_index, hits_of_BGCs, batch_of_inputpaths) if reference_index is not None else None
+            fingerprint_of_inputfiles   = run_manifest.make_fingerprint_of_inputfiles(batch_of_inputpaths, paths_of_reference_BGCs)
+            entry_of_bigscape_run       = run_manifest.get_entry_of_completed_input(manifest_of_task_3, key_of_bigscape_run)
+            if side_options.resume_unfinished_work_from_run_manifests == True and entry_of_bigscape_run is not None and entry_of_bigscape_run.get("Fingerprint of inputs") == fingerprint_of_inputfiles and os.path.isdir(entry_of_bigscape_run["Output path"]):
+                number_of_successful_runs += 1
+                continue # BiGSCAPE was already run successfully for this batch in an earlier run.
+
+            run_manifest.update_entry_of_run_manifest(manifest_of_task_3, key_of_bigscape_run, { "State" : "running", "Fingerprint of inputs" : fingerprint_of_inputfiles, "Exit code" : None, "Output path" : None })
+            start_bigscape_run      = time.time()
+            result_of_bigscape_run  = {} # Statistics of run (e.g. CPU time, path of log file), see module "run_process.py".
+            path_of_output_directory_from_bigscape = run_bigscape.run_bigscape( batch_of_inputpaths, cutoffs, \
+                                                                                path_of_output_directory_from_bigscape  = path_of_output_dir_for_task_3 + "batch_" + str(number_of_batch) + "/", \
+                                                                                paths_of_reference_BGCs                 = paths_of_reference_BGCs, \
+                                                                                result_of_run                           = result_of_bigscape_run )
+            run_manifest.update_entry_of_run_manifest(manifest_of_task_3, key_of_bigscape_run, dict({ "State" : "done" if path_of_output_directory_from_bigscape != False else "failed", "Exit code" : 0 if path_of_output_directory_from_bigscape != False else None, "Duration (in s)" : round(time.time() - start_bigscape_run, 1), "Output path" : path_of_output_directory_from_bigscape if path_of_output_directory_from_bigscape != False else None }, **run_process.fields_for_run_manifest(result_of_bigscape_run)))
+            number_of_successful_runs += path_of_output_directory_from_bigscape != False
+
+        archive_input.close_all_archives()
+        print("\n\n\n>>> Task 3: Finished similarity analysis by BiG-SCAPE CORASON for query BGCs in directory \"" + names_and_paths.name_of_directory_of_selected_BGCs + "\" in " + str(number_of_successful_runs) + " of " + str(len(batches_of_inputpaths)) + " batches of provisional GCFs (results in subdirectories \"batch_...\" of directory \"" + names_and_paths.name_of_output_directory_from_bigscape + "\") with value for parameter \"cutoffs\" = " + str(cutoffs) + "!\n\n")
+        print("_"*200)
+        return
+    # # --------------Optional: run BiGSCAPE separately for batches of provisional GCFs------------------
+
+    # # --------------Optional: run BiGSCAPE for a matrix of settings (values for "cutoffs" x settings for BGCs from MIBiG) with shared input files and prediction of domains------------------
+    if side_options.run_matrix_of_settings_in_task_3 == True:
+        matrix_of_settings          = bigscape_matrix.make_matrix_of_settings(cutoffs, input_parameters.MIBiG_settings_for_matrix_of_task_3)
+        MIBiG_settings              = list(dict.fromkeys( MIBiG_setting for MIBiG_setting, _ in matrix_of_settings )) # BiGSCAPE runs once per setting for BGCs from MIBiG, with all values for "cutoffs" at once.
+        manifest_of_task_3          = run_manifest.load_run_manifest("task_3", parameters = { "cutoffs" : cutoffs, "MIBiG settings of matrix" : MIBiG_settings, "Nearest BGCs from MIBiG only" : reference_index is not None })
+        paths_of_reference_BGCs     = MIBiG_reference_index.paths_of_nearest_MIBiG_BGCs(reference_index, hits_of_BGCs, inputpaths) if reference_index is not None else None
+        fingerprint_of_inputfiles   = run_manifest.make_fingerprint_of_inputfiles(inputpaths, paths_of_reference_BGCs)
+
+        path_of_staged_input_directory          = run_bigscape.stage_input_files_for_bigscape(inputpaths) # Input files are put into the input directory of BiGSCAPE only once for all runs.
+        names_of_query_BGCs                     = { name_of_inputfile.removesuffix(".gbk") for name_of_inputfile in os.listdir(path_of_staged_input_directory) }
+        GCF_assignments_of_MIBiG_settings       = {}
+        path_of_output_directory_of_earlier_run = None # Output directory of the first successful run, whose predicted domains are reused by the next runs.
+
+        for MIBiG_setting in MIBiG_settings:
+            key_of_bigscape_run     = "BiG-SCAPE run " + bigscape_matrix.name_of_MIBiG_setting(MIBiG_setting)
+            entry_of_bigscape_run   = run_manifest.get_entry_of_completed_input(manifest_of_task_3, key_of_bigscape_run)
+            if side_options.resume_unfinished_work_from_run_manifests == True and entry_of_bigscape_run is not None and entry_of_bigscape_run.get("Fingerprint of inputs") == fingerprint_of_inputfiles and os.path.isdir(entry_of_bigscape_run["Output path"]):
+                path_of_output_directory_from_bigscape = entry_of_bigscape_run["Output path"] # BiGSCAPE was already run successfully with this setting in an earlier run.
+            else:
+                run_manifest.update_entry_of_run_manifest(manifest_of_task_3, key_of_bigscape_run, { "State" : "running", "Fingerprint of inputs" : fingerprint_of_inputfiles, "Exit code" : None, "Output path" : None })
+                start_bigscape_run      = time.time()
+                result_of_bigscape_run  = {} # Statistics of run (e.g. CPU time, path of log file), see module "run_process.py".
+                path_of_output_directory_from_bigscape = run_bigscape.run_bigscape( inputpaths, cutoffs, MIBiG_setting, \
+                                                                                    path_of_output_directory_from_bigscape  = path_of_output_dir_for_task_3 + bigscape_matrix.name_of_MIBiG_setting(MIBiG_setting) + "/", \
+                                                                                    path_of_staged_input_directory          = path_of_staged_input_directory, \
+                                                                                    path_of_output_directory_of_earlier_run = path_of_output_directory_of_earlier_run, \
+                                                                                    paths_of_reference_BGCs                 = paths_of_reference_BGCs, \
+                                                                                    result_of_run                           = result_of_bigscape_run )
+                run_manifest.update_entry_of_run_manifest(manifest_of_task_3, key_of_bigscape_run, dict({ "State" : "done" if path_of_output_directory_from_bigscape != False else "failed", "Exit code" : 0 if path_of_output_directory_from_bigscape != False else None, "Duration (in s)" : round(time.time() - start_bigscape_run, 1), "Output path" : path_of_output_directory_from_bigscape if path_of_output_directory_from_bigscape != False else None }, **run_process.fields_for_run_manifest(result_of_bigscape_run)))
+
+            if path_of_output_directory_from_bigscape != False:
+                if path_of_output_directory_of_earlier_run is None:
+                    path_of_output_directory_of_earlier_run = path_of_output_directory_from_bigscape
+                GCF_assignments_of_MIBiG_settings[MIBiG_setting] = bigscape_matrix.read_GCF_assignments(path_of_output_directory_from_bigscape)
+
+        shutil.rmtree(path_of_staged_input_directory) # Remove input directory after the last run of BiGSCAPE.
+        archive_input.close_all_archives()
+
+        if len(GCF_assignments_of_MIBiG_settings) > 0:
+            bigscape_matrix.write_table_of_GCF_assignments(GCF_assignments_of_MIBiG_settings, matrix_of_settings, names_of_query_BGCs, names_and_paths.path_of_directory_of_statistics + names_and_paths.name_of_table_of_GCF_assignments_of_settings)
+            print("\n\n\n>>> Task 3: Finished similarity analysis by BiG-SCAPE CORASON for query BGCs in directory \"" + names_and_paths.name_of_directory_of_selected_BGCs + "\" for " + str(len(matrix_of_settings)) + " combination(s) of settings (" + str(len(GCF_assignments_of_MIBiG_settings)) + " of " + str(len(MIBiG_settings)) + " run(s) of BiG-SCAPE CORASON successful)! Families of BGCs for each combination can be found in file \"" + names_and_paths.name_of_table_of_GCF_assignments_of_settings + "\" in directory \"" + names_and_paths.name_of_directory_of_statistics + "\".\n\n")
+        print("_"*200)
+        return
+    # # --------------Optional: run BiGSCAPE for a matrix of settings (values for "cutoffs" x settings for BGCs from MIBiG) with shared input files and prediction of domains------------------
+
     task_executed_successfully = False # Define a control variable for reporting results. This variable assumes at the beginning that the task is not (yet) successfully executed.
 
-    task_executed_successfully = run_bigscape.run_bigscape(inputpaths, cutoffs)
+    # # --------------Optional: skip task if BiGSCAPE was already run successfully for the same input file(s) and parameters------------------
+    manifest_of_task_3           = run_manifest.load_run_manifest("task_3", parameters = { "cutoffs" : cutoffs, "MIBiG" : side_options.analyze_query_BGCs_with_BGCs_from_MIBiG, "Nearest BGCs from MIBiG only" : reference_index is not None })
+    paths_of_reference_BGCs      = MIBiG_reference_index.paths_of_nearest_MIBiG_BGCs(reference_index, hits_of_BGCs, inputpaths) if reference_index is not None else None # Nearest BGCs from MIBiG of the query BGCs (see module "MIBiG_reference_index.py").
+    fingerprint_of_inputfiles    = run_manifest.make_fingerprint_of_inputfiles(inputpaths, paths_of_reference_BGCs) # Paths, sizes and times of last modification of all input files (and paths of nearest BGCs from MIBiG).
+
+    if side_options.resume_unfinished_work_from_run_manifests == True:
+        entry_of_bigscape_run = run_manifest.get_entry_of_completed_input(manifest_of_task_3, "BiG-SCAPE run")
+        if entry_of_bigscape_run is not None and entry_of_bigscape_run.get("Fingerprint of inputs") == fingerprint_of_inputfiles and os.path.isdir(entry_of_bigscape_run["Output path"]):
+            print("\n\n\n>>> Task 3: BiG-SCAPE CORASON was already run successfully for the same query BGCs and parameters in an earlier run (results in \"" + entry_of_bigscape_run["Output path"] + "\")! Task skipped!\n\n")
+            print("_"*200)
+            return
+    # # --------------Optional: skip task if BiGSCAPE was already run successfully for the same input file(s) and parameters------------------
+
+    run_manifest.update_entry_of_run_manifest(manifest_of_task_3, "BiG-SCAPE run", { "State" : "running", "Fingerprint of inputs" : fingerprint_of_inputfiles, "Exit code" : None, "Output path" : None })
+    start_bigscape_run      = time.time()
+    result_of_bigscape_run  = {} # Statistics of run (e.g. CPU time, path of log file), see module "run_process.py".
+
+    path_of_output_directory_from_bigscape = run_bigscape.run_bigscape(inputpaths, cutoffs, paths_of_reference_BGCs = paths_of_reference_BGCs, result_of_run = result_of_bigscape_run) # Path of BiGSCAPE-output directory, or False if BiGSCAPE could not be run or failed.
+    archive_input.close_all_archives() # Input files in archives are no longer read.
+    task_executed_successfully             = path_of_output_directory_from_bigscape != False
+
+    run_manifest.update_entry_of_run_manifest(manifest_of_task_3, "BiG-SCAPE run", dict({ "State" : "done" if task_executed_successfully else "failed", "Exit code" : 0 if task_executed_successfully else None, "Duration (in s)" : round(time.time() - start_bigscape_run, 1), "Output path" : path_of_output_directory_from_bigscape if task_executed_successfully else None }, **run_process.fields_for_run_manifest(result_of_bigscape_run)))
 
     if task_executed_successfully == True:
         if side_options.analyze_query_BGCs_with_BGCs_from_MIBiG == True:
-            added_text = " and BGCs from MIBiG database " # Add text to results report.
+            added_text = " and BGCs from MIBiG database " if reference_index is None else " and their nearest BGCs from MIBiG database " # Add text to results report.
         else:
             added_text = " "
         print("\n\n\n>>> Task 3: Finished similarity analysis by BiG-SCAPE CORASON for query BGCs in directory \"" + names_and_paths.name_of_directory_of_selected_BGCs + "\"" + added_text + "with value for parameter \"cutoffs\" = " + str(cutoffs) + "!\n\n")
@@ -368,15 +862,185 @@ def TASK_3(cutoffs):
 # # --------------------------------------------------------------------------TASK 3 OF PIPELINE: Similarity analysis with BiGSCAPE--------------------------------------------------------------------------
 
 
+# # --------------------------------------------------------------------------PIPELINE OF TASKS 1, 2 AND 3: BGC-selection while antiSMASH is still running--------------------------------------------------------------------------
+
+def PIPELINE(param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, cutoffs):
+    """
+    Execute tasks 1, 2 and 3 as a pipeline: task 1 (antiSMASH) runs in a background thread and reports each finished antiSMASH-output directory, whose BGCs are selected (task 2) at once, while antiSMASH is still running for other input files.
+    Task 3 (BiGSCAPE) starts as soon as all BGCs are selected (as BiGSCAPE compares all BGCs with each other, it cannot start earlier).
+
+    Parameters
+    ----------
+    param_for_preliminary_selection : dict of {str : str}
+        Parameter for preliminary selection, i.e. minimum number of core genes.
+    param_for_main_selection : dict of {str : str}
+        Parameters for main selection, i.e. minimum length of cluster (in bp), minimum distance of each core gene to edges of cluster (in bp) and minimum number of additional biosynthetic genes.
+    param_for_2nd_chance_selection : dict of {str : str}
+        Parameter for second-chance selection, i.e. minimum number of additional biosynthetic genes.
+    cutoffs : one or many float values in range [0, 1], separated by whitespace
+        Maximum distance of BGCs in a GCF.
+
+    Returns
+    -------
+    None.
+
+    Output files
+    ------------
+    Same as tasks 1, 2 and 3.
+    """
+    # # --------------Define paths and create directory for output of task 2---------------
+    path_of_input_dir_for_task_2  = create.create_directory_if_not_exists(names_and_paths.path_of_directory_of_output_from_antismash)
+    path_of_output_dir_for_task_2 = create.create_directory_if_not_exists(names_and_paths.path_of_directory_of_selected_BGCs)
+
+    if side_options.clear_output_of_task_2 == True:
+        shutil.rmtree(path_of_output_dir_for_task_2) # Remove whole directory of selected BGCs.
+        create.create_directory_if_not_exists(path_of_output_dir_for_task_2) # Create directory for selected BGCs again.
+    # # --------------Define paths and create directory for output of task 2---------------
+
+    # # --------------Start task 1 in a background thread, which puts each finished antiSMASH-output directory into a queue---------------
+    finished_antismash_output_directories = queue.Queue() # Paths of finished antiSMASH-output directories. None: task 1 has ended.
+    exceptions_of_task_1                  = []
+
+    def run_task_1():
+        try:
+            TASK_1(finished_antismash_output_directories.put, param_for_main_selection["Minimum length (in bp)"])
+        except BaseException as exception:
+            exceptions_of_task_1.append(exception) # Raised again in main thread (see below).
+        finally:
+            finished_antismash_output_directories.put(None)
+
+    thread_of_task_1 = threading.Thread(target = contextvars.copy_context().run, args = (run_task_1,), name = "task_1") # Note: task 1 runs in the workspace of this run (see module "names_and_paths.py").
+    thread_of_task_1.start()
+    # # --------------Start task 1 in a background thread, which puts each finished antiSMASH-output directory into a queue---------------
+
+    start_analysis = time.time() # For results report.
+
+    # # --------------Define dictionaries for statistics and load run manifest of task 2 (see function "TASK_2")---------------
+    BGC_stats          = { "BGCs selected" : 0, "BGCs discarded" : 0, "All BGCs" : 0 }
+    product_stats      = {}
+    manifest_of_task_2 = run_manifest.load_run_manifest("task_2", parameters = { "Preliminary selection" : param_for_preliminary_selection, "Main selection" : param_for_main_selection, "Second-chance selection" : param_for_2nd_chance_selection })
+    # # --------------Define dictionaries for statistics and load run manifest of task 2 (see function "TASK_2")---------------
+
+    # # --------------Select BGCs of an antiSMASH-output directory (files that were already analyzed are skipped)---------------
+    analyzed_inputpaths     = set() # Paths of all input files of task 2 that were already analyzed.
+    paths_of_selected_BGCs  = []    # Paths of copies of files of selected BGCs (input files of task 3).
+
+    def select_BGCs_in_dir(path_of_dir):
+        inputpaths = []
+        for dir, subdirs, files in os.walk(path_of_dir, topdown=True):
+            for name_of_file in files:
+                if not name_of_file.startswith(tuple(names_and_paths.prefixes_of_names_of_incompatible_files)) and name_of_file.endswith(tuple(names_and_paths.file_extensions_of_antismash_outputfiles)):
+                    inputpaths.append(os.path.join(dir, name_of_file))
+                elif side_options.read_input_files_from_archives == True and name_of_file.endswith(tuple(archive_input.file_extensions_of_archives)):
+                    inputpaths.extend(archive_input.list_files_in_archive(os.path.join(dir, name_of_file), names_and_paths.file_extensions_of_antismash_outputfiles))
+
+        inputpaths = [ path_of_inputfile for path_of_inputfile in inputpaths if path_of_inputfile not in analyzed_inputpaths ]
+        analyzed_inputpaths.update(inputpaths)
+        deduplicate.remove_or_rename_files_with_duplicate_name(inputpaths) # Note: only files of the same antiSMASH-output directory are compared here. Files of selected BGCs with the same name from different directories are renamed when copied (see option "rename_output_if_name_collides").
+
+        for path_of_inputfile in inputpaths:
+            path_of_copied_file = select_BGC_of_inputfile(path_of_inputfile, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, BGC_stats, product_stats, manifest_of_task_2)
+            if path_of_copied_file is not None:
+                paths_of_selected_BGCs.append(path_of_copied_file)
+    # # --------------Select BGCs of an antiSMASH-output directory (files that were already analyzed are skipped)---------------
+
+    # # --------------Select BGCs of each antiSMASH-output directory as soon as it is finished---------------
+    while True:
+        path_of_antismash_output_directory = finished_antismash_output_directories.get()
+        if path_of_antismash_output_directory is None:
+            break
+        if os.path.isdir(path_of_antismash_output_directory):
+            select_BGCs_in_dir(path_of_antismash_output_directory)
+
+    thread_of_task_1.join()
+    if len(exceptions_of_task_1) > 0:
+        raise exceptions_of_task_1[0]
+
+    print("\n\n\n>>> Initiating task 2 (BGC-selection) for remaining input files...")
+    select_BGCs_in_dir(path_of_input_dir_for_task_2) # Also select BGCs of all other files in antiSMASH-output directory (e.g. antiSMASH-output provided externally, or of an earlier run).
+
+    run_manifest.save_run_manifest(manifest_of_task_2)
+    archive_input.close_all_archives() # Input files in archives are no longer read.
+    analysis_time = time.time() - start_analysis # For results report (note: includes the time waiting for antiSMASH).
+    # # --------------Select BGCs of each antiSMASH-output directory as soon as it is finished---------------
+
+    report_results_of_BGC_selection(param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, BGC_stats, product_stats, analysis_time)
+
+    TASK_3(cutoffs, [ path_of_selected_BGC for path_of_selected_BGC in paths_of_selected_BGCs if path_of_selected_BGC.endswith(tuple(names_and_paths.file_extensions_of_antismash_outputfiles)) ]) # Note: like in function "TASK_3", renamed copies (e.g. with suffix "__latest_output") are not analyzed by BiGSCAPE.
+
+# # --------------------------------------------------------------------------PIPELINE OF TASKS 1, 2 AND 3: BGC-selection while antiSMASH is still running--------------------------------------------------------------------------
+
+
 # # --------------------------------------------------------------------------USER-INTERFACE (starting point of main program)--------------------------------------------------------------------------
 
-def Entry_Point():
+def execute_tasks(list_of_tasks_to_execute, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, cutoffs):
     """
-    Start user-interface where user can specify task(s) to be executed.
+    Execute all specified task(s) with given values for parameters.
+
+    Parameters
+    ----------
+    list_of_tasks_to_execute            : list of str
+        Task(s) to execute, e.g. ["1", "2"] or ["4"] (all tasks).
+    param_for_preliminary_selection     : dict of {str : str} or None
+        Parameter for preliminary selection (None if task 2 is not executed).
+    param_for_main_selection            : dict of {str : str} or None
+        Parameters for main selection (None if task 2 is not executed).
+    param_for_2nd_chance_selection      : dict of {str : str} or None
+        Parameter for second-chance selection (None if task 2 is not executed).
+    cutoffs                             : str or None
+        Value(s) for parameter "cutoffs" (None if task 3 is not executed).
+
+    Returns
+    -------
+    None.
+    """
+    if side_options.run_tasks_1_2_3_as_pipeline == True and side_options.sweep_selection_parameters_in_task_2 == False and (all(task in list_of_tasks_to_execute for task in ["1", "2", "3"]) or "4" in list_of_tasks_to_execute):
+        PIPELINE(param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, cutoffs) # Execute tasks 1, 2 and 3 as a pipeline (BGC-selection while antiSMASH is still running).
+        return
+
+    if ("1" in list_of_tasks_to_execute) or ("4" in list_of_tasks_to_execute):
+        TASK_1(min_length_of_BGC = param_for_main_selection["Minimum length (in bp)"] if param_for_main_selection is not None else None) # Execute task 1 (i.e. gene finding by antiSMASH) if specified. Note: the minimum length of BGC of task 2 (if given) is used for the pre-filter of contigs.
+
+    if ("2" in list_of_tasks_to_execute) or ("4" in list_of_tasks_to_execute):
+        TASK_2(param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection) # Execute task 2 (i.e. BGC-selection) with input values for parameters, if specified.
+
+    if ("3" in list_of_tasks_to_execute) or ("4" in list_of_tasks_to_execute):
+        TASK_3(cutoffs) # Execute task 3 (i.e. similarity analysis by BiGSCAPE) if specified.
+
+    # Note: do not use "if...elif..." block here as that would only allow one task at maximum to be executed!
+
+
+def execute_tasks_in_workspace(path_of_run_directory, list_of_tasks_to_execute, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, cutoffs, path_of_input_directory_for_antismash=None):
+    """
+    Execute all specified task(s) in the workspace of a run (see module "names_and_paths.py"), e.g. several runs (for different batches of samples) as threads in one process:
+    threading.Thread(target = execute_tasks_in_workspace, args = (path_of_run_directory, ["4"], ...)).start()
+    Note: options (module "side_options.py") and predefined parameters (module "input_parameters.py") are shared by all runs in a process.
 
     Parameters
     ----------
+    path_of_run_directory                   : str
+        Path of directory of run (i.e. workspace), which will contain all input and output directories of the pipeline.
+    list_of_tasks_to_execute, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, cutoffs
+        See function "execute_tasks" above.
+    path_of_input_directory_for_antismash   : str or None
+        Path of input directory for antiSMASH. None: directory "input_for_antiSMASH" in directory of run.
+
+    Returns
+    -------
     None.
+    """
+    with names_and_paths.use_workspace(names_and_paths.make_workspace(path_of_run_directory, path_of_input_directory_for_antismash)):
+        execute_tasks(list_of_tasks_to_execute, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, cutoffs)
+
+
+def Entry_Point(arguments=None):
+    """
+    Start user-interface where user can specify task(s) to be executed.
+
+    Parameters
+    ----------
+    arguments : list of str or None
+        Arguments in command line (see module "command_line.py"). If given, the pipeline runs without any input from user (e.g. in a batch system). None or empty: user-interface.
 
     Input from user:
     ----------------
@@ -386,6 +1050,19 @@ def Entry_Point():
     -------
     None.
     """
+    # # --------------Run without any input from user (tasks, parameters, options and directories of run are given by command line and/or configuration file)------------------
+    if arguments:
+        list_of_tasks_to_execute, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, cutoffs = command_line.get_settings_of_run(arguments)
+        print("\n>>> Running task(s) " + ", ".join(sorted(set(list_of_tasks_to_execute))) + " in directory \"" + names_and_paths.common_path + "\"...")
+
+        execute_tasks(list_of_tasks_to_execute, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, cutoffs)
+
+        change_permit.change_permit_of_all_folders_and_files_in_common_dir() # Allow access to all output files (see below).
+
+        print("\n\n\n>>> All specified task(s) completed!\n\n")
+        return
+    # # --------------Run without any input from user (tasks, parameters, options and directories of run are given by command line and/or configuration file)------------------
+
     os.system("clear") # Should this be left out?
     print("-"*70 + "+"*30 + "-"*70)
     print(" "*15 + "WELCOME TO THE BIOINFORMATIC MULTIPROGRAM PIPELINE FOR AUTOMATED IDENTIFICATION, SELECTION AND CLUSTERING OF BIOSYNTHETIC GENE CLUSTERS!")
@@ -417,6 +1094,8 @@ def Entry_Point():
 
         # # --------------Get input of value(s) for parameter(s) needed for all task(s)------------------
         # Note: user should be prompted at the beginning (i.e. before starting to execute all task(s)) to input value(s) for all parameter(s) needed in all specified task(s).
+        param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, cutoffs = None, None, None, None # Only values for parameters of specified task(s) are needed.
+
         if side_options.prompt_user_to_input_values_for_parameters == True:    # Ask user to input value(s) for parameter(s).
 
             # # --------------For task 2 of pipeline: acquire values of parameters for selection------------------
@@ -443,16 +1122,7 @@ def Entry_Point():
         # # --------------Get input of value(s) for parameter(s) needed for all task(s)------------------
 
         # # --------------Execute all specified task(s)------------------
-        if ("1" in list_of_tasks_to_execute) or ("4" in list_of_tasks_to_execute):
-            TASK_1() # Execute task 1 (i.e. gene finding by antiSMASH) if specified.
-
-        if ("2" in list_of_tasks_to_execute) or ("4" in list_of_tasks_to_execute):
-            TASK_2(param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection) # Execute task 2 (i.e. BGC-selection) with input values for parameters, if specified.
-
-        if ("3" in list_of_tasks_to_execute) or ("4" in list_of_tasks_to_execute):
-            TASK_3(cutoffs) # Execute task 3 (i.e. similarity analysis by BiGSCAPE) if specified.
-
-        # Note: do not use "if...elif..." block here as that would only allow one task at maximum to be executed!
+        execute_tasks(list_of_tasks_to_execute, param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, cutoffs)
         # # --------------Execute all specified task(s)------------------
         
         # # --------------Change permission of all files and folders in common directory------------------
@@ -486,11 +1156,7 @@ def Entry_Point():
         # # --------------Get input of values for parameters needed for all tasks------------------
 
         # # --------------Execute all tasks------------------
-        TASK_1()
-
-        TASK_2(param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection)
-
-        TASK_3(cutoffs)
+        execute_tasks(["4"], param_for_preliminary_selection, param_for_main_selection, param_for_2nd_chance_selection, cutoffs)
         # # --------------Execute all tasks------------------
         
         # # --------------Change permission of all files and folders in common directory------------------
@@ -503,9 +1169,8 @@ def Entry_Point():
 
 
 if __name__ == '__main__':
-    Entry_Point() # Call main function that starts pipeline, only if this script is executed directly (and not as an imported module).
+    Entry_Point(sys.argv[1:]) # Call main function that starts pipeline, only if this script is executed directly (and not as an imported module).
 
 
-# Note for myself: sys.argv[1] can be used to take path of input directory from argument of running command. However, the question is, whether the user is willing to type a lot... 
 # Also note for myself: consider to improve codes for renaming duplicate files: ..._renamed_1, ..._renamed_2, ..._renamed_3, etc.
 
@@ -1,16 +1,55 @@
-''' This module is responsible for unzipping all file(s) and/or folder(s) (only .zip format) in a directory of given path, more precisely, it replaces each zipped file/folder in the given directory with a folder that contains the zipped content. '''
+''' This module is responsible for unzipping all file(s) and/or folder(s) (only .zip format) in a directory of given path, more precisely, it replaces each zipped file/folder in the given directory with a folder that contains the zipped content.
+    The directory is walked through only once: zipped files/folders are extracted by a pool of workers at the same time, and only the content of each extracted file/folder is searched afterwards for further (nested) zipped files/folders. '''
 
 
 import os
+import time
 import zipfile
+from   concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import names_and_paths
+import side_options
+import input_parameters
+
+
+# # --------------Extract one zipped file/folder---------------
+def extract_zipped_file(path_of_zipped_file, path_to_extract):
+    """
+    Extract a zipped file/folder (only .zip format) to a given (already created) folder and remove the zipped file/folder afterwards.
+
+    Parameters
+    ----------
+    path_of_zipped_file : str
+        Path of a zipped file/folder.
+    path_to_extract     : str
+        Path of folder that will contain the content of zipped file/folder.
+
+    Returns
+    -------
+    number_of_files : int
+        Number of extracted files (0 if zipped file/folder cannot be extracted).
+    number_of_bytes : int
+        Number of extracted bytes (uncompressed).
+    """
+    try:
+        with zipfile.ZipFile(path_of_zipped_file, "r") as zip_obj:
+            infos_of_files  = [ info for info in zip_obj.infolist() if not info.is_dir() ]
+            zip_obj.extractall(path_to_extract) # Extract content of zipped file/folder (only .zip format) to the created folder.
+        os.remove(path_of_zipped_file) # Important: remove zipped file after extracting (so that it will not be found and extracted again).
+    except:
+        if os.path.isdir(path_to_extract) and len(os.listdir(path_to_extract)) == 0:
+            os.rmdir(path_to_extract) # Remove the created folder again, if nothing was extracted.
+        return 0, 0 # Skip if zipped file/folder somehow cannot be extracted.
+    # Note: a try...except... block is used here because sometimes an exception can happen at this point (i.e. not every .zip file can be unzipped by this way).
+
+    return len(infos_of_files), sum(info.file_size for info in infos_of_files)
+# # --------------Extract one zipped file/folder---------------
 
 
 # # --------------Find and unzip all files/folders in specified directory---------------
 def unzip_all_files_and_folders_in_dir(path_of_dir):
     """
-    Unzip all zipped file(s)/folder(s) in the directory of given path.
+    Unzip all zipped file(s)/folder(s) in the directory of given path (also zipped file(s)/folder(s) inside of zipped file(s)/folder(s)).
 
     Parameters
     ----------
@@ -19,77 +58,62 @@ def unzip_all_files_and_folders_in_dir(path_of_dir):
 
     Returns
     -------
-    None.
+    summary : dict of {str : int or float}
+        Number of extracted zipped files/folders, number of extracted files, number of extracted bytes (uncompressed) and duration (in s).
 
     Output folders
     --------------
     Folder(s), each replaces a zipped file/folder in directory of given path and contains its zipped content.
     """
-    while True:
-        found_zipped_file_or_folder = False # Assume at the beginning no zipped file or folder is found in directory with given path "path_of_dir".
-        for dir, subdirs, files in os.walk(path_of_dir, topdown=True): # "os.walk()": loop through all folders and files in directory of given path "path_of_dir". "dir": absolute path of a certain directory found inside the directory of given path "path_of_dir", "subdirs": contains name(s) of subdirectory(-ies) in the directory "dir" (i.e. one level deeper than "dir"), "files": contains name(s) of file(s) in the directory "dir" (i.e. one level deeper than "dir").
-
-            # # --------------Loop through all files in specified directory and search for all zipped files---------------
-
-            for name_of_file in files:
-                if name_of_file.endswith(".zip"):
-                    found_zipped_file_or_folder = True # In case found a zipped file.
-
-                    # # --------------Create a folder for extracting zipped file---------------
-                    path_of_zipped_file = os.path.join(dir, name_of_file)
-                    name_of_folder_for_extraction = name_of_file.removesuffix(".zip") + "__unzipped" # Name of folder that will contain the content of zipped file = name of zipped file (without file extension) + "__unzipped" (to indicate this was a zipped file). This folder will be in the same directory as the found zipped file.
-
-                    while (name_of_folder_for_extraction in subdirs) or (name_of_folder_for_extraction in files):
-                        name_of_folder_for_extraction += "__renamed" # Rename folder that will contain the content of zipped file in case of name collision with existing file/folder in the same directory, until it has a unique name.
-
-                    path_to_extract = os.path.join(dir, name_of_folder_for_extraction) # Note: path "dir" does not have "/" at the end. So do not use string concatenation to create this path!
-                    # # --------------Create a folder for extracting zipped file---------------
-
-                    # # --------------Attempt to extract zipped file---------------
-                    try:
-                        with zipfile.ZipFile(path_of_zipped_file, "r") as zip_obj:
-                            zip_obj.extractall(path_to_extract) # Extract content of zipped file (only .zip format) to the created folder in directory "dir".
-                        os.remove(path_of_zipped_file) # Important: remove zipped file after extracting (so that it will not be found and extracted again).
-                    except:
-                        pass # Skip if zipped file somehow cannot be extracted.
-
-                    # Note: a try...except... block is used here because sometimes an exception can happen at this point (i.e. not every .zip file can be unzipped by this way).
-                    # # --------------Attempt to extract zipped file---------------
-
-            # # --------------Loop through all files in specified directory and search for all zipped files---------------
-
-
-            # # --------------Loop through all folders in specified directory and search for all zipped folders---------------
-
-            for name_of_subdir in subdirs:
-                if name_of_subdir.endswith(".zip"):
-                    found_zipped_file_or_folder = True # In case found a zipped folder.
-
-                    # # --------------Create a folder for extracting zipped folder---------------
-                    path_of_zipped_folder = os.path.join(dir, name_of_subdir)
-                    name_of_folder_for_extraction = name_of_subdir.removesuffix(".zip") + "__unzipped" # Name of folder that will contain the content of zipped folder = name of zipped folder (without extension) + "__unzipped" (to indicate this was a zipped folder). This folder will be in the same directory as the found zipped folder.
-
-                    while (name_of_folder_for_extraction in subdirs) or (name_of_folder_for_extraction in files):
-                        name_of_folder_for_extraction += "__renamed" # Rename folder that will contain the content of zipped folder in case of name collision with existing file/folder in the same directory.
-
-                    path_to_extract = os.path.join(dir, name_of_folder_for_extraction)
-                    # # --------------Create a folder for extracting zipped folder---------------
-
-                    # # --------------Attempt to extract zipped folder---------------
-                    try:
-                        with zipfile.ZipFile(path_of_zipped_folder, "r") as zip_obj:
-                            zip_obj.extractall(path_to_extract) # Extract content of zipped folder (only .zip format) to the created folder in directory "dir".
-                        os.remove(path_of_zipped_folder) # Important: remove zipped folder after extracting (so that it will not be found and extracted again).
-                    except:
-                        pass # Skip if zipped folder somehow cannot be extracted.
-
-                    # Note: a try...except... block is used here because sometimes an exception can happen at this point (i.e. not every .zip folder can be unzipped by this way).
-                    # # --------------Attempt to extract zipped folder---------------
-
-            # # --------------Loop through all folders in specified directory and search for all zipped folders---------------
-
-        if found_zipped_file_or_folder == True:
-            continue # In case zipped file(s) and/or folder(s) were found in the given directory with given "path_of_dir", loop/scan through whole directory of given path "path_of_dir" again to search and unzip other files/folders in unzipped file(s) and/or folder(s).
-        else:
-            break # In case no (more) zipped file or folder found in given directory, end function here.
+    summary             = { "Zipped files/folders" : 0, "Extracted files" : 0, "Extracted bytes" : 0, "Duration (in s)" : 0.0 }
+    start_of_unzipping  = time.time()
+
+    # # --------------Create a folder for extracting zipped file/folder---------------
+    def create_folder_for_extraction(dir, name_of_zipped_file):
+        name_of_folder_for_extraction = name_of_zipped_file.removesuffix(".zip") + "__unzipped" # Name of folder that will contain the content of zipped file/folder = name of zipped file/folder (without file extension) + "__unzipped" (to indicate this was a zipped file/folder). This folder will be in the same directory as the found zipped file/folder.
+        while True:
+            path_to_extract = os.path.join(dir, name_of_folder_for_extraction) # Note: path "dir" does not have "/" at the end. So do not use string concatenation to create this path!
+            try:
+                os.mkdir(path_to_extract) # Note: the folder is created at once, so that two zipped files/folders that are extracted at the same time never get the same folder.
+                return path_to_extract
+            except FileExistsError:
+                name_of_folder_for_extraction += "__renamed" # Rename folder in case of name collision with existing file/folder in the same directory, until it has a unique name.
+    # # --------------Create a folder for extracting zipped file/folder---------------
+
+    with ThreadPoolExecutor(max_workers = max(input_parameters.number_of_threads_for_unzipping, 1)) as pool: # Note: threads suffice here, as decompression and writing of files mostly run outside of the Python interpreter lock.
+        running_extractions = {} # Key = running extraction, value = path of folder that will contain the content of zipped file/folder.
+        dirs_to_search      = [path_of_dir]
+
+        while len(dirs_to_search) > 0 or len(running_extractions) > 0:
+
+            # # --------------Walk through new directories once and start extraction of all found zipped files/folders---------------
+            for path_of_dir_to_search in dirs_to_search:
+                for dir, subdirs, files in os.walk(path_of_dir_to_search, topdown=True): # "os.walk()": loop through all folders and files in directory. "dir": path of a certain directory, "subdirs": name(s) of subdirectory(-ies) in the directory "dir", "files": name(s) of file(s) in the directory "dir".
+                    for name_of_zipped_file in [ name for name in files + subdirs if name.endswith(".zip") ]: # Note: a folder with the suffix ".zip" is also treated as zipped folder (as before).
+                        path_to_extract = create_folder_for_extraction(dir, name_of_zipped_file)
+                        running_extractions[pool.submit(extract_zipped_file, os.path.join(dir, name_of_zipped_file), path_to_extract)] = path_to_extract # Note: the created folder is not in "subdirs" (listed before), so it is only searched after its extraction.
+            dirs_to_search = []
+            # # --------------Walk through new directories once and start extraction of all found zipped files/folders---------------
+
+            # # --------------Wait for extractions and search only the content of extracted zipped files/folders (for nested zipped files/folders)---------------
+            if len(running_extractions) > 0:
+                finished_extractions, _ = wait(running_extractions, return_when = FIRST_COMPLETED)
+                for extraction in finished_extractions:
+                    path_to_extract                  = running_extractions.pop(extraction)
+                    number_of_files, number_of_bytes = extraction.result()
+                    if number_of_files > 0 or os.path.isdir(path_to_extract):
+                        summary["Zipped files/folders"] += 1
+                        summary["Extracted files"]      += number_of_files
+                        summary["Extracted bytes"]      += number_of_bytes
+                        dirs_to_search.append(path_to_extract)
+            # # --------------Wait for extractions and search only the content of extracted zipped files/folders (for nested zipped files/folders)---------------
+
+    summary["Duration (in s)"] = time.time() - start_of_unzipping
+
+    if side_options.verbose == True and summary["Zipped files/folders"] > 0:
+        duration = max(summary["Duration (in s)"], 1e-6)
+        print("\n> Unzipped " + str(summary["Zipped files/folders"]) + " zipped file(s)/folder(s) in directory \"" + path_of_dir.rstrip("/").split("/")[-1] + "\": " + str(summary["Extracted files"]) + " files, " + str(round(summary["Extracted bytes"] / 1e6, 1)) + " MB in "
+              + str(round(duration, 1)) + " s (" + str(round(summary["Extracted files"] / duration, 1)) + " files/s, " + str(round(summary["Extracted bytes"] / 1e6 / duration, 1)) + " MB/s).")
+
+    return summary
 # # --------------Find and unzip all files/folders in specified directory---------------